@@ -3,6 +3,8 @@ LingoLive AI - Speech-to-Speech Translation System
 Modules: ASR (faster-whisper), Translation (MarianMT), TTS (Edge-TTS)
 """
 
+import importlib
+
 __version__ = "2.0.0"
 __author__ = "Amit"
 
@@ -15,10 +17,33 @@ from .config import (
     get_edge_voice,
     get_gtts_code,
 )
-from .asr_module import ASRModule, transcribe_audio
-from .translation_module import TranslationModule, translate_text
-from .tts_module import TTSModule, text_to_speech
-from .speech_pipeline import SpeechToSpeechPipeline, translate_speech
+
+# Model modules are imported on first attribute access (PEP 562), so
+# `import ai` / `from ai import config` stays cheap for processes that never
+# load a model.
+_LAZY = {
+    "ASRModule": ".asr_module",
+    "transcribe_audio": ".asr_module",
+    "TranslationModule": ".translation_module",
+    "translate_text": ".translation_module",
+    "TTSModule": ".tts_module",
+    "text_to_speech": ".tts_module",
+    "SpeechToSpeechPipeline": ".speech_pipeline",
+    "translate_speech": ".speech_pipeline",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 __all__ = [
     "SpeechToSpeechPipeline",
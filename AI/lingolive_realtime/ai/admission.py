@@ -0,0 +1,256 @@
+"""
+Admission control and load shedding for live sessions.
+
+Live sessions (/ws/voice in translation_server.py, the WebRTC pipeline in
+app.py) share one pool of inference capacity; without a limit an overloaded
+server makes every session unusable at once.  AdmissionController tracks the
+inference queue delay (how long work waits before a model starts on it) and,
+while it is above `target_delay_s`:
+
+    - new sessions are refused with a retry-after hint
+    - running sessions are asked to back off, and SheddingQueue drops their
+      queued chunks that are already stale, oldest first
+
+Delay samples come only from waits for inference: the scheduler's on_wait
+hook, live Whisper decodes waiting for a worker (asr_module), and any
+`delay_sources` polled on demand (e.g. the scheduler's oldest queued job, so a
+stalled queue counts before anything finishes waiting).  The age of a
+session's own queued messages is not a sample: it mostly measures that
+session's processing (and network TTS), not contention for the models.
+"""
+import asyncio
+import collections
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Generic, Iterable, Optional, Set, Tuple, TypeVar
+
+from .config import config
+from .scheduler import Priority, get_scheduler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class Admission:
+    admitted: bool
+    reason: str = ""              # "overloaded" / "session_limit" when refused
+    retry_after_s: float = 0.0
+    queue_delay_s: float = 0.0
+
+    def to_message(self) -> dict:
+        """JSON message telling a refused client when to try again."""
+        return {
+            "type": "rejected",
+            "reason": self.reason,
+            "retry_after_ms": int(self.retry_after_s * 1000),
+            "queue_delay_ms": round(self.queue_delay_s * 1000, 1),
+        }
+
+
+class AdmissionController:
+    """
+    Admits live sessions while the inference queue delay is under target.
+
+    Args:
+        target_delay_s: Queue delay above which the server counts as overloaded
+        max_sessions: Hard cap on concurrent sessions (0 = no cap)
+        window_s: Delay samples older than this are forgotten
+        stale_chunk_s: While overloaded, queued chunks older than this are shed
+        retry_after_s: Back-off hint sent to refused / throttled clients
+        percentile: Quantile of the recent samples taken as the queue delay
+        delay_sources: Callables returning a current delay in seconds
+    """
+
+    def __init__(
+        self,
+        target_delay_s: float = 0.5,
+        max_sessions: int = 0,
+        window_s: float = 5.0,
+        stale_chunk_s: float = 1.5,
+        retry_after_s: float = 2.0,
+        percentile: float = 0.9,
+        delay_sources: Iterable[Callable[[], float]] = (),
+    ):
+        self.target_delay_s = target_delay_s
+        self.max_sessions = max_sessions
+        self.window_s = window_s
+        self.stale_chunk_s = stale_chunk_s
+        self.retry_after_s = retry_after_s
+        self.percentile = percentile
+        self.delay_sources = list(delay_sources)
+        self._samples: Deque[Tuple[float, float]] = collections.deque(maxlen=2000)
+        self._sessions: Set[str] = set()
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {"admitted": 0, "rejected": 0, "shed": 0, "backoffs": 0}
+
+    # ── Queue delay ─────────────────────────────────────────────────────────
+
+    def observe(self, delay_s: float) -> None:
+        """Record how long one piece of work waited before inference started."""
+        with self._lock:
+            self._samples.append((time.monotonic(), delay_s))
+
+    def queue_delay(self) -> float:
+        """Current inference queue delay in seconds (0 when idle)."""
+        horizon = time.monotonic() - self.window_s
+        with self._lock:
+            while self._samples and self._samples[0][0] < horizon:
+                self._samples.popleft()
+            delays = sorted(d for _, d in self._samples)
+        observed = delays[max(0, math.ceil(self.percentile * len(delays)) - 1)] if delays else 0.0
+        return max([observed] + [source() for source in self.delay_sources])
+
+    def overloaded(self) -> bool:
+        return self.queue_delay() > self.target_delay_s
+
+    # ── Sessions ────────────────────────────────────────────────────────────
+
+    def admit(self, session_id: str) -> Admission:
+        """Admit a new session, or refuse it with a retry-after hint."""
+        delay = self.queue_delay()
+        with self._lock:
+            if self.max_sessions and len(self._sessions) >= self.max_sessions:
+                reason = "session_limit"
+            elif delay > self.target_delay_s:
+                reason = "overloaded"
+            else:
+                self._sessions.add(session_id)
+                self.counts["admitted"] += 1
+                return Admission(True, queue_delay_s=delay)
+            self.counts["rejected"] += 1
+            active = len(self._sessions)
+        logger.warning(
+            f"Session refused ({reason}): queue delay {delay * 1000:.0f} ms, {active} active session(s)"
+        )
+        return Admission(False, reason, self.retry_after_s, delay)
+
+    def release(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.discard(session_id)
+
+    def should_shed(self, age_s: float) -> bool:
+        """True if a queued chunk this old should be dropped instead of processed."""
+        return age_s > self.stale_chunk_s and self.overloaded()
+
+    def record_shed(self) -> None:
+        with self._lock:
+            self.counts["shed"] += 1
+
+    def backoff_message(self) -> dict:
+        """JSON message asking a running session's client to slow down."""
+        with self._lock:
+            self.counts["backoffs"] += 1
+        return {
+            "type": "backoff",
+            "retry_after_ms": int(self.retry_after_s * 1000),
+            "queue_delay_ms": round(self.queue_delay() * 1000, 1),
+        }
+
+    def stats(self) -> dict:
+        delay = self.queue_delay()
+        with self._lock:
+            return {
+                "queue_delay_ms": round(delay * 1000, 1),
+                "target_delay_ms": round(self.target_delay_s * 1000, 1),
+                "overloaded": delay > self.target_delay_s,
+                "active_sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                **self.counts,
+            }
+
+
+class SheddingQueue(Generic[T]):
+    """
+    asyncio FIFO between session stages that sheds load oldest-first.
+
+    put_nowait() on a full queue drops the oldest sheddable item rather than
+    the new one.  While the controller is overloaded, get() skips sheddable
+    items older than its stale_chunk_s.  Item ages are never reported to the
+    controller (see the module docstring).
+
+    Args:
+        maxsize: Items held before the oldest are dropped
+        admission: Controller deciding when to shed (None = plain bounded FIFO)
+        sheddable: Items for which this returns False are never dropped
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        admission: Optional[AdmissionController] = None,
+        sheddable: Optional[Callable[[T], bool]] = None,
+    ):
+        self.maxsize = max(1, maxsize)
+        self.admission = admission
+        self.sheddable = sheddable or (lambda item: True)
+        self._items: Deque[Tuple[float, T]] = collections.deque()
+        self._ready = asyncio.Event()
+        self.dropped = 0    # overflow
+        self.shed = 0       # stale while overloaded
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, item: T) -> bool:
+        """Queue `item`; returns False if an older item was dropped to make room."""
+        room = True
+        if len(self._items) >= self.maxsize:
+            for i, (_, queued) in enumerate(self._items):
+                if self.sheddable(queued):
+                    del self._items[i]
+                    self.dropped += 1
+                    room = False
+                    break
+        self._items.append((time.monotonic(), item))
+        self._ready.set()
+        return room
+
+    async def get(self) -> T:
+        while True:
+            while not self._items:
+                self._ready.clear()
+                await self._ready.wait()
+            queued_at, item = self._items.popleft()
+            if self.admission is None:
+                return item
+            age = time.monotonic() - queued_at
+            if self.sheddable(item) and self.admission.should_shed(age):
+                self.shed += 1
+                self.admission.record_shed()
+                continue
+            return item
+
+
+_admission: Optional[AdmissionController] = None
+_admission_lock = threading.Lock()
+
+
+def get_admission() -> AdmissionController:
+    """Process-wide controller configured from config.admission_*, fed by the
+    scheduler's live and chat queue waits."""
+    global _admission
+    if _admission is None:
+        with _admission_lock:
+            if _admission is None:
+                scheduler = get_scheduler()
+                controller = AdmissionController(
+                    target_delay_s=config.admission_target_delay_s,
+                    max_sessions=config.admission_max_sessions,
+                    window_s=config.admission_window_s,
+                    stale_chunk_s=config.admission_stale_chunk_s,
+                    retry_after_s=config.admission_retry_after_s,
+                    delay_sources=[lambda: scheduler.oldest_wait(Priority.MEDIUM)],
+                )
+
+                def _on_wait(priority: Priority, seconds: float) -> None:
+                    if priority <= Priority.MEDIUM:   # batch waits are expected to be long
+                        controller.observe(seconds)
+
+                scheduler.on_wait = _on_wait
+                _admission = controller
+    return _admission
@@ -4,23 +4,108 @@ Works on Python 3.10-3.14, CPU and GPU
 """
 import numpy as np
 import logging
-from typing import Optional, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 
+from .admission import get_admission
 from .config import config, get_whisper_code
+from .tts_hedge import LatencyTracker
+from .vad import pack_segments, split_speech, trim_silence as _trim_silence
+from media.audio_utils import pcm16_to_float32
 
 logger = logging.getLogger(__name__)
 
-try:
-    from faster_whisper import WhisperModel
-    FASTER_WHISPER_AVAILABLE = True
-except ImportError:
-    FASTER_WHISPER_AVAILABLE = False
+# faster-whisper (and CTranslate2 behind it) is imported when the model loads
+FASTER_WHISPER_AVAILABLE = find_spec("faster_whisper") is not None
+if not FASTER_WHISPER_AVAILABLE:
     logger.warning("faster-whisper not installed. Run: pip install faster-whisper")
 
 
+def _decode_file(path: Union[str, Path]) -> np.ndarray:
+    from faster_whisper import decode_audio
+    return decode_audio(str(path), sampling_rate=config.audio_sample_rate)
+
+
+@dataclass
+class _LanguageLock:
+    """Per-session language-ID state: probe until confident, then lock"""
+
+    votes: Dict[str, int] = field(default_factory=dict)
+    locked: Optional[str] = None
+    low_confidence_streak: int = 0
+
+
+class _ModelRouter:
+    """
+    Adaptive model choice: each utterance goes to the larger model while its
+    expected queue delay is under budget, otherwise to the smaller one.
+
+    Expected delay = decodes already waiting for one of the larger model's
+    workers x its recent median decode time, or the process's inference
+    queue delay (`delay_source`) if that is higher.
+    """
+
+    def __init__(self, large: str, small: str, budget_s: float, workers: int,
+                 delay_source: Optional[Callable[[], float]] = None):
+        self.large, self.small = large, small
+        self.budget_s = budget_s
+        self.workers = max(1, workers)
+        self.delay_source = delay_source
+        self._inflight = {large: 0, small: 0}
+        self._decode = {large: LatencyTracker(200), small: LatencyTracker(200)}
+        self.served = {large: 0, small: 0}
+        self._lock = threading.Lock()
+
+    def expected_delay(self) -> float:
+        with self._lock:
+            waiting = max(0, self._inflight[self.large] + 1 - self.workers)
+        local = waiting * (self._decode[self.large].percentile(0.5) or 0.0) / self.workers
+        return max(local, self.delay_source() if self.delay_source else 0.0)
+
+    @contextmanager
+    def route(self) -> Iterator[str]:
+        """Pick a model size for one decode and account for it while it runs."""
+        size = self.large if self.expected_delay() <= self.budget_s else self.small
+        with self._lock:
+            self._inflight[size] += 1
+        t0 = time.perf_counter()
+        try:
+            yield size
+        finally:
+            self._decode[size].observe(time.perf_counter() - t0)
+            with self._lock:
+                self._inflight[size] -= 1
+                self.served[size] += 1
+
+    def stats(self) -> dict:
+        total = sum(self.served.values())
+        p50 = {size: self._decode[size].percentile(0.5) for size in (self.large, self.small)}
+        return {
+            "large": self.large,
+            "small": self.small,
+            "budget_ms": round(self.budget_s * 1000, 1),
+            "expected_delay_ms": round(self.expected_delay() * 1000, 1),
+            "served": dict(self.served),
+            "downgraded_fraction": round(self.served[self.small] / total, 3) if total else 0.0,
+            "decode_p50_ms": {size: round(v * 1000, 1) if v is not None else None for size, v in p50.items()},
+        }
+
+
 class ASRModule:
-    """Speech-to-Text using faster-whisper (CTranslate2 backend)"""
+    """Speech-to-Text using faster-whisper (CTranslate2 backend)
+
+    With config.whisper_fallback_model_size set, both Whisper sizes stay
+    loaded and live utterances (transcribe / transcribe_fast) are routed per
+    call: the configured size while its queue delay is under
+    config.asr_adaptive_budget_s, the fallback size under load.  Every
+    result records the size that served it under "model".
+    """
 
     _instance = None
     _model = None
@@ -36,6 +121,13 @@ class ASRModule:
             self.model_size = config.whisper_model_size
             self.device = config.whisper_device
             self.compute_type = config.whisper_compute_type
+            fallback = config.whisper_fallback_model_size
+            self.fallback_size = fallback if fallback and fallback != self.model_size else None
+            self._models: Dict[str, Any] = {}
+            self._router: Optional[_ModelRouter] = None
+            self._lang_sessions: Dict[str, _LanguageLock] = {}
+            self._lang_lock = threading.Lock()
+            self._trim_stats = {"input_seconds": 0.0, "kept_seconds": 0.0}
             self._load_model()
             ASRModule._initialized = True
 
@@ -43,18 +135,54 @@ class ASRModule:
         if not FASTER_WHISPER_AVAILABLE:
             raise ImportError("faster-whisper not installed. Run: pip install faster-whisper")
 
-        logger.info(f"Loading Whisper '{self.model_size}' on {self.device} ({self.compute_type})...")
-        self._model = WhisperModel(
-            self.model_size,
+        self._model = self._models[self.model_size] = self._whisper(self.model_size)
+        if self.fallback_size:
+            self._models[self.fallback_size] = self._whisper(self.fallback_size)
+            self._router = _ModelRouter(
+                self.model_size, self.fallback_size,
+                budget_s=config.asr_adaptive_budget_s,
+                workers=config.whisper_num_workers,
+                delay_source=lambda: get_admission().queue_delay(),
+            )
+            logger.info(
+                f"Adaptive ASR: '{self.model_size}' under {config.asr_adaptive_budget_s * 1000:.0f} ms "
+                f"queue delay, '{self.fallback_size}' above"
+            )
+        # One slot per CTranslate2 worker, so waiting for a worker happens (and is measured) here
+        self._decode_slots = {
+            size: threading.BoundedSemaphore(max(1, config.whisper_num_workers)) for size in self._models
+        }
+
+    def _whisper(self, size: str):
+        from faster_whisper import WhisperModel
+
+        logger.info(f"Loading Whisper '{size}' on {self.device} ({self.compute_type})...")
+        model = WhisperModel(
+            size,
             device=self.device,
             compute_type=self.compute_type,
+            cpu_threads=config.whisper_cpu_threads,
+            num_workers=config.whisper_num_workers,  # >1 lets threads decode in parallel
         )
         logger.info("Whisper model loaded successfully")
+        return model
+
+    @contextmanager
+    def _route(self) -> Iterator[Tuple[str, Any]]:
+        """(size, model) for one live decode; the decode must finish inside the block.
+        Time spent waiting for a Whisper worker is reported to admission control."""
+        with self._router.route() if self._router else nullcontext(self.model_size) as size:
+            queued = time.monotonic()
+            with self._decode_slots[size]:
+                get_admission().observe(time.monotonic() - queued)
+                yield size, self._models[size]
 
     def transcribe(
         self,
         audio: Union[str, Path, np.ndarray],
         language: Optional[str] = None,
+        session_id: Optional[str] = None,
+        trim_silence: bool = False,
         **kwargs,
     ) -> dict:
         """
@@ -62,74 +190,193 @@ class ASRModule:
 
         Args:
             audio: File path or numpy float32 array (16 kHz mono)
-            language: Language name or ISO code (None = auto-detect)
+            language: Language name or ISO code (None / 'auto' = auto-detect)
+            session_id: With auto-detect, reuse the language locked for this speaker
+            trim_silence: Cut edge silence and long pauses before decoding
+                (segment timestamps then refer to the trimmed audio)
 
         Returns:
-            dict with 'text', 'language', 'segments'
+            dict with 'text', 'language', 'segments', 'trimmed_fraction'
         """
-        # Resolve language
-        lang_code = None
-        if language:
-            lang_code = get_whisper_code(language) if len(language) > 2 else language
+        lang_code, locked = self._resolve_language(language, session_id)
+
+        trimmed = 0.0
+        if trim_silence:
+            audio, trimmed = self._trim(audio)
+            if len(audio) == 0:
+                return self._empty_result(lang_code, locked, segments=[], duration=0.0)
 
         # Convert path
         if isinstance(audio, Path):
             audio = str(audio)
 
-        segments_iter, info = self._model.transcribe(
-            audio,
-            language=lang_code,
-            beam_size=kwargs.pop('beam_size', config.whisper_beam_size),
-            vad_filter=kwargs.pop('vad_filter', False),
-            condition_on_previous_text=False,
-            without_timestamps=True,
-            **kwargs,
-        )
+        with self._route() as (size, model):
+            segments_iter, info = model.transcribe(
+                audio,
+                language=lang_code,
+                beam_size=kwargs.pop('beam_size', config.whisper_beam_size),
+                vad_filter=kwargs.pop('vad_filter', False),
+                condition_on_previous_text=False,
+                without_timestamps=True,
+                **kwargs,
+            )
+            decoded = list(segments_iter)   # segments decode lazily
 
         segments = []
         full_text_parts = []
-        for seg in segments_iter:
+        logprobs = []
+        for seg in decoded:
             segments.append({
                 "start": seg.start,
                 "end": seg.end,
                 "text": seg.text.strip(),
             })
             full_text_parts.append(seg.text.strip())
+            logprobs.append(seg.avg_logprob)
+
+        text = " ".join(full_text_parts)
+        if session_id is not None and (lang_code is None or locked):
+            self._observe_language(session_id, info, logprobs, locked, bool(text))
 
         return {
-            "text": " ".join(full_text_parts),
+            "text": text,
             "language": info.language,
             "language_probability": info.language_probability,
+            "language_locked": locked,
             "duration": info.duration,
             "segments": segments,
+            "trimmed_fraction": trimmed,
+            "model": size,
         }
 
     def transcribe_fast(
         self,
         audio: Union[str, Path, np.ndarray],
         language: Optional[str] = None,
+        session_id: Optional[str] = None,
+        trim_silence: bool = False,
     ) -> dict:
-        """Fast transcription optimized for real-time (beam=1, no VAD, no timestamps)."""
-        lang_code = None
-        if language:
-            lang_code = get_whisper_code(language) if len(language) > 2 else language
+        """Fast transcription optimized for real-time (beam=1, no timestamps).
+        With trim_silence, silence is cut by our own VAD stage before decoding."""
+        lang_code, locked = self._resolve_language(language, session_id)
+        trimmed = 0.0
+        if trim_silence:
+            audio, trimmed = self._trim(audio)
+            if len(audio) == 0:
+                return self._empty_result(lang_code, locked)
         if isinstance(audio, Path):
             audio = str(audio)
 
-        segments_iter, info = self._model.transcribe(
+        with self._route() as (size, model):
+            segments_iter, info = model.transcribe(
+                audio,
+                language=lang_code,
+                beam_size=1,
+                vad_filter=False,
+                condition_on_previous_text=False,
+                without_timestamps=True,
+            )
+            decoded = list(segments_iter)   # segments decode lazily
+
+        parts = []
+        logprobs = []
+        for seg in decoded:
+            if seg.text:
+                parts.append(seg.text.strip())
+                logprobs.append(seg.avg_logprob)
+        text = " ".join(parts)
+        if session_id is not None and (lang_code is None or locked):
+            self._observe_language(session_id, info, logprobs, locked, bool(text))
+
+        return {
+            "text": text,
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "language_locked": locked,
+            "trimmed_fraction": trimmed,
+            "model": size,
+        }
+
+    def transcribe_long(
+        self,
+        audio: Union[str, Path, np.ndarray],
+        language: Optional[str] = None,
+        max_segment_s: Optional[float] = None,
+        workers: Optional[int] = None,
+    ) -> dict:
+        """
+        Transcribe a long recording by splitting it at VAD pauses into bounded
+        segments and decoding them in parallel across the model's workers.
+
+        Args:
+            audio: File path or numpy float32 array (16 kHz mono)
+            language: Language name or ISO code (None / 'auto' = detect on
+                the first segment, then reuse for the rest)
+            max_segment_s: Upper bound per segment (default: config)
+            workers: Parallel decodes (default: config.whisper_num_workers)
+
+        Returns:
+            dict with 'text', 'language', 'segments' (timestamps relative to
+            the original audio), 'duration' and 'trimmed_fraction'
+        """
+        if isinstance(audio, (str, Path)):
+            audio = _decode_file(audio)
+        sr = config.audio_sample_rate
+        max_segment_s = max_segment_s or config.asr_long_form_segment_s
+        speech = split_speech(
             audio,
-            language=lang_code,
-            beam_size=1,
-            vad_filter=False,
-            condition_on_previous_text=False,
-            without_timestamps=True,
+            sample_rate=sr,
+            max_segment_s=max_segment_s,
+            energy_floor=config.vad_energy_floor,
+            pad_ms=config.vad_pad_ms,
+            min_pause_ms=config.vad_min_pause_ms,
+            aggressiveness=config.vad_aggressiveness,
         )
+        spans = pack_segments(speech, int(max_segment_s * sr))   # = bounded_segments()
+        lang_code, _ = self._resolve_language(language, None)
+        duration = len(audio) / sr
+        if not spans:
+            return self._empty_result(lang_code, False, segments=[], duration=duration)
+
+        def decode(span: Tuple[int, int], lang: Optional[str]):
+            start, end = span
+            segments_iter, info = self._model.transcribe(
+                audio[start:end],
+                language=lang,
+                beam_size=config.whisper_beam_size,
+                vad_filter=False,
+                condition_on_previous_text=False,
+                without_timestamps=False,
+            )
+            offset = start / sr
+            segs = [
+                {"start": offset + seg.start, "end": offset + seg.end, "text": seg.text.strip()}
+                for seg in segments_iter if seg.text.strip()
+            ]
+            return segs, info
+
+        # Detect language once on the first segment; the rest run with it fixed
+        first_segs, info = decode(spans[0], lang_code)
+        lang_code = lang_code or info.language
+        results = [first_segs]
+        n_workers = max(1, min(workers or config.whisper_num_workers, len(spans) - 1))
+        if len(spans) > 1:
+            with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="asr-long") as pool:
+                results.extend(segs for segs, _ in pool.map(lambda sp: decode(sp, lang_code), spans[1:]))
 
-        parts = [seg.text.strip() for seg in segments_iter if seg.text]
+        segments = [seg for segs in results for seg in segs]
+        kept = sum(e - s for s, e in speech)      # pauses packed into a span count as trimmed
+        self._trim_stats["input_seconds"] += duration
+        self._trim_stats["kept_seconds"] += kept / sr
+        logger.info(f"Long-form ASR: {duration:.1f}s audio -> {len(spans)} segments on {n_workers} worker(s)")
         return {
-            "text": " ".join(parts),
-            "language": info.language,
+            "text": " ".join(seg["text"] for seg in segments),
+            "language": lang_code,
             "language_probability": info.language_probability,
+            "duration": duration,
+            "segments": segments,
+            "trimmed_fraction": 1.0 - kept / len(audio) if len(audio) else 0.0,
+            "model": self.model_size,
         }
 
     def transcribe_chunk(
@@ -137,24 +384,135 @@ class ASRModule:
         audio_chunk: Union[np.ndarray, bytes],
         language: Optional[str] = None,
     ) -> str:
-        """Transcribe a short audio chunk. Returns text string."""
-        if isinstance(audio_chunk, bytes):
-            audio_chunk = np.frombuffer(audio_chunk, dtype=np.int16).astype(np.float32) / 32768.0
+        """Transcribe a short audio chunk. Returns text string.
 
-        if isinstance(audio_chunk, np.ndarray) and audio_chunk.dtype != np.float32:
+        float32 arrays (e.g. PCMRingBuffer views) are used as-is; int16 bytes or
+        arrays are converted with a single allocation."""
+        if isinstance(audio_chunk, (bytes, bytearray, memoryview)) or audio_chunk.dtype == np.int16:
+            audio_chunk = pcm16_to_float32(audio_chunk)
+        elif audio_chunk.dtype != np.float32:
             audio_chunk = audio_chunk.astype(np.float32)
 
         result = self.transcribe_fast(audio_chunk, language=language)
         return result["text"]
 
+    def end_session(self, session_id: str) -> None:
+        """Forget the language locked for a session"""
+        with self._lang_lock:
+            self._lang_sessions.pop(session_id, None)
+
+    def warmup(self) -> float:
+        """Run one dummy decode per loaded model so the first real request does
+        not pay for CTranslate2's lazy allocations.  Returns the time taken (s)."""
+        t0 = time.perf_counter()
+        for model in self._models.values():
+            segments_iter, _info = model.transcribe(
+                np.zeros(config.audio_sample_rate, dtype=np.float32),
+                language="en",
+                beam_size=1,
+                vad_filter=False,
+                without_timestamps=True,
+            )
+            list(segments_iter)
+        return time.perf_counter() - t0
+
     def get_model_info(self) -> dict:
         return {
             "model_size": self.model_size,
+            "fallback_model_size": self.fallback_size,
+            "adaptive": self._router.stats() if self._router is not None else None,
             "device": self.device,
             "compute_type": self.compute_type,
             "initialized": self._initialized,
+            "language_sessions": len(self._lang_sessions),
+            "locked_sessions": sum(1 for s in self._lang_sessions.values() if s.locked),
+            "silence_trimming": self._trim_info(),
+        }
+
+    def _trim_info(self) -> dict:
+        st = self._trim_stats
+        total = st["input_seconds"]
+        return {
+            "input_seconds": round(total, 2),
+            "kept_seconds": round(st["kept_seconds"], 2),
+            "trimmed_fraction": round(1.0 - st["kept_seconds"] / total, 3) if total else 0.0,
         }
 
+    # ── Silence trimming ────────────────────────────────────────────────────
+
+    def _trim(self, audio: Union[str, Path, np.ndarray]) -> Tuple[np.ndarray, float]:
+        """Decode files to 16 kHz float32 and cut silence. Returns (audio, fraction trimmed)."""
+        if isinstance(audio, (str, Path)):
+            audio = _decode_file(audio)
+        n_in = len(audio)
+        audio, fraction, _ = _trim_silence(
+            audio,
+            sample_rate=config.audio_sample_rate,
+            energy_floor=config.vad_energy_floor,
+            pad_ms=config.vad_pad_ms,
+            min_pause_ms=config.vad_min_pause_ms,
+            aggressiveness=config.vad_aggressiveness,
+        )
+        self._trim_stats["input_seconds"] += n_in / config.audio_sample_rate
+        self._trim_stats["kept_seconds"] += len(audio) / config.audio_sample_rate
+        return audio, fraction
+
+    @staticmethod
+    def _empty_result(lang_code: Optional[str], locked: bool, **extra) -> dict:
+        """Result for audio that was entirely silence (no decode run)."""
+        return {
+            "text": "",
+            "language": lang_code,
+            "language_probability": 0.0,
+            "language_locked": locked,
+            **extra,
+            "trimmed_fraction": 1.0,
+            "model": None,
+        }
+
+    # ── Session language locking ────────────────────────────────────────────
+
+    def _resolve_language(
+        self, language: Optional[str], session_id: Optional[str]
+    ) -> Tuple[Optional[str], bool]:
+        """Return (whisper code or None for auto-detect, came from a session lock)."""
+        if language and language.lower() != "auto":
+            return (get_whisper_code(language) if len(language) > 2 else language), False
+        if session_id is not None:
+            state = self._lang_sessions.get(session_id)
+            if state is not None and state.locked:
+                return state.locked, True
+        return None, False
+
+    def _observe_language(
+        self, session_id: str, info, logprobs: List[float], locked: bool, has_text: bool
+    ) -> None:
+        """Vote on detected languages until one is confident enough to lock;
+        while locked, unlock after repeated low-confidence decodes (drift)."""
+        if not has_text:
+            return
+        with self._lang_lock:
+            state = self._lang_sessions.setdefault(session_id, _LanguageLock())
+            if locked:
+                mean_logprob = sum(logprobs) / len(logprobs) if logprobs else 0.0
+                if mean_logprob < config.asr_language_drift_logprob:
+                    state.low_confidence_streak += 1
+                    if state.low_confidence_streak >= config.asr_language_drift_patience:
+                        logger.info(f"ASR session {session_id}: low confidence in '{state.locked}', re-detecting")
+                        self._lang_sessions[session_id] = _LanguageLock()
+                else:
+                    state.low_confidence_streak = 0
+                return
+            if info.language_probability >= config.asr_language_lock_probability:
+                votes = state.votes.get(info.language, 0) + 1
+                state.votes[info.language] = votes
+                if votes >= config.asr_language_lock_utterances:
+                    state.locked = info.language
+                    logger.info(
+                        f"ASR session {session_id}: locked language '{info.language}' "
+                        f"(p={info.language_probability:.2f})"
+                    )
+
     @staticmethod
     def is_available() -> bool:
         return FASTER_WHISPER_AVAILABLE
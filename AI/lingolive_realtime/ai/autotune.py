@@ -0,0 +1,328 @@
+"""
+Host auto-tuning - pick ASR / translation settings from a local benchmark.
+
+Runs short offline benchmarks on this machine and writes the best settings
+to a host profile that ModelConfig loads at startup (config.load_host_profile):
+
+    ASR   faster-whisper compute type x cpu_threads x num_workers
+          (single-utterance latency, and audio seconds decoded per second
+          with num_workers decodes in flight)
+    MT    torch intra-op threads x MarianMT batch size
+          (single-sentence latency, sentences and tokens per second)
+
+The measured table is saved next to the profile (same name, .csv).  Stages
+whose backend or model is not available on the host are skipped and leave
+the defaults in place.
+
+Run (from AI/lingolive_realtime; models must be cached or downloadable):
+  python -m ai.autotune [--whisper-size tiny] [--pair en->hi] [--audio sample.wav] [--out host_profile.json]
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import HOST_PROFILE_PATH, MARIAN_MODELS, config
+
+logger = logging.getLogger(__name__)
+
+# Sentences of typical chat / utterance length for the MT benchmark
+MT_SENTENCES = [
+    "Hello, how are you today?",
+    "Can you hear me clearly now?",
+    "I will send you the documents after the meeting.",
+    "The train to Delhi leaves at half past seven in the morning.",
+    "Please call me back when you are free.",
+    "We need to finish this work before Friday.",
+    "What time does the shop open tomorrow?",
+    "My family is visiting us next week for the festival.",
+]
+
+
+@dataclass
+class Trial:
+    stage: str                  # "asr" / "mt"
+    settings: Dict[str, Any]    # ModelConfig fields this trial used
+    latency_ms: float           # p50 of one request (one utterance / sentence)
+    throughput: float           # `unit` per second at full parallelism / batch
+    unit: str
+    tokens_per_s: Optional[float] = None
+
+
+def pick_best(trials: Sequence[Trial], min_throughput: float = 0.8) -> Trial:
+    """Lowest latency among the trials within `min_throughput` of the best
+    throughput (live traffic is latency bound, but not at any price)."""
+    floor = max(t.throughput for t in trials) * min_throughput
+    return min((t for t in trials if t.throughput >= floor), key=lambda t: (t.latency_ms, -t.throughput))
+
+
+# ── ASR ─────────────────────────────────────────────────────────────────────
+
+def asr_grid(cores: int, compute_types: Sequence[str]) -> List[Dict[str, Any]]:
+    """compute type x (cpu_threads, num_workers) with threads x workers <= cores."""
+    shapes = []
+    workers = 1
+    while workers <= cores:
+        for threads in {max(1, cores // workers), max(1, cores // (2 * workers))}:
+            shapes.append((threads, workers))
+        workers *= 2
+    return [
+        {"whisper_compute_type": ct, "whisper_cpu_threads": threads, "whisper_num_workers": workers}
+        for ct in compute_types
+        for threads, workers in sorted(set(shapes))
+    ]
+
+
+def bench_asr(make_model: Callable[..., Any], settings: Dict[str, Any], audio: np.ndarray, repeats: int = 3) -> Trial:
+    """Time `repeats` sequential decodes, then `repeats` x num_workers concurrent ones."""
+    model = make_model(
+        compute_type=settings["whisper_compute_type"],
+        cpu_threads=settings["whisper_cpu_threads"],
+        num_workers=settings["whisper_num_workers"],
+    )
+
+    def decode() -> float:
+        t0 = time.perf_counter()
+        segments, _info = model.transcribe(
+            audio, language="en", beam_size=config.whisper_beam_size, vad_filter=False,
+            condition_on_previous_text=False, without_timestamps=True, max_new_tokens=48,
+        )
+        list(segments)
+        return time.perf_counter() - t0
+
+    decode()    # warm-up: CTranslate2 allocates lazily
+    latency = statistics.median(decode() for _ in range(repeats))
+    workers = settings["whisper_num_workers"]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(lambda _: decode(), range(repeats * workers)))
+    wall = time.perf_counter() - t0
+    audio_s = len(audio) / config.audio_sample_rate * repeats * workers
+    return Trial("asr", dict(settings), latency * 1000, audio_s / wall, "audio_s")
+
+
+def _whisper_factory(size: str) -> Callable[..., Any]:
+    from faster_whisper import WhisperModel
+
+    def make(compute_type: str, cpu_threads: int, num_workers: int):
+        return WhisperModel(size, device="cpu", compute_type=compute_type,
+                            cpu_threads=cpu_threads, num_workers=num_workers)
+    return make
+
+
+def _cpu_compute_types() -> List[str]:
+    import ctranslate2
+
+    supported = ctranslate2.get_supported_compute_types("cpu")
+    return [ct for ct in ("int8", "int8_float32", "int16", "float32") if ct in supported]
+
+
+def _load_audio(path: Optional[str], seconds: float = 3.0) -> np.ndarray:
+    """The given recording, or seeded noise shaped like syllables (decodes are
+    capped at 48 tokens, so every configuration does comparable work)."""
+    sr = config.audio_sample_rate
+    if path:
+        from faster_whisper import decode_audio
+        return decode_audio(path, sampling_rate=sr)
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr)) / sr
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t))
+    return (0.1 * envelope * rng.standard_normal(len(t))).astype(np.float32)
+
+
+# ── MarianMT ────────────────────────────────────────────────────────────────
+
+def bench_mt(
+    translate: Callable[[List[str]], List[int]],
+    set_threads: Callable[[int], None],
+    threads: int,
+    batch_size: int,
+    sentences: Sequence[str] = MT_SENTENCES,
+    repeats: int = 3,
+) -> Trial:
+    """translate(texts) -> generated token count per text.  Latency is one
+    sentence alone; throughput is `batch_size` sentences per call."""
+    set_threads(threads)
+    translate([sentences[0]])   # warm-up
+    latency = statistics.median(_timed(translate, [sentences[i % len(sentences)]])[0] for i in range(repeats))
+    batch = [sentences[i % len(sentences)] for i in range(batch_size)]
+    runs = [_timed(translate, batch) for _ in range(repeats)]
+    wall = sum(seconds for seconds, _ in runs)
+    tokens = sum(sum(counts) for _, counts in runs)
+    return Trial(
+        "mt", {"torch_num_threads": threads, "translation_batch_size": batch_size},
+        latency * 1000, batch_size * repeats / wall, "sentences", tokens / wall,
+    )
+
+
+def pick_mt(trials: Sequence[Trial]) -> Trial:
+    """Threads with the best single-sentence latency; at those threads, the
+    smallest batch size within 5% of the best throughput."""
+    threads = min(trials, key=lambda t: t.latency_ms).settings["torch_num_threads"]
+    candidates = [t for t in trials if t.settings["torch_num_threads"] == threads]
+    top = max(t.throughput for t in candidates)
+    return min((t for t in candidates if t.throughput >= 0.95 * top), key=lambda t: t.settings["translation_batch_size"])
+
+
+def _timed(fn: Callable, arg) -> tuple:
+    t0 = time.perf_counter()
+    out = fn(arg)
+    return time.perf_counter() - t0, out
+
+
+def _marian_translator(pair: str) -> Callable[[List[str]], List[int]]:
+    import torch
+    from .translation_module import _marian_classes, _quantize
+
+    tokenizer_cls, model_cls = _marian_classes()
+    tok = tokenizer_cls.from_pretrained(MARIAN_MODELS[pair])
+    mdl = model_cls.from_pretrained(MARIAN_MODELS[pair]).eval()
+    if config.marian_quantize:       # tune the model as it will be served
+        mdl = _quantize(mdl)
+    pad = mdl.config.pad_token_id
+
+    def translate(texts: List[str]) -> List[int]:
+        batch = tok(texts, return_tensors="pt", padding=True, truncation=True, max_length=config.translation_max_length)
+        with torch.inference_mode():
+            out = mdl.generate(**batch, max_new_tokens=config.translation_max_length, num_beams=1)
+        return (out != pad).sum(dim=1).tolist()
+    return translate
+
+
+def _set_torch_threads(n: int) -> None:
+    import torch
+    torch.set_num_threads(n)
+
+
+def mt_thread_counts(cores: int) -> List[int]:
+    counts, n = [], 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores]
+
+
+# ── Profile ─────────────────────────────────────────────────────────────────
+
+def host_info() -> Dict[str, Any]:
+    return {
+        "hostname": socket.gethostname(),
+        "cpu_count": os.cpu_count(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "python": platform.python_version(),
+    }
+
+
+def write_profile(path: str, settings: Dict[str, Any], trials: Sequence[Trial], notes: Dict[str, Any]) -> str:
+    """Write the profile JSON and the full results table (.csv) next to it.
+    Returns the table's path."""
+    profile = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "host": host_info(),
+        "settings": settings,
+        "benchmark": notes,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+        f.write("\n")
+
+    table = os.path.splitext(path)[0] + ".csv"
+    keys = sorted({k for t in trials for k in t.settings})
+    with open(table, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["stage", *keys, "latency_p50_ms", "throughput", "unit", "tokens_per_s", "selected"])
+        for t in trials:
+            selected = all(settings.get(k) == v for k, v in t.settings.items())
+            writer.writerow([
+                t.stage, *(t.settings.get(k, "") for k in keys), f"{t.latency_ms:.1f}",
+                f"{t.throughput:.2f}", t.unit, "" if t.tokens_per_s is None else f"{t.tokens_per_s:.1f}", int(selected),
+            ])
+    return table
+
+
+def _print_trials(trials: Sequence[Trial], best: Trial) -> None:
+    for t in trials:
+        marker = "*" if t is best else " "
+        extra = f"  {t.tokens_per_s:8.1f} tok/s" if t.tokens_per_s is not None else ""
+        print(f" {marker} {t.settings}  p50 {t.latency_ms:7.1f} ms  {t.throughput:7.2f} {t.unit}/s{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ASR / MT settings on this host and write a host profile")
+    parser.add_argument("--out", default=HOST_PROFILE_PATH, help="profile path (default: $HOST_PROFILE or host_profile.json)")
+    parser.add_argument("--whisper-size", default=config.whisper_model_size)
+    parser.add_argument("--audio", default=None, help="speech sample for the ASR runs (default: synthetic)")
+    parser.add_argument("--pair", default="en->hi", help="MarianMT pair for the MT runs")
+    parser.add_argument("--batch-sizes", default="1,4,8,16,32")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-throughput", type=float, default=0.8,
+                        help="candidates must reach this fraction of the best throughput")
+    parser.add_argument("--skip-asr", action="store_true")
+    parser.add_argument("--skip-mt", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    cores = os.cpu_count() or 1
+    settings: Dict[str, Any] = {}
+    trials: List[Trial] = []
+    notes: Dict[str, Any] = {"repeats": args.repeats, "min_throughput": args.min_throughput}
+
+    if not args.skip_asr and find_spec("faster_whisper") is not None:
+        try:
+            make = _whisper_factory(args.whisper_size)
+            audio = _load_audio(args.audio)
+            asr_trials = [bench_asr(make, s, audio, args.repeats) for s in asr_grid(cores, _cpu_compute_types())]
+        except Exception as e:
+            logger.warning(f"ASR stage skipped: {e}")
+        else:
+            best = pick_best(asr_trials, args.min_throughput)
+            print(f"\nASR (whisper {args.whisper_size}, {len(audio) / config.audio_sample_rate:.1f} s utterance)")
+            _print_trials(asr_trials, best)
+            settings.update(best.settings)
+            trials += asr_trials
+            notes["whisper_size"] = args.whisper_size
+    elif not args.skip_asr:
+        logger.warning("ASR stage skipped: faster-whisper not installed")
+
+    if not args.skip_mt and find_spec("torch") is not None and find_spec("transformers") is not None:
+        try:
+            translate = _marian_translator(args.pair)
+            batch_sizes = [int(b) for b in args.batch_sizes.split(",")]
+            mt_trials = [
+                bench_mt(translate, _set_torch_threads, threads, batch, repeats=args.repeats)
+                for threads in mt_thread_counts(cores)
+                for batch in batch_sizes
+            ]
+        except Exception as e:
+            logger.warning(f"MT stage skipped: {e}")
+        else:
+            best = pick_mt(mt_trials)
+            print(f"\nMarianMT ({args.pair})")
+            _print_trials(mt_trials, best)
+            settings.update(best.settings)
+            trials += mt_trials
+            notes["pair"] = args.pair
+    elif not args.skip_mt:
+        logger.warning("MT stage skipped: torch / transformers not installed")
+
+    if not settings:
+        logger.error("Nothing could be benchmarked on this host; no profile written")
+        raise SystemExit(1)
+    table = write_profile(args.out, settings, trials, notes)
+    print(f"\nProfile: {args.out}  {settings}\nTable:   {table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,24 @@
 """
 Configuration for LingoLive AI Speech Translation System
 Supports 14 Indian languages + international languages
+
+Per-host tuning (compute type, thread counts, batch size) is read at import
+from the profile written by `python -m ai.autotune` (HOST_PROFILE, default
+host_profile.json next to translation_server.py), when it exists.  A setting
+also given by an environment variable that is set (MARIAN_QUANTIZE,
+WHISPER_MODEL_SIZE, ...) keeps the environment's value.
 """
-from dataclasses import dataclass
-from typing import Dict, List
+import json
+import logging
+import os
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+HOST_PROFILE_PATH = os.getenv(
+    "HOST_PROFILE", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "host_profile.json")
+)
 
 
 @dataclass
@@ -11,22 +26,85 @@ class ModelConfig:
     """Model configuration - works on CPU and GPU"""
 
     # ASR (faster-whisper)
-    whisper_model_size: str = "tiny"          # tiny for real-time (<0.5s), base/small for accuracy
+    whisper_model_size: str = os.getenv("WHISPER_MODEL_SIZE", "tiny")  # tiny for real-time (<0.5s), base/small for accuracy
+    # Adaptive ASR: keep this smaller size loaded too and use it for live
+    # utterances while the main model's queue delay is over budget ("" = off)
+    whisper_fallback_model_size: str = os.getenv("WHISPER_FALLBACK_MODEL", "")
+    asr_adaptive_budget_s: float = 0.3        # expected queue delay tolerated on the main model
     whisper_compute_type: str = "int8"        # int8 for speed, float16 for GPU
     whisper_device: str = "cpu"               # cpu or cuda
     whisper_beam_size: int = 1                # 1 for real-time speed, 5 for accuracy
+    whisper_cpu_threads: int = 0              # CTranslate2 threads per worker (0 = default)
+    whisper_num_workers: int = max(1, (os.cpu_count() or 4) // 4)  # parallel decodes (~4 threads each)
+    asr_long_form_segment_s: float = 30.0     # max segment length for long uploads
+
+    # Session language locking (auto-detect only)
+    asr_language_lock_probability: float = 0.8   # detections at/above this count as votes
+    asr_language_lock_utterances: int = 2        # agreeing votes needed to lock
+    asr_language_drift_logprob: float = -1.0     # locked decodes below this are low-confidence
+    asr_language_drift_patience: int = 2         # consecutive low-confidence decodes to unlock
 
     # TTS (edge-tts)
     tts_sample_rate: int = 24000
+    tts_segment_max_chars: int = 220          # longer texts are synthesized sentence by sentence
+    tts_segment_min_chars: int = 24           # shorter fragments are merged with a neighbour
+    tts_first_segment_max_chars: int = 80     # short first segment = earlier first audio
+    tts_max_parallel: int = 3                 # segments synthesized concurrently
+    tts_crossfade_ms: float = 15.0            # crossfade at segment joins (0 = plain concat)
+    tts_hedge_engines: str = "edge-tts,gtts,elevenlabs"  # priority order for hedged requests
+    tts_hedge_percentile: float = 0.95        # engine latency quantile used as its deadline
+    tts_hedge_min_deadline_s: float = 0.3     # clamp for the derived deadline
+    tts_hedge_max_deadline_s: float = 3.0
+    tts_hedge_default_deadline_s: float = 1.5  # until enough latencies are recorded
+    tts_timeout_s: float = 10.0               # give up if no engine answers
     audio_sample_rate: int = 16000            # Whisper expects 16kHz
 
     # Translation
     translation_max_length: int = 128         # shorter = faster generation
+    translation_incremental_max_tail_words: int = 12  # commit agreed words past this
+    translation_cache_size: int = 4096        # pivot-leg cache entries (LRU)
+    translation_batch_size: int = 8           # texts per MarianMT generate() in translate_batch
+    torch_num_threads: int = 0                # torch threads per MarianMT call, capped at cores // marian_concurrency (0 = the cap)
+    marian_concurrency: int = 0               # concurrent MarianMT generate() calls (0 = scheduler_workers)
+    marian_quantize: bool = os.getenv("MARIAN_QUANTIZE", "0") == "1"  # dynamic int8 Linear layers (CPU, opt-in)
+    # Hot pairs loaded + warmed in parallel at server startup
+    warmup_language_pairs: str = os.getenv("WARMUP_LANGUAGE_PAIRS", "en->hi,hi->en")
 
     # Pipeline tuning
     vad_min_chunk_ms: int = 200               # Lower = faster response (was 500)
     vad_max_chunk_ms: int = 600               # Lower = faster response (was 1000)
 
+    # Silence trimming before ASR
+    vad_energy_floor: float = 0.004           # min frame RMS considered speech
+    vad_pad_ms: int = 100                     # keep this much around speech edges
+    vad_min_pause_ms: int = 400               # shorter pauses are kept as-is
+    vad_aggressiveness: int = 2               # webrtcvad 0-3 (energy-only if not installed)
+
+    # Inference scheduling (translation): live voice > chat > batch/backfill
+    scheduler_workers: int = 4                # concurrent translation calls
+    scheduler_medium_max_wait_s: float = 1.0  # chat waiting longer than this jumps ahead of live voice
+    scheduler_low_max_wait_s: float = 5.0     # same for batch chunks (starvation protection)
+    scheduler_batch_chunk: int = 16           # texts per batch chunk (preemption granularity)
+
+    # Admission control / load shedding for live sessions (/ws/voice, app.py)
+    admission_target_delay_s: float = float(os.getenv("ADMISSION_TARGET_DELAY_MS", "500")) / 1000  # queue delay that counts as overload
+    admission_max_sessions: int = int(os.getenv("ADMISSION_MAX_SESSIONS", "0"))  # concurrent live sessions (0 = no cap)
+    admission_window_s: float = 5.0           # queue-delay samples older than this are forgotten
+    admission_stale_chunk_s: float = 1.5      # while overloaded, queued chunks older than this are dropped
+    admission_retry_after_s: float = 2.0      # back-off hint sent to refused / throttled clients
+    admission_session_queue: int = 32         # messages queued per /ws/voice session before the oldest drop
+
+    # Speculation on partial transcripts (/ws/voice live captions)
+    speculation_enabled: bool = os.getenv("SPECULATION", "1") != "0"  # final reuses the last partial's translation
+    speculative_tts: bool = os.getenv("SPECULATIVE_TTS", "0") == "1"  # pre-synthesize stable clauses (extra TTS calls)
+
+    # Model server (one process owns the models; front ends are thin clients)
+    model_server_socket: str = os.getenv("MODEL_SERVER_SOCKET", "")  # "" = load models in-process
+    model_server_batch_window_ms: float = 5.0  # coalesce translate calls arriving this close together
+    model_server_max_batch: int = 16          # texts per coalesced translate call
+    model_server_pool_size: int = 16          # client connections per front-end process
+    model_server_timeout_s: float = 60.0      # client-side timeout per call
+
 
 # ── Supported Languages ──────────────────────────────────────────────────────
 SUPPORTED_LANGUAGES: Dict[str, str] = {
@@ -131,5 +209,82 @@ def get_gtts_code(language_name: str) -> str:
     return GTTS_LANG_CODES.get(language_name.lower(), "en")
 
 
+def parse_language_pairs(spec: str) -> List[Tuple[str, str]]:
+    """"en->hi, hi->en" -> [("en", "hi"), ("hi", "en")] (malformed items skipped)"""
+    pairs = []
+    for item in spec.split(","):
+        src, sep, tgt = item.strip().partition("->")
+        if sep and src and tgt:
+            pairs.append((src.strip(), tgt.strip()))
+    return pairs
+
+
+# Settings read from an environment variable: when it is set, it wins over the host profile
+ENV_SETTINGS: Dict[str, str] = {
+    "whisper_model_size": "WHISPER_MODEL_SIZE",
+    "whisper_fallback_model_size": "WHISPER_FALLBACK_MODEL",
+    "marian_quantize": "MARIAN_QUANTIZE",
+    "warmup_language_pairs": "WARMUP_LANGUAGE_PAIRS",
+    "admission_target_delay_s": "ADMISSION_TARGET_DELAY_MS",
+    "admission_max_sessions": "ADMISSION_MAX_SESSIONS",
+    "speculation_enabled": "SPECULATION",
+    "speculative_tts": "SPECULATIVE_TTS",
+    "model_server_socket": "MODEL_SERVER_SOCKET",
+}
+
+
+def _coerce(value: Any, current: Any) -> Any:
+    """`value` as the type of the setting's current value (ValueError / TypeError if it is not one)."""
+    if isinstance(current, bool):
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in ("1", "true"):
+            return True
+        if text in ("0", "false"):
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    return type(current)(value)
+
+
+def load_host_profile(cfg: "ModelConfig", path: str = HOST_PROFILE_PATH) -> Dict[str, Any]:
+    """Apply the "settings" of a host profile to cfg.  A missing file is a
+    no-op; an unreadable file, unknown keys, values of the wrong type and
+    settings whose environment variable is set (ENV_SETTINGS) are skipped
+    with a log line.  Returns the settings applied."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring host profile {path}: {e}")
+        return {}
+    settings = profile.get("settings", {}) if isinstance(profile, dict) else None
+    if not isinstance(settings, dict):
+        logger.warning(f"Ignoring host profile {path}: no \"settings\" object")
+        return {}
+    known = {f.name for f in fields(cfg)}
+    applied = {}
+    for key, value in settings.items():
+        if key not in known:
+            logger.warning(f"Host profile {path}: unknown setting '{key}' skipped")
+            continue
+        env = ENV_SETTINGS.get(key)
+        if env and env in os.environ:
+            logger.info(f"Host profile {path}: '{key}' skipped, {env} is set")
+            continue
+        try:
+            setattr(cfg, key, _coerce(value, getattr(cfg, key)))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Host profile {path}: bad value for '{key}' skipped ({e})")
+            continue
+        applied[key] = getattr(cfg, key)
+    if applied:
+        logger.info(f"Host profile {path}: {applied}")
+    return applied
+
+
 # Global config instance
 config = ModelConfig()
+load_host_profile(config)
@@ -1,11 +1,17 @@
 """
 ElevenLabs TTS Module — High-quality voice synthesis via ElevenLabs API.
 Uses the multilingual v2 model which supports Hindi, Tamil, Telugu, Bengali, etc.
+
+ElevenLabsTTS is the blocking client; AsyncElevenLabsTTS streams audio from
+the streaming endpoint over a shared keep-alive (HTTP/2 when `h2` is
+installed) connection pool.
 """
+import asyncio
 import io
 import logging
 import os
-from typing import Optional
+import weakref
+from typing import AsyncIterator, Optional
 
 import httpx
 import numpy as np
@@ -13,6 +19,12 @@ import soundfile as sf
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # ── Defaults (override via env vars or constructor) ─────────────────────────
 DEFAULT_API_KEY = os.getenv(
     "ELEVENLABS_API_KEY",
@@ -20,8 +32,20 @@ DEFAULT_API_KEY = os.getenv(
 )
 DEFAULT_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID", "pNInz6obpgDQGcFmaJgB")  # Adam
 DEFAULT_MODEL = "eleven_multilingual_v2"
+# Point at a local stub server for tests and benchmarks.
+DEFAULT_BASE_URL = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io")
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("ELEVENLABS_MAX_CONNECTIONS", "10"))
+DEFAULT_KEEPALIVE_EXPIRY = float(os.getenv("ELEVENLABS_KEEPALIVE_EXPIRY", "60"))
 
-ELEVENLABS_TTS_URL = "https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+TTS_PATH = "/v1/text-to-speech/{voice_id}"
+STREAM_PATH = "/v1/text-to-speech/{voice_id}/stream"
+
+VOICE_SETTINGS = {
+    "stability": 0.50,
+    "similarity_boost": 0.75,
+    "style": 0.0,
+    "use_speaker_boost": True,
+}
 
 
 class ElevenLabsTTS:
@@ -38,10 +62,12 @@ class ElevenLabsTTS:
         api_key: Optional[str] = None,
         voice_id: Optional[str] = None,
         model_id: str = DEFAULT_MODEL,
+        base_url: Optional[str] = None,
     ):
         self.api_key = api_key or DEFAULT_API_KEY
         self.voice_id = voice_id or DEFAULT_VOICE_ID
         self.model_id = model_id
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
 
         if not self.api_key:
             raise ValueError(
@@ -50,7 +76,7 @@ class ElevenLabsTTS:
             )
 
         # Reusable HTTP client (connection pooling, reduced timeout)
-        self._client = httpx.Client(timeout=8.0)
+        self._client = httpx.Client(base_url=self.base_url, timeout=8.0)
 
         logger.info(
             f"ElevenLabsTTS ready — voice={self.voice_id}, model={self.model_id}"
@@ -76,25 +102,11 @@ class ElevenLabsTTS:
             Raw audio bytes (MP3).
         """
         vid = voice_id or self.voice_id
-        url = ELEVENLABS_TTS_URL.format(voice_id=vid)
 
         resp = self._client.post(
-            url,
-            headers={
-                "xi-api-key": self.api_key,
-                "Content-Type": "application/json",
-                "Accept": "audio/mpeg",
-            },
-            json={
-                "text": text,
-                "model_id": self.model_id,
-                "voice_settings": {
-                    "stability": 0.50,
-                    "similarity_boost": 0.75,
-                    "style": 0.0,
-                    "use_speaker_boost": True,
-                },
-            },
+            TTS_PATH.format(voice_id=vid),
+            headers=_headers(self.api_key),
+            json=_payload(text, self.model_id),
             params={"output_format": output_format},
         )
 
@@ -136,3 +148,120 @@ class ElevenLabsTTS:
             self._client.close()
         except Exception:
             pass
+
+
+class AsyncElevenLabsTTS:
+    """
+    Async ElevenLabs client on the streaming text-to-speech endpoint.
+
+    - stream() yields audio bytes as they arrive instead of buffering the MP3
+    - One pooled httpx.AsyncClient (keep-alive, HTTP/2 if available) per
+      event loop, shared by every request made on that loop
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        voice_id: Optional[str] = None,
+        model_id: str = DEFAULT_MODEL,
+        base_url: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        http2: Optional[bool] = None,
+        timeout: float = 8.0,
+    ):
+        self.api_key = api_key or DEFAULT_API_KEY
+        self.voice_id = voice_id or DEFAULT_VOICE_ID
+        self.model_id = model_id
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections or max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self.timeout = timeout
+
+        if not self.api_key:
+            raise ValueError(
+                "ElevenLabs API key is required.  "
+                "Set ELEVENLABS_API_KEY env var or pass api_key= to constructor."
+            )
+        # httpx connections are bound to the loop that opened them
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    # ── Public API ──────────────────────────────────────────────────────────
+
+    async def stream(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        output_format: str = "mp3_44100_128",
+        chunk_size: int = 4096,
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize text, yielding audio bytes (MP3 by default) incrementally.
+
+        Args:
+            text: The text to speak.
+            voice_id: Override the default voice.
+            output_format: ElevenLabs output format string.
+            chunk_size: Max bytes per yielded chunk.
+        """
+        vid = voice_id or self.voice_id
+        client = self._ensure_client()
+        async with client.stream(
+            "POST",
+            STREAM_PATH.format(voice_id=vid),
+            headers=_headers(self.api_key),
+            json=_payload(text, self.model_id),
+            params={"output_format": output_format},
+        ) as resp:
+            if resp.status_code != 200:
+                body = (await resp.aread()).decode(errors="replace")
+                logger.error(f"ElevenLabs API error {resp.status_code}: {body[:300]}")
+                raise RuntimeError(f"ElevenLabs TTS failed ({resp.status_code}): {body[:200]}")
+            async for chunk in resp.aiter_bytes(chunk_size):
+                yield chunk
+
+    async def synthesize_bytes(self, text: str, voice_id: Optional[str] = None, **kwargs) -> bytes:
+        """stream(), collected into one bytes object."""
+        chunks = [chunk async for chunk in self.stream(text, voice_id=voice_id, **kwargs)]
+        return b"".join(chunks)
+
+    async def aclose(self):
+        """Release the pooled connections of the current event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[loop] = client
+            logger.info(f"AsyncElevenLabsTTS pool ready — {self.base_url} (http2={self.http2})")
+        return client
+
+
+def _headers(api_key: str) -> dict:
+    return {
+        "xi-api-key": api_key,
+        "Content-Type": "application/json",
+        "Accept": "audio/mpeg",
+    }
+
+
+def _payload(text: str, model_id: str) -> dict:
+    return {"text": text, "model_id": model_id, "voice_settings": VOICE_SETTINGS}
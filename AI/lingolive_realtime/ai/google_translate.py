@@ -0,0 +1,160 @@
+"""
+Google Translate fallback client — async, pooled, concurrent.
+Used by TranslationModule for language pairs without a MarianMT model
+(most Indic -> Indic pairs).
+
+One shared httpx.AsyncClient keeps connections alive across requests, a
+semaphore bounds in-flight requests, and short texts are packed into a single
+request (newline-joined) where the upstream keeps the line structure intact.
+"""
+import asyncio
+import logging
+import os
+import threading
+from typing import List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# ── Defaults (override via env vars or constructor) ─────────────────────────
+# Point at a local stub server for tests and benchmarks.
+DEFAULT_BASE_URL = os.getenv("GOOGLE_TRANSLATE_URL", "https://translate.googleapis.com")
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("GOOGLE_TRANSLATE_CONCURRENCY", "8"))
+DEFAULT_MAX_BATCH_CHARS = 1800          # keep packed requests well below upstream limits
+
+TRANSLATE_PATH = "/translate_a/single"
+
+
+class AsyncGoogleTranslator:
+    """
+    Async client for the public Google Translate endpoint.
+
+    - Shared connection pool (keep-alive) instead of one client per call
+    - At most `max_concurrency` requests in flight
+    - Packs several texts per request, falling back to one request per text
+      when the upstream merges or splits lines
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_batch_chars: int = DEFAULT_MAX_BATCH_CHARS,
+        timeout: float = 8.0,
+    ):
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.max_concurrency = max_concurrency
+        self.max_batch_chars = max_batch_chars
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    # ── Public API ──────────────────────────────────────────────────────────
+
+    async def translate_batch(self, texts: List[str], src: str, tgt: str) -> List[str]:
+        """Translate texts concurrently.  Returns translations in input order;
+        texts the upstream left empty are returned unchanged."""
+        if not texts:
+            return []
+        groups = self._pack(texts)
+        results = await asyncio.gather(*(self._translate_group(g, src, tgt) for g in groups))
+        out: List[str] = []
+        for group_result in results:
+            out.extend(group_result)
+        return out
+
+    async def aclose(self):
+        """Release pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def _pack(self, texts: List[str]) -> List[List[str]]:
+        """Group texts into newline-joined requests under the char budget."""
+        groups: List[List[str]] = []
+        current: List[str] = []
+        size = 0
+        for text in texts:
+            if "\n" in text or len(text) >= self.max_batch_chars:
+                if current:
+                    groups.append(current)
+                    current, size = [], 0
+                groups.append([text])
+                continue
+            if current and size + len(text) + 1 > self.max_batch_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(text)
+            size += len(text) + 1
+        if current:
+            groups.append(current)
+        return groups
+
+    async def _translate_group(self, group: List[str], src: str, tgt: str) -> List[str]:
+        if len(group) > 1:
+            joined = await self._request("\n".join(group), src, tgt)
+            lines = joined.split("\n") if joined else []
+            if len(lines) == len(group):
+                return [line.strip() or orig for line, orig in zip(lines, group)]
+            logger.debug(f"Packed request returned {len(lines)} lines for {len(group)} texts; retrying singly")
+        singles = await asyncio.gather(*(self._request(t, src, tgt) for t in group))
+        return [s.strip() or orig for s, orig in zip(singles, group)]
+
+    async def _request(self, text: str, src: str, tgt: str) -> str:
+        client = self._ensure_client()
+        async with self._semaphore:
+            resp = await client.post(
+                TRANSLATE_PATH,
+                params={"client": "gtx", "sl": src or "auto", "tl": tgt, "dt": "t"},
+                data={"q": text},
+            )
+        resp.raise_for_status()
+        data = resp.json()
+        return "".join(seg[0] for seg in (data[0] or []) if seg and seg[0])
+
+
+class SyncGoogleTranslator:
+    """
+    Blocking facade over AsyncGoogleTranslator for the thread-based callers
+    (TranslationModule runs inside asyncio.to_thread).  The async client lives
+    on a private event loop so its connection pool survives between calls.
+    """
+
+    def __init__(self, **kwargs):
+        self._async = AsyncGoogleTranslator(**kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="google-translate", daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return self._async.base_url
+
+    def translate_batch(self, texts: List[str], src: str, tgt: str, timeout: float = 30.0) -> List[str]:
+        future = asyncio.run_coroutine_threadsafe(self._async.translate_batch(texts, src, tgt), self._loop)
+        return future.result(timeout=timeout)
+
+    def close(self):
+        """Release HTTP client resources and stop the loop."""
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._async.aclose(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
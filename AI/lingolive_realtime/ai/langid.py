@@ -0,0 +1,123 @@
+"""
+Fast text language identification for source_lang="auto".
+Classifies by Unicode script block, then disambiguates languages that share a
+script (Hindi/Marathi/Sanskrit, Bengali/Assamese, Urdu/Arabic) with marker
+letters and common-word n-grams.  Pure Python, a few microseconds per message.
+"""
+from typing import Dict, List
+
+# ── Script blocks (codepoint >> 7 -> script) ────────────────────────────────
+_BLOCK_SCRIPT: Dict[int, str] = {
+    0x0600 >> 7: "arabic",       # U+0600-067F
+    0x0680 >> 7: "arabic",       # U+0680-06FF
+    0x0900 >> 7: "devanagari",
+    0x0980 >> 7: "bengali",
+    0x0A00 >> 7: "gurmukhi",
+    0x0A80 >> 7: "gujarati",
+    0x0B00 >> 7: "oriya",
+    0x0B80 >> 7: "tamil",
+    0x0C00 >> 7: "telugu",
+    0x0C80 >> 7: "kannada",
+    0x0D00 >> 7: "malayalam",
+}
+
+# Scripts used by exactly one supported language
+_SCRIPT_LANG: Dict[str, str] = {
+    "gurmukhi": "pa",
+    "gujarati": "gu",
+    "oriya": "or",
+    "tamil": "ta",
+    "telugu": "te",
+    "kannada": "kn",
+    "malayalam": "ml",
+}
+
+# ── Shared-script disambiguation ────────────────────────────────────────────
+_DEVANAGARI_WORDS: Dict[str, frozenset] = {
+    "hi": frozenset({
+        "है", "हैं", "और", "नहीं", "का", "की", "के", "में", "मैं", "आप", "यह",
+        "क्या", "हो", "था", "थी", "से", "को", "पर", "भी", "तुम", "कैसे", "हूँ", "हम",
+    }),
+    "mr": frozenset({
+        "आहे", "आहेत", "आणि", "नाही", "मी", "तुम्ही", "काय", "हे", "ते", "आम्ही",
+        "होते", "मला", "तू", "कसे", "कसा", "झाले", "आहोत", "आपण", "पण", "खूप",
+    }),
+    "sa": frozenset({
+        "अस्ति", "सन्ति", "च", "एव", "अहम्", "त्वम्", "वयम्", "भवति", "इति",
+        "तत्", "किम्", "अपि", "तस्य", "सः", "सा", "एतत्",
+    }),
+}
+_MARATHI_LETTER = "\u0933"                                    # ळ
+_VISARGA = "\u0903"                                           # ः
+_VIRAMA = "\u094D"                                            # ्
+
+_ASSAMESE_LETTERS = ("\u09F0", "\u09F1")                       # ৰ ৱ
+_URDU_LETTERS = ("\u0679", "\u0688", "\u0691", "\u06BA", "\u06BE",
+                 "\u06C1", "\u06D2", "\u06A9", "\u06AF", "\u06CC")  # ٹ ڈ ڑ ں ھ ہ ے ک گ ی
+_ARABIC_LETTERS = ("\u0629", "\u0643", "\u064A", "\u0649")     # ة ك ي ى
+
+_SAMPLE_CHARS = 48   # script letters examined before deciding
+
+
+def detect_script(text: str) -> str:
+    """Return the dominant non-Latin script of `text`, or 'latin'."""
+    if text.isascii():
+        return "latin"
+    counts: Dict[str, int] = {}
+    seen = 0
+    for ch in text:
+        cp = ord(ch)
+        if cp < 0x0600:
+            continue
+        script = _BLOCK_SCRIPT.get(cp >> 7)
+        if script is None:
+            continue
+        counts[script] = counts.get(script, 0) + 1
+        seen += 1
+        if seen >= _SAMPLE_CHARS:
+            break
+    if not counts:
+        return "latin"
+    return max(counts, key=counts.__getitem__)
+
+
+def detect_language(text: str, default: str = "en") -> str:
+    """
+    Identify the language of a chat message.
+
+    Args:
+        text: Message text
+        default: ISO code returned for Latin/unknown scripts
+
+    Returns:
+        ISO-639-1 code ('hi', 'ta', 'ur', ...)
+    """
+    script = detect_script(text)
+    if script == "latin":
+        return default
+    lang = _SCRIPT_LANG.get(script)
+    if lang is not None:
+        return lang
+    if script == "devanagari":
+        return _disambiguate_devanagari(text)
+    if script == "bengali":
+        return "as" if any(c in text for c in _ASSAMESE_LETTERS) else "bn"
+    # arabic
+    urdu = sum(text.count(c) for c in _URDU_LETTERS)
+    arabic = sum(text.count(c) for c in _ARABIC_LETTERS)
+    return "ar" if arabic > urdu else "ur"
+
+
+def detect_languages(texts: List[str], default: str = "en") -> List[str]:
+    """Batch form of detect_language."""
+    return [detect_language(t, default) for t in texts]
+
+
+def _disambiguate_devanagari(text: str) -> str:
+    words = text.replace("\u0964", " ").replace("?", " ").replace(",", " ").split()
+    scores = {lang: sum(1 for w in words if w in vocab) for lang, vocab in _DEVANAGARI_WORDS.items()}
+    scores["mr"] += text.count(_MARATHI_LETTER)
+    scores["sa"] += text.count(_VISARGA) + sum(1 for w in words if w.endswith(_VIRAMA))
+    best = max(scores, key=scores.__getitem__)
+    # Ties (including no evidence) go to Hindi, by far the most common
+    return best if scores[best] > scores["hi"] else "hi"
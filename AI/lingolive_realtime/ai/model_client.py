@@ -0,0 +1,247 @@
+"""
+Thin clients for the model server (see model_server.py).
+
+ModelClient is a blocking, thread-safe client over a small pool of Unix
+socket connections.  RemoteASR / RemoteTranslator / RemoteTTS mirror the
+parts of ASRModule / TranslationModule / TTSModule the front ends use, so
+they can be swapped in when MODEL_SERVER_SOCKET is set.
+"""
+import asyncio
+import logging
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .config import config
+from .model_ipc import DEFAULT_SOCKET_PATH, ModelServerError, encode_frame, recv_frame
+from .scheduler import current_priority
+from .tts_hedge import HedgeResult
+
+logger = logging.getLogger(__name__)
+
+
+class ModelClient:
+    """
+    Blocking request/response client; one request in flight per connection.
+
+    Args:
+        socket_path: Model server socket (default: config / DEFAULT_SOCKET_PATH)
+        pool_size: Max concurrent requests (= connections) from this process
+        timeout: Seconds to wait for a response
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, pool_size: Optional[int] = None, timeout: Optional[float] = None):
+        self.socket_path = socket_path or config.model_server_socket or DEFAULT_SOCKET_PATH
+        self.pool_size = pool_size or config.model_server_pool_size
+        self.timeout = timeout or config.model_server_timeout_s
+        self._idle: List[socket.socket] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+
+    def call(self, op: str, payload: bytes = b"", **args) -> Tuple[Any, bytes]:
+        """
+        Run `op` on the server.
+
+        Returns:
+            (JSON result, binary payload)
+
+        Raises:
+            ModelServerError: the operation failed on the server
+            ConnectionError / OSError: the server is unreachable
+        """
+        frame = encode_frame({"op": op, "args": args}, payload)
+        with self._slots:
+            sock, reused = self._checkout()
+            try:
+                header, data = self._roundtrip(sock, frame)
+            except ConnectionError:
+                sock.close()
+                if not reused:
+                    raise
+                # Idle connection went stale (server restarted): retry once on a fresh one
+                sock = self._connect()
+                try:
+                    header, data = self._roundtrip(sock, frame)
+                except BaseException:
+                    sock.close()
+                    raise
+            except BaseException:
+                sock.close()   # state unknown (timeout, interrupt): never reuse
+                raise
+            with self._lock:
+                self._idle.append(sock)
+        if not header.get("ok"):
+            raise ModelServerError(header.get("error", ""), header.get("type", "Exception"))
+        return header.get("result"), data
+
+    async def acall(self, op: str, payload: bytes = b"", **args) -> Tuple[Any, bytes]:
+        """call() from async code (runs in a worker thread)."""
+        return await asyncio.to_thread(self.call, op, payload, **args)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for sock in idle:
+            sock.close()
+
+    def _checkout(self) -> Tuple[socket.socket, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    @staticmethod
+    def _roundtrip(sock: socket.socket, frame: bytes) -> Tuple[dict, bytes]:
+        sock.sendall(frame)
+        return recv_frame(sock)
+
+
+_client: Optional[ModelClient] = None
+_client_lock = threading.Lock()
+
+
+def get_model_client() -> ModelClient:
+    """Process-wide client for config.model_server_socket."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ModelClient()
+    return _client
+
+
+def remote_models_enabled() -> bool:
+    """True when the front end should use the model server instead of local models."""
+    return bool(config.model_server_socket)
+
+
+def _pcm(audio: np.ndarray) -> bytes:
+    return np.ascontiguousarray(audio, dtype=np.float32).tobytes()
+
+
+class _Remote:
+    def __init__(self, client: Optional[ModelClient] = None):
+        self._client = client or get_model_client()
+        # Session ids are only unique per front-end process; the server is shared
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}:"
+
+    def _session(self, session_id: Optional[str]) -> Optional[str]:
+        return None if session_id is None else self._prefix + session_id
+
+
+class RemoteASR(_Remote):
+    """ASRModule over the model server (audio sent as float32 PCM or file bytes)."""
+
+    def transcribe_fast(
+        self,
+        audio: np.ndarray,
+        language: Optional[str] = None,
+        session_id: Optional[str] = None,
+        trim_silence: bool = False,
+    ) -> dict:
+        result, _ = self._client.call(
+            "asr.transcribe_fast", _pcm(audio),
+            language=language, session_id=self._session(session_id), trim_silence=trim_silence,
+        )
+        return result
+
+    def transcribe_long(self, audio: Union[str, Path, np.ndarray], language: Optional[str] = None) -> dict:
+        if isinstance(audio, (str, Path)):
+            path = Path(audio)
+            result, _ = self._client.call("asr.transcribe_long", path.read_bytes(), language=language, suffix=path.suffix)
+        else:
+            result, _ = self._client.call("asr.transcribe_long", _pcm(audio), language=language)
+        return result
+
+    def end_session(self, session_id: str) -> None:
+        self._client.call("asr.end_session", session_id=self._session(session_id))
+
+    def warmup(self) -> float:
+        return self._client.call("asr.warmup")[0]
+
+    def get_model_info(self) -> dict:
+        return self._client.call("info")[0]["asr"] or {}
+
+
+class RemoteTranslator(_Remote):
+    """TranslationModule over the model server; single texts are batched
+    server-side with concurrent calls from all front ends.  Calls made from a
+    scheduler job carry its priority class to the server's scheduler."""
+
+    def translate(self, text: Union[str, List[str]], source_lang: str, target_lang: str, **kwargs) -> Union[str, List[str]]:
+        return self._call("mt.translate", text=text, source_lang=source_lang, target_lang=target_lang)
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str, batch_size: Optional[int] = None, **kwargs) -> List[str]:
+        return self._call(
+            "mt.translate_batch", texts=texts, source_lang=source_lang, target_lang=target_lang, batch_size=batch_size
+        )
+
+    def translate_incremental(
+        self,
+        session_id: str,
+        partial_text: str,
+        source_lang: str,
+        target_lang: str,
+        is_final: bool = False,
+        translate_tail: bool = True,
+    ) -> dict:
+        return self._call(
+            "mt.translate_incremental",
+            session_id=self._session(session_id), partial_text=partial_text,
+            source_lang=source_lang, target_lang=target_lang,
+            is_final=is_final, translate_tail=translate_tail,
+        )
+
+    def has_session(self, session_id: str) -> bool:
+        return self._client.call("mt.has_session", session_id=self._session(session_id))[0]
+
+    def end_session(self, session_id: str) -> None:
+        self._client.call("mt.end_session", session_id=self._session(session_id))
+
+    def warmup(self, pairs: List[Tuple[str, str]], workers: Optional[int] = None, run: bool = True) -> dict:
+        return self._client.call("mt.warmup", pairs=[list(p) for p in pairs], workers=workers, run=run)[0]
+
+    def get_model_info(self) -> dict:
+        return self._client.call("info")[0]["translator"] or {}
+
+    def _call(self, op: str, **args):
+        priority = current_priority()
+        if priority is not None:
+            args["priority"] = int(priority)
+        return self._client.call(op, **args)[0]
+
+
+class RemoteHedger:
+    """Stands in for TTSModule.hedger: hedging runs in the model server."""
+
+    def __init__(self, client: ModelClient):
+        self._client = client
+
+    async def synthesize(self, text: str, language: str = "english") -> HedgeResult:
+        result, data = await self._client.acall("tts.synthesize", text=text, language=language)
+        return HedgeResult(data, result["engine"], result["latency_s"], result["hedged"])
+
+    def stats(self) -> dict:
+        return self._client.call("tts.stats")[0]
+
+
+class RemoteTTS(_Remote):
+    """TTSModule over the model server (MP3 returned as the binary payload)."""
+
+    def __init__(self, client: Optional[ModelClient] = None):
+        super().__init__(client)
+        self.hedger = RemoteHedger(self._client)
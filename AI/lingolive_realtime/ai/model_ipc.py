@@ -0,0 +1,82 @@
+"""
+Wire format shared by the model server and its clients.
+
+One frame per message over a Unix stream socket:
+
+    !II header_len payload_len | header (UTF-8 JSON) | payload (raw bytes)
+
+Requests carry {"op": ..., "args": {...}} in the header; responses carry
+{"ok": true, "result": ...} or {"ok": false, "error": ..., "type": ...}.
+Audio travels in the payload as raw bytes (float32 PCM, encoded files, MP3),
+never as JSON/base64.
+"""
+import asyncio
+import json
+import socket
+import struct
+from typing import Any, Tuple
+
+import numpy as np
+
+DEFAULT_SOCKET_PATH = "/tmp/lingolive-models.sock"
+
+_PREFIX = struct.Struct("!II")
+MAX_HEADER_BYTES = 1 << 20          # 1 MB of JSON
+MAX_PAYLOAD_BYTES = 256 << 20       # ~2 h of 16 kHz float32 audio
+
+
+class ModelServerError(RuntimeError):
+    """An operation failed inside the model server (remote exception)."""
+
+    def __init__(self, message: str, remote_type: str = "Exception"):
+        super().__init__(f"{remote_type}: {message}")
+        self.remote_type = remote_type
+
+
+def _json_default(value: Any):
+    # numpy scalars/arrays show up in model results (probabilities, timestamps)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_frame(header: dict, payload: bytes = b"") -> bytes:
+    head = json.dumps(header, default=_json_default, ensure_ascii=False).encode()
+    return _PREFIX.pack(len(head), len(payload)) + head + payload
+
+
+def _check_sizes(header_len: int, payload_len: int) -> None:
+    if header_len > MAX_HEADER_BYTES or payload_len > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"Frame too large (header {header_len} B, payload {payload_len} B)")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[dict, bytes]:
+    """Next (header, payload); raises asyncio.IncompleteReadError at EOF."""
+    header_len, payload_len = _PREFIX.unpack(await reader.readexactly(_PREFIX.size))
+    _check_sizes(header_len, payload_len)
+    header = json.loads(await reader.readexactly(header_len))
+    payload = await reader.readexactly(payload_len) if payload_len else b""
+    return header, payload
+
+
+def recv_frame(sock: socket.socket) -> Tuple[dict, bytes]:
+    """Blocking counterpart of read_frame(); raises ConnectionError at EOF."""
+    header_len, payload_len = _PREFIX.unpack(_recv_exactly(sock, _PREFIX.size))
+    _check_sizes(header_len, payload_len)
+    header = json.loads(_recv_exactly(sock, header_len))
+    payload = _recv_exactly(sock, payload_len) if payload_len else b""
+    return header, payload
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:])
+        if not k:
+            raise ConnectionError("Model server closed the connection")
+        got += k
+    return bytes(buf)
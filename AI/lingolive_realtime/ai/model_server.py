@@ -0,0 +1,447 @@
+"""
+Model server - one process that owns the ASR, translation and TTS models.
+
+Front ends (translation_server workers, app.py) connect over a Unix socket
+(see model_ipc for the frame format) instead of loading their own copies of
+faster-whisper and MarianMT, so they can be scaled out on small workers.
+Single-text translate calls from all clients are coalesced into batched
+model calls, and all translation work runs through the priority scheduler
+(the client's priority class travels with each request).
+
+Run (from AI/lingolive_realtime):
+  python -m ai.model_server [--socket /tmp/lingolive-models.sock] [--no-warmup]
+and start the front ends with MODEL_SERVER_SOCKET pointing at the socket.
+"""
+import argparse
+import asyncio
+import collections
+import logging
+import os
+import signal
+import socket
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import config, parse_language_pairs
+from .model_ipc import DEFAULT_SOCKET_PATH, encode_frame, read_frame
+from .scheduler import InferenceScheduler, Priority, chunked, get_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationBatcher:
+    """
+    Coalesces single-text translations from concurrent callers.
+
+    Texts for the same (source, target) pair and priority class that arrive
+    within `window_ms` of the first one, up to `max_batch`, are translated in
+    one model call.
+
+    Args:
+        translate_fn: Blocking fn(texts, source, target) -> translations
+        window_ms: How long the first text of a batch waits for company
+        max_batch: Flush as soon as this many texts are queued
+        scheduler: Run model calls through this scheduler (default: a thread)
+    """
+
+    def __init__(
+        self,
+        translate_fn: Callable[[List[str], str, str], List[str]],
+        window_ms: float = 5.0,
+        max_batch: int = 16,
+        scheduler: Optional[InferenceScheduler] = None,
+    ):
+        self._translate_fn = translate_fn
+        self._scheduler = scheduler
+        self.window_s = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._pending: Dict[tuple, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[tuple, asyncio.TimerHandle] = {}
+        self.batches = 0
+        self.items = 0
+
+    async def translate(self, text: str, source: str, target: str, priority: Priority = Priority.MEDIUM) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (source, target, Priority(priority))
+        queue = self._pending.setdefault(key, [])
+        queue.append((text, future))
+        if len(queue) >= self.max_batch:
+            self._flush(key)
+        elif len(queue) == 1:
+            self._timers[key] = loop.call_later(self.window_s, self._flush, key)
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.items,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else None,
+        }
+
+    def _flush(self, key: tuple) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(key, None)
+        if items:
+            asyncio.ensure_future(self._run(key, items))
+
+    async def _run(self, key: tuple, items: List[Tuple[str, asyncio.Future]]) -> None:
+        source, target, priority = key
+        texts = [text for text, _ in items]
+        try:
+            if self._scheduler is not None:
+                results = await self._scheduler.run(priority, self._translate_fn, texts, source, target)
+            else:
+                results = await asyncio.to_thread(self._translate_fn, texts, source, target)
+        except BaseException as e:
+            # Failed or cancelled (e.g. the scheduler shut down): no caller may be left waiting
+            for _, future in items:
+                if not future.done():
+                    if isinstance(e, Exception):
+                        future.set_exception(e)
+                    else:
+                        future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+        self.batches += 1
+        self.items += len(items)
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class ModelServer:
+    """
+    Serves ASR, translation and TTS over a Unix socket.
+
+    Models are created on first use (or by warmup()) unless passed in.
+
+    Args:
+        socket_path: Socket to listen on (default: config / DEFAULT_SOCKET_PATH)
+        asr / translator / tts: Model objects to serve instead of the
+            ASRModule / TranslationModule / TTSModule singletons
+        scheduler: Priority scheduler for translation (default: get_scheduler())
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        asr=None,
+        translator=None,
+        tts=None,
+        scheduler: Optional[InferenceScheduler] = None,
+    ):
+        self.socket_path = socket_path or config.model_server_socket or DEFAULT_SOCKET_PATH
+        self._asr, self._translator, self._tts = asr, translator, tts
+        self._model_locks = {name: threading.Lock() for name in ("asr", "translator", "tts")}
+        self.scheduler = scheduler or get_scheduler()
+        self.batcher = TranslationBatcher(
+            lambda texts, src, tgt: self.translator.translate(texts, src, tgt),
+            window_ms=config.model_server_batch_window_ms,
+            max_batch=config.model_server_max_batch,
+            scheduler=self.scheduler,
+        )
+        self._ops: Dict[str, Callable] = {
+            "ping": self._op_ping,
+            "info": self._op_info,
+            "asr.transcribe_fast": self._op_asr_transcribe_fast,
+            "asr.transcribe_long": self._op_asr_transcribe_long,
+            "asr.end_session": self._op_asr_end_session,
+            "asr.warmup": self._op_asr_warmup,
+            "mt.translate": self._op_mt_translate,
+            "mt.translate_batch": self._op_mt_translate_batch,
+            "mt.translate_incremental": self._op_mt_translate_incremental,
+            "mt.has_session": self._op_mt_has_session,
+            "mt.end_session": self._op_mt_end_session,
+            "mt.warmup": self._op_mt_warmup,
+            "tts.synthesize": self._op_tts_synthesize,
+            "tts.stats": self._op_tts_stats,
+        }
+        self._requests: Dict[str, int] = collections.Counter()
+        self._errors: Dict[str, int] = collections.Counter()
+        self.clients = 0
+        self._started = time.time()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}   # live client handlers
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    # ── Models (created lazily, once) ───────────────────────────────────────
+
+    @property
+    def asr(self):
+        if self._asr is None:
+            with self._model_locks["asr"]:
+                if self._asr is None:
+                    from .asr_module import ASRModule
+                    self._asr = ASRModule()
+        return self._asr
+
+    @property
+    def translator(self):
+        if self._translator is None:
+            with self._model_locks["translator"]:
+                if self._translator is None:
+                    from .translation_module import TranslationModule
+                    self._translator = TranslationModule()
+        return self._translator
+
+    @property
+    def tts(self):
+        if self._tts is None:
+            with self._model_locks["tts"]:
+                if self._tts is None:
+                    from .tts_module import TTSModule
+                    self._tts = TTSModule()
+        return self._tts
+
+    async def warmup(self, pairs: List[Tuple[str, str]]) -> Dict[str, str]:
+        """Load and warm all three models in parallel."""
+        def _asr() -> str:
+            return f"ready ({self.asr.warmup():.2f}s dummy decode)"
+
+        def _translator() -> str:
+            pair_status = self.translator.warmup(pairs)
+            failed = [pair for pair, status in pair_status.items() if status.startswith("failed")]
+            return f"failed: {', '.join(failed)}" if failed else "ready"
+
+        def _tts() -> str:
+            return "ready" if self.tts is not None else "failed"
+
+        jobs = {"asr": _asr, "translator": _translator, "tts": _tts}
+
+        async def _job(fn):
+            try:
+                return await asyncio.to_thread(fn)
+            except Exception as e:
+                return f"failed: {e}"
+
+        status = dict(zip(jobs, await asyncio.gather(*(_job(fn) for fn in jobs.values()))))
+        logger.info(f"Model server warm: {status}")
+        return status
+
+    # ── Serving ─────────────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        _remove_stale_socket(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        logger.info(f"Model server listening on {self.socket_path} (pid {os.getpid()})")
+
+    async def run(self, warmup_pairs: Optional[List[Tuple[str, str]]] = None) -> None:
+        """Serve until stop() is called."""
+        await self.start()
+        try:
+            if warmup_pairs is not None:
+                await self.warmup(warmup_pairs)
+            await self._stop.wait()
+        finally:
+            self._server.close()
+            await self._close_connections()
+            await self._server.wait_closed()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            logger.info("Model server stopped")
+
+    def stop(self) -> None:
+        """Stop serving (safe to call from any thread)."""
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    async def _close_connections(self, grace_s: float = 5.0) -> None:
+        """Close every client connection and wait for its handler: idle ones
+        end at once, calls in flight get `grace_s` to finish, then are cancelled."""
+        handlers = list(self._connections)
+        for writer in self._connections.values():
+            writer.close()
+        if not handlers:
+            return
+        _, pending = await asyncio.wait(handlers, timeout=grace_s)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Clients send one request at a time per connection and pool connections
+        self.clients += 1
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    header, payload = await read_frame(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                response, out = await self._dispatch(header, payload)
+                try:
+                    writer.write(encode_frame(response, out))
+                    await writer.drain()
+                except (ConnectionError, BrokenPipeError) as e:
+                    # The client gave up (e.g. its call timed out) and closed the socket
+                    logger.debug(f"Client left before its {header.get('op')} response: {e}")
+                    break
+        except ValueError as e:
+            logger.warning(f"Dropping client: {e}")
+        finally:
+            self.clients -= 1
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _dispatch(self, header: dict, payload: bytes) -> Tuple[dict, bytes]:
+        op = header.get("op")
+        fn = self._ops.get(op)
+        if fn is None:
+            return {"ok": False, "error": f"Unknown op {op!r}", "type": "ValueError"}, b""
+        self._requests[op] += 1
+        try:
+            result, out = await fn(header.get("args") or {}, payload)
+        except Exception as e:
+            self._errors[op] += 1
+            logger.warning(f"{op} failed: {e}")
+            return {"ok": False, "error": str(e), "type": type(e).__name__}, b""
+        return {"ok": True, "result": result}, out
+
+    # ── Ops: (args, payload) -> (JSON result, binary payload) ───────────────
+
+    async def _op_ping(self, args: dict, payload: bytes):
+        return {"pid": os.getpid(), "uptime_s": round(time.time() - self._started, 1)}, b""
+
+    async def _op_info(self, args: dict, payload: bytes):
+        return {
+            "pid": os.getpid(),
+            "clients": self.clients,
+            "asr": self._asr.get_model_info() if self._asr is not None else None,
+            "translator": self._translator.get_model_info() if self._translator is not None else None,
+            "tts_hedging": self._tts.hedger.stats() if self._tts is not None else None,
+            "batching": self.batcher.stats(),
+            "scheduler": self.scheduler.stats(),
+            "requests": dict(self._requests),
+            "errors": dict(self._errors),
+        }, b""
+
+    async def _op_asr_transcribe_fast(self, args: dict, payload: bytes):
+        audio = np.frombuffer(payload, dtype=np.float32)
+        result = await asyncio.to_thread(
+            lambda: self.asr.transcribe_fast(
+                audio, args.get("language"), args.get("session_id"), trim_silence=args.get("trim_silence", False)
+            )
+        )
+        return result, b""
+
+    async def _op_asr_transcribe_long(self, args: dict, payload: bytes):
+        suffix = args.get("suffix")
+        if suffix is None:
+            audio = np.frombuffer(payload, dtype=np.float32)
+            return await asyncio.to_thread(lambda: self.asr.transcribe_long(audio, args.get("language"))), b""
+
+        def _from_file() -> dict:
+            # Encoded upload (wav/webm/mp3...): decode from a temp file like the REST path does
+            with tempfile.NamedTemporaryFile(suffix=suffix) as f:
+                f.write(payload)
+                f.flush()
+                return self.asr.transcribe_long(f.name, args.get("language"))
+
+        return await asyncio.to_thread(_from_file), b""
+
+    async def _op_asr_end_session(self, args: dict, payload: bytes):
+        if self._asr is not None:
+            self._asr.end_session(args["session_id"])
+        return None, b""
+
+    async def _op_asr_warmup(self, args: dict, payload: bytes):
+        return await asyncio.to_thread(lambda: self.asr.warmup()), b""
+
+    async def _op_mt_translate(self, args: dict, payload: bytes):
+        text, src, tgt = args.get("text"), args["source_lang"], args["target_lang"]
+        priority = _priority(args, Priority.MEDIUM)
+        if isinstance(text, str):
+            text = text.strip()
+            return (await self.batcher.translate(text, src, tgt, priority) if text else ""), b""
+        return await self.scheduler.run(priority, lambda: self.translator.translate(text or [], src, tgt)), b""
+
+    async def _op_mt_translate_batch(self, args: dict, payload: bytes):
+        src, tgt, batch_size = args["source_lang"], args["target_lang"], args.get("batch_size")
+        chunks = await self.scheduler.run_batches(
+            _priority(args, Priority.LOW),
+            lambda chunk: self.translator.translate_batch(chunk, src, tgt, batch_size=batch_size),
+            chunked(args["texts"], config.scheduler_batch_chunk),
+        )
+        return [t for chunk in chunks for t in chunk], b""
+
+    async def _op_mt_translate_incremental(self, args: dict, payload: bytes):
+        priority = _priority(args, Priority.HIGH)
+        return await self.scheduler.run(priority, lambda: self.translator.translate_incremental(**args)), b""
+
+    async def _op_mt_has_session(self, args: dict, payload: bytes):
+        return self._translator is not None and self._translator.has_session(args["session_id"]), b""
+
+    async def _op_mt_end_session(self, args: dict, payload: bytes):
+        if self._translator is not None:
+            self._translator.end_session(args["session_id"])
+        return None, b""
+
+    async def _op_mt_warmup(self, args: dict, payload: bytes):
+        pairs = [tuple(p) for p in args.get("pairs", [])]
+        return await asyncio.to_thread(
+            lambda: self.translator.warmup(pairs, workers=args.get("workers"), run=args.get("run", True))
+        ), b""
+
+    async def _op_tts_synthesize(self, args: dict, payload: bytes):
+        tts = await asyncio.to_thread(lambda: self.tts)
+        result = await tts.hedger.synthesize(args["text"], args.get("language", "english"))
+        return {"engine": result.engine, "latency_s": result.latency_s, "hedged": result.hedged}, result.data
+
+    async def _op_tts_stats(self, args: dict, payload: bytes):
+        tts = await asyncio.to_thread(lambda: self.tts)
+        return tts.hedger.stats(), b""
+
+
+def _priority(args: dict, default: Priority) -> Priority:
+    """Priority class sent by the client (popped from args), else `default`."""
+    value = args.pop("priority", None)
+    return default if value is None else Priority(value)
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink a socket file left behind by a dead server; refuse to take over a live one."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"Another model server is already listening on {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LingoLive model server (ASR, translation, TTS over a Unix socket)")
+    parser.add_argument("--socket", default=None, help=f"socket path (default: $MODEL_SERVER_SOCKET or {DEFAULT_SOCKET_PATH})")
+    parser.add_argument("--no-warmup", action="store_true", help="load models on first request instead of at startup")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = ModelServer(args.socket)
+
+    async def _run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, server.stop)
+        await server.run(None if args.no_warmup else parse_language_pairs(config.warmup_language_pairs))
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
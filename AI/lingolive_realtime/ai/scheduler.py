@@ -0,0 +1,264 @@
+"""
+Priority-aware inference scheduler.
+
+Translation work from live calls, chat and history backfill shares one small
+pool of worker threads, served by priority class:
+
+    HIGH    live voice (/ws/voice utterances and partial captions)
+    MEDIUM  single chat messages, uploaded voice notes
+    LOW     batch translation / backfill
+
+Batch jobs are split into chunks and re-queued after every chunk, so waiting
+higher-priority work runs at the next batch boundary (preemption) and
+concurrent backfills take turns.  A queued job that has waited longer than
+its class's max wait is served ahead of higher classes (starvation
+protection).  Per-class queue depth, wait and run times are in stats().
+"""
+import asyncio
+import collections
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence
+
+from .config import config
+from .tts_hedge import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    HIGH = 0      # live voice
+    MEDIUM = 1    # single chat messages
+    LOW = 2       # batch / backfill
+
+
+_current_priority: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar("priority", default=None)
+
+
+def current_priority() -> Optional[Priority]:
+    """Priority of the scheduler job running in this thread (None outside one)."""
+    return _current_priority.get()
+
+
+@dataclass
+class _Job:
+    priority: Priority
+    fn: Callable
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    chunks: Optional[List[Any]] = None    # batch job: fn(chunk) per chunk
+    results: List[Any] = field(default_factory=list)
+    future: Future = field(default_factory=Future)
+    queued_at: float = 0.0
+    started: bool = False
+
+
+class _ClassStats:
+    def __init__(self, window: int):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.promoted = 0       # served ahead of higher classes (starvation)
+        self.preempted = 0      # batch boundaries that yielded to higher classes
+        self.wait = LatencyTracker(window)
+        self.run = LatencyTracker(window)
+
+
+class InferenceScheduler:
+    """
+    Runs blocking inference calls on `workers` threads in priority order.
+
+    Args:
+        workers: Worker threads (= concurrent inference calls)
+        max_wait_s: {priority: seconds} a queued job may wait before it is
+            served ahead of higher classes (classes not listed never jump)
+        window: Samples kept per class for the wait/run percentiles
+        on_wait: Called as on_wait(priority, seconds) with each job's queue
+            wait when it starts running (e.g. to feed admission control)
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_wait_s: Optional[Dict[Priority, float]] = None,
+        window: int = 500,
+        on_wait: Optional[Callable[[Priority, float], None]] = None,
+    ):
+        self.workers = max(1, workers)
+        self.max_wait_s = dict(max_wait_s or {})
+        self._queues: Dict[Priority, Deque[_Job]] = {p: collections.deque() for p in Priority}
+        self._stats: Dict[Priority, _ClassStats] = {p: _ClassStats(window) for p in Priority}
+        self._cv = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self.on_wait = on_wait
+
+    # ── Submitting work ─────────────────────────────────────────────────────
+
+    def submit(self, priority: Priority, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs); returns a Future with its result."""
+        return self._enqueue(_Job(Priority(priority), fn, args, kwargs))
+
+    def submit_batches(self, priority: Priority, fn: Callable[[Any], Any], chunks: Iterable[Any]) -> Future:
+        """Queue fn(chunk) for each chunk, one chunk per turn.  The Future's
+        result is the list of per-chunk results, in order."""
+        chunks = list(chunks)
+        if not chunks:
+            future: Future = Future()
+            future.set_result([])
+            return future
+        return self._enqueue(_Job(Priority(priority), fn, chunks=chunks))
+
+    async def run(self, priority: Priority, fn: Callable, *args, **kwargs) -> Any:
+        return await asyncio.wrap_future(self.submit(priority, fn, *args, **kwargs))
+
+    async def run_batches(self, priority: Priority, fn: Callable[[Any], Any], chunks: Iterable[Any]) -> List[Any]:
+        return await asyncio.wrap_future(self.submit_batches(priority, fn, chunks))
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    # ── Metrics ─────────────────────────────────────────────────────────────
+
+    def oldest_wait(self, lowest: Priority = Priority.LOW) -> float:
+        """Seconds the oldest job queued at `lowest` priority or above has been waiting (0 if none)."""
+        now = time.monotonic()
+        with self._cv:
+            heads = [q[0].queued_at for p, q in self._queues.items() if p <= lowest and q]
+        return now - min(heads) if heads else 0.0
+
+    def stats(self) -> dict:
+        classes = {}
+        with self._cv:
+            depths = {p: len(q) for p, q in self._queues.items()}
+        for p, s in self._stats.items():
+            wait50, wait95, run50 = s.wait.percentile(0.5), s.wait.percentile(0.95), s.run.percentile(0.5)
+            classes[p.name.lower()] = {
+                "queued": depths[p],
+                "submitted": s.submitted,
+                "completed": s.completed,
+                "failed": s.failed,
+                "promoted": s.promoted,
+                "preempted": s.preempted,
+                "wait_p50_ms": round(wait50 * 1000, 1) if wait50 is not None else None,
+                "wait_p95_ms": round(wait95 * 1000, 1) if wait95 is not None else None,
+                "run_p50_ms": round(run50 * 1000, 1) if run50 is not None else None,
+            }
+        return {"workers": self.workers, "classes": classes}
+
+    # ── Internals ───────────────────────────────────────────────────────────
+
+    def _enqueue(self, job: _Job) -> Future:
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("Scheduler is shut down")
+            job.queued_at = time.monotonic()
+            self._queues[job.priority].append(job)
+            self._stats[job.priority].submitted += 1
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f"infer-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cv.notify()
+        return job.future
+
+    def _pick(self) -> Optional[_Job]:
+        """Next job: the most overdue starving job, else strict priority.  Caller holds the lock."""
+        now = time.monotonic()
+        overdue, worst = None, 0.0
+        for p, queue in self._queues.items():
+            limit = self.max_wait_s.get(p)
+            if queue and limit is not None and now - queue[0].queued_at - limit > worst:
+                overdue, worst = p, now - queue[0].queued_at - limit
+        if overdue is not None:
+            if any(self._queues[p] for p in Priority if p < overdue):
+                self._stats[overdue].promoted += 1
+            return self._queues[overdue].popleft()
+        for queue in self._queues.values():
+            if queue:
+                return queue.popleft()
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cv:
+                job = self._pick()
+                while job is None:
+                    if self._closed:
+                        return
+                    self._cv.wait()
+                    job = self._pick()
+            self._run(job)
+
+    def _run(self, job: _Job) -> None:
+        stats = self._stats[job.priority]
+        if not job.started:
+            if not job.future.set_running_or_notify_cancel():
+                return      # cancelled while queued
+            job.started = True
+        started = time.monotonic()
+        stats.wait.observe(started - job.queued_at)
+        if self.on_wait is not None:
+            self.on_wait(job.priority, started - job.queued_at)
+        token = _current_priority.set(job.priority)
+        try:
+            if job.chunks is None:
+                result = job.fn(*job.args, **job.kwargs)
+            else:
+                job.results.append(job.fn(job.chunks[len(job.results)]))
+        except BaseException as e:
+            with self._cv:
+                stats.failed += 1
+            job.future.set_exception(e)
+            return
+        finally:
+            _current_priority.reset(token)
+            stats.run.observe(time.monotonic() - started)
+
+        if job.chunks is not None and len(job.results) < len(job.chunks):
+            # Batch boundary: go to the back of the class queue
+            with self._cv:
+                if any(self._queues[p] for p in Priority if p < job.priority):
+                    stats.preempted += 1
+                job.queued_at = time.monotonic()
+                self._queues[job.priority].append(job)
+                self._cv.notify()
+            return
+        with self._cv:
+            stats.completed += 1
+        job.future.set_result(result if job.chunks is None else job.results)
+
+
+def chunked(items: Sequence[Any], size: int) -> List[Sequence[Any]]:
+    size = max(1, size)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+_scheduler: Optional[InferenceScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> InferenceScheduler:
+    """Process-wide scheduler configured from config.scheduler_*."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = InferenceScheduler(
+                    workers=config.scheduler_workers,
+                    max_wait_s={
+                        Priority.MEDIUM: config.scheduler_medium_max_wait_s,
+                        Priority.LOW: config.scheduler_low_max_wait_s,
+                    },
+                )
+    return _scheduler
@@ -0,0 +1,175 @@
+"""
+Speculative translation / TTS on partial transcripts.
+
+Without speculation an utterance is translated and synthesized only after ASR
+has finalized it.  With live captions (partial audio messages on /ws/voice)
+most of that work can start earlier: each partial hypothesis is translated
+anyway, and the clauses that have become stable can already be synthesized.
+A Speculator holds that work for one session, keyed on the input it was
+started for:
+
+    - speculate(key, factory) starts work for a partial hypothesis
+    - retain(keys) cancels work whose input is gone (ASR revised the text)
+    - resolve(key, compute) hands the final the speculative result if one was
+      started for exactly this key (hit), else computes it (miss)
+    - settle() ends the utterance: leftover work is cancelled and the
+      utterance's hits, misses and latency saved are returned and folded into
+      the process-wide SpeculationStats (see /health)
+
+Latency saved by a hit is the part of the work that ran before the final
+asked for it: min(time since it started, its duration).
+"""
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Guess:
+    task: asyncio.Future
+    started: float
+    finished: Optional[float] = None
+
+
+class SpeculationStats:
+    """Process-wide speculation totals per kind of work ("translation", "tts")."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kinds: Dict[str, Dict[str, float]] = {}
+
+    def record(self, kind: str, hits: int, misses: int, cancelled: int, saved_s: float) -> None:
+        with self._lock:
+            totals = self._kinds.setdefault(
+                kind, {"utterances": 0, "hits": 0, "misses": 0, "cancelled": 0, "saved_s": 0.0}
+            )
+            totals["utterances"] += 1
+            totals["hits"] += hits
+            totals["misses"] += misses
+            totals["cancelled"] += cancelled
+            totals["saved_s"] += saved_s
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                kind: {
+                    "utterances": t["utterances"],
+                    "hits": t["hits"],
+                    "misses": t["misses"],
+                    "cancelled": t["cancelled"],
+                    "hit_rate": round(t["hits"] / (t["hits"] + t["misses"]), 3) if t["hits"] + t["misses"] else None,
+                    "avg_saved_ms": round(t["saved_s"] * 1000 / t["utterances"], 1),
+                }
+                for kind, t in self._kinds.items()
+            }
+
+
+class Speculator:
+    """
+    Speculative async work for one session, keyed on the input it was started for.
+
+    Args:
+        kind: Label in the stats ("translation", "tts")
+        concurrent: The final resolves its keys concurrently (e.g. TTS
+            segments), so an utterance saves the largest per-key saving
+            rather than their sum
+        stats: Process-wide totals (default: get_speculation_stats())
+    """
+
+    def __init__(self, kind: str, concurrent: bool = False, stats: Optional[SpeculationStats] = None):
+        self.kind = kind
+        self.concurrent = concurrent
+        self.stats = stats or get_speculation_stats()
+        self._guesses: Dict[Hashable, _Guess] = {}
+        self._speculated = False    # any work started this utterance
+        self._reset()
+
+    def _reset(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+        self.saved_s = 0.0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._guesses
+
+    def speculate(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> "asyncio.Future[T]":
+        """Start factory() for `key` unless already running; returns its task."""
+        guess = self._guesses.get(key)
+        if guess is None:
+            guess = _Guess(asyncio.ensure_future(factory()), time.monotonic())
+            guess.task.add_done_callback(lambda _task, g=guess: setattr(g, "finished", time.monotonic()))
+            self._guesses[key] = guess
+            self._speculated = True
+        return guess.task
+
+    def retain(self, keys: Iterable[Hashable]) -> int:
+        """Cancel work not started for one of `keys` (its input diverged);
+        returns how many still-running tasks were cancelled."""
+        keep = set(keys)
+        cancelled = 0
+        for key in [k for k in self._guesses if k not in keep]:
+            cancelled += self._cancel(self._guesses.pop(key))
+        return cancelled
+
+    async def resolve(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        """The speculative result for `key` if there is one, else `await compute()`."""
+        guess = self._guesses.pop(key, None)
+        if guess is not None and not guess.task.cancelled():
+            claimed = time.monotonic()
+            try:
+                result = await guess.task
+            except Exception as e:
+                logger.debug(f"Speculative {self.kind} failed, recomputing: {e}")
+            else:
+                saved = min(claimed, guess.finished or claimed) - guess.started
+                self.hits += 1
+                self.saved_s = max(self.saved_s, saved) if self.concurrent else self.saved_s + saved
+                return result
+        if self._speculated:
+            self.misses += 1
+        return await compute()
+
+    def settle(self) -> dict:
+        """End the utterance: cancel unused work, record and return its
+        {"hits", "misses", "saved_ms"}."""
+        self.retain(())
+        if self._speculated:
+            self.stats.record(self.kind, self.hits, self.misses, self.cancelled, self.saved_s)
+        summary = {"hits": self.hits, "misses": self.misses, "saved_ms": round(self.saved_s * 1000, 1)}
+        self._speculated = False
+        self._reset()
+        return summary
+
+    def discard(self) -> None:
+        """Cancel everything without recording an utterance (session closed)."""
+        self.retain(())
+        self._speculated = False
+        self._reset()
+
+    def _cancel(self, guess: _Guess) -> int:
+        if guess.task.done():
+            return 0
+        guess.task.cancel()
+        self.cancelled += 1
+        return 1
+
+
+_stats: Optional[SpeculationStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_speculation_stats() -> SpeculationStats:
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = SpeculationStats()
+    return _stats
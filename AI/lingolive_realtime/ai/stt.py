@@ -5,27 +5,33 @@ from typing import AsyncIterator, Optional
 
 from loguru import logger
 
-try:
-    from faster_whisper import WhisperModel  # type: ignore
-except Exception:  # pragma: no cover - allow missing at dev
-    WhisperModel = None  # type: ignore
+from media.audio_utils import PCMRingBuffer
+
+from .model_client import RemoteASR, remote_models_enabled
 
 
 class STTEngine:
     """Streaming STT using Faster-Whisper in chunked mode.
 
     For production, run with tiny/base models for low latency. This class accepts
-    raw PCM 16k mono bytes and yields partial transcripts per chunk.
+    raw PCM 16k mono bytes and yields partial transcripts per chunk.  With
+    MODEL_SERVER_SOCKET set, chunks are decoded by the shared model server.
     """
 
     def __init__(self, model_size: str = "base", device: str = "auto") -> None:
         self.model_size = model_size
         self.device = device
-        self._model: Optional[WhisperModel] = None
+        self._model = None
+        self._remote: Optional[RemoteASR] = RemoteASR() if remote_models_enabled() else None
+        # Chunks are decoded one at a time, so each view is consumed before the next write
+        self._ring = PCMRingBuffer(capacity_s=30.0, sample_rate=16000)
 
     def _ensure_model(self) -> None:
         if self._model is None:
-            if WhisperModel is None:
+            # Imported here: thin clients of the model server never load Whisper
+            try:
+                from faster_whisper import WhisperModel  # type: ignore
+            except Exception:  # pragma: no cover - allow missing at dev
                 logger.warning("faster-whisper not installed; STT disabled.")
                 return
             self._model = WhisperModel(self.model_size, device=self.device, compute_type="int8")
@@ -36,6 +42,11 @@ class STTEngine:
         Input chunks are small to minimize latency. We call model on each chunk
         with `vad_filter=False` since VAD is handled upstream.
         """
+        if self._remote is not None:
+            async for text in self._transcribe_remote(pcm16k_mono, source_lang):
+                yield text
+            return
+
         self._ensure_model()
         if self._model is None:
             async for _ in pcm16k_mono:
@@ -50,7 +61,7 @@ class STTEngine:
             try:
                 # Run small chunk inference; set beam_size low for speed.
                 segments, _info = model.transcribe(
-                    audio=chunk,
+                    audio=self._ring.write(chunk),
                     language=source_lang,
                     vad_filter=False,
                     beam_size=1,
@@ -64,3 +75,14 @@ class STTEngine:
             except Exception as e:  # robust to transient errors
                 logger.exception(f"STT error: {e}")
                 await asyncio.sleep(0)
+
+    async def _transcribe_remote(self, pcm16k_mono: AsyncIterator[bytes], source_lang: Optional[str]) -> AsyncIterator[str]:
+        assert self._remote is not None
+        async for chunk in pcm16k_mono:
+            try:
+                result = await asyncio.to_thread(self._remote.transcribe_fast, self._ring.write(chunk), source_lang)
+                text = result.get("text", "").strip()
+                if text:
+                    yield text
+            except Exception as e:  # model server down or failing: skip the chunk
+                logger.exception(f"STT error: {e}")
@@ -4,11 +4,7 @@ from typing import Dict, Optional
 
 from loguru import logger
 
-try:
-    from transformers import MarianMTModel, MarianTokenizer  # type: ignore
-except Exception:  # pragma: no cover
-    MarianMTModel = None  # type: ignore
-    MarianTokenizer = None  # type: ignore
+from .model_client import RemoteTranslator, remote_models_enabled
 
 
 LANG_PAIR_TO_MODEL: Dict[str, str] = {
@@ -23,14 +19,19 @@ LANG_PAIR_TO_MODEL: Dict[str, str] = {
 class Translator:
     """Chunk-level neural machine translation using MarianMT.
 
-    Keeps tokenizer/model cached per language pair for reuse.
+    Keeps tokenizer/model cached per language pair for reuse.  With
+    MODEL_SERVER_SOCKET set, translation runs in the shared model server.
     """
 
     def __init__(self) -> None:
         self._cache: Dict[str, tuple] = {}
+        self._remote: Optional[RemoteTranslator] = RemoteTranslator() if remote_models_enabled() else None
 
     def _ensure(self, src: str, tgt: str) -> Optional[tuple]:
-        if MarianMTModel is None or MarianTokenizer is None:
+        # Imported here: thin clients of the model server never load MarianMT
+        try:
+            from transformers import MarianMTModel, MarianTokenizer  # type: ignore
+        except Exception:  # pragma: no cover
             logger.warning("transformers MarianMT not installed; translation disabled.")
             return None
         key = f"{src}->{tgt}"
@@ -45,9 +46,15 @@ class Translator:
         return self._cache[key]
 
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
-        pair = self._ensure(source_lang, target_lang)
         if not text:
             return ""
+        if self._remote is not None:
+            try:
+                return self._remote.translate(text, source_lang, target_lang) or text
+            except Exception as e:
+                logger.exception(f"Remote translation error: {e}; passthrough text.")
+                return text
+        pair = self._ensure(source_lang, target_lang)
         if pair is None:
             # Fallback: passthrough
             return text
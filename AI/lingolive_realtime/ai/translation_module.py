@@ -3,27 +3,105 @@ Translation Module - Text translation using Helsinki-NLP MarianMT models
 Lightweight, works on CPU, no gated access needed
 Falls back to googletrans if MarianMT models are unavailable
 """
+import contextlib
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 from .config import config, MARIAN_MODELS, WHISPER_LANG_CODES, SUPPORTED_LANGUAGES, get_language_code
+from .langid import detect_language
+
+if TYPE_CHECKING:
+    from .google_translate import SyncGoogleTranslator
 
 logger = logging.getLogger(__name__)
 
-# Try to import MarianMT
-try:
-    from transformers import MarianMTModel, MarianTokenizer
-    MARIAN_AVAILABLE = True
-except ImportError:
-    MARIAN_AVAILABLE = False
+# Backends are imported on first use: transformers alone costs ~0.7 s at
+# import time, which config-only and Google-only processes never need.
+MARIAN_AVAILABLE = find_spec("transformers") is not None
+if not MARIAN_AVAILABLE:
     logger.warning("transformers not available for MarianMT")
+MarianMTModel = MarianTokenizer = None   # filled in by _marian_classes()
+
+# Pooled async Google Translate client (needs httpx)
+GOOGLE_HTTP_AVAILABLE = find_spec("httpx") is not None
 
 # Try googletrans as lightweight fallback
-try:
-    from deep_translator import GoogleTranslator
-    DEEP_TRANSLATOR_AVAILABLE = True
-except ImportError:
-    DEEP_TRANSLATOR_AVAILABLE = False
+DEEP_TRANSLATOR_AVAILABLE = find_spec("deep_translator") is not None
+
+
+def _marian_classes():
+    """(MarianTokenizer, MarianMTModel), importing transformers on first call
+    (and then applying this process's torch thread budget)."""
+    global MarianMTModel, MarianTokenizer
+    if MarianMTModel is None or MarianTokenizer is None:
+        from transformers import MarianMTModel, MarianTokenizer
+        apply_thread_budget(_budget_processes)
+    return MarianTokenizer, MarianMTModel
+
+
+# ── Thread budget ────────────────────────────────────────────────────────────
+# torch's intra-op pool size is per call: N concurrent generate() calls with
+# the default (all cores) each run on every core and thrash.  A process gets
+# cores // processes, split evenly between at most `slots` concurrent calls.
+_budget_processes = 1
+_generate_slots = threading.BoundedSemaphore(max(1, config.marian_concurrency or config.scheduler_workers))
+
+
+def thread_budget(processes: int = 1) -> Tuple[int, int]:
+    """(concurrent MarianMT calls, torch threads per call) for one of
+    `processes` worker processes sharing this host's cores."""
+    cores = max(1, (os.cpu_count() or 1) // max(1, processes))
+    slots = max(1, min(config.marian_concurrency or config.scheduler_workers, cores))
+    per_call = max(1, cores // slots)
+    # A host profile's thread count is tuned for one caller; never exceed the share
+    return slots, min(config.torch_num_threads, per_call) if config.torch_num_threads > 0 else per_call
+
+
+def apply_thread_budget(processes: int = 1) -> Tuple[int, int]:
+    """Size the concurrent-call limit and torch's thread pool for this process
+    (torch is configured now if loaded, else when MarianMT first loads)."""
+    global _budget_processes, _generate_slots
+    _budget_processes = processes
+    slots, threads = thread_budget(processes)
+    _generate_slots = threading.BoundedSemaphore(slots)
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+    return slots, threads
+
+
+def _quantize(model):
+    """Dynamic int8 quantization of the Linear layers (CPU inference); anything
+    that is not a torch module is returned unchanged."""
+    torch = sys.modules.get("torch")
+    if torch is None or not isinstance(model, torch.nn.Module):
+        return model
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+# Clause boundaries used to commit partial transcripts (Latin, Devanagari danda, Arabic)
+_CLAUSE_END_RE = re.compile(r"[^.,!?;:\u0964\u0965\u060C\u061B\u061F]+[.,!?;:\u0964\u0965\u060C\u061B\u061F]+\s*")
+
+
+@dataclass
+class _IncrementalState:
+    """Per-session bookkeeping for incremental translation of partial transcripts"""
+
+    source_lang: str
+    target_lang: str
+    committed_source: List[str] = field(default_factory=list)
+    committed_target: List[str] = field(default_factory=list)
+    committed_prefix: str = ""        # hypothesis text already covered by committed_source
+    last_tail: str = ""               # uncommitted tail of the previous hypothesis
+    segments_translated: int = 0
 
 
 class TranslationModule:
@@ -45,6 +123,16 @@ class TranslationModule:
     def __init__(self, **kwargs):
         if not self._initialized:
             self._model_cache: Dict[str, Tuple] = {}  # "en->hi" -> (tokenizer, model)
+            self._model_locks: Dict[str, threading.Lock] = {}  # per checkpoint name
+            self._model_locks_guard = threading.Lock()
+            self._sessions: Dict[str, _IncrementalState] = {}
+            self._sessions_lock = threading.Lock()
+            self._google: Optional["SyncGoogleTranslator"] = None
+            self._google_lock = threading.Lock()
+            # Pivot legs: (src, tgt, text) -> translation, shared by every target of a fan-out
+            self._pivot_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+            self._pivot_lock = threading.Lock()
+            self._pivot_stats = {"to_en_hits": 0, "to_en_misses": 0, "from_en_hits": 0, "from_en_misses": 0}
             self._initialized = True
             logger.info("TranslationModule initialized (lazy model loading)")
 
@@ -62,7 +150,7 @@ class TranslationModule:
 
         Args:
             text: Input text or list of texts
-            source_lang: Language name (e.g. 'english') or ISO code ('en')
+            source_lang: Language name (e.g. 'english'), ISO code ('en') or 'auto'
             target_lang: Language name or ISO code
             max_length: Max tokens in output
 
@@ -78,9 +166,12 @@ class TranslationModule:
         if not texts:
             return "" if is_single else []
 
-        src = self._to_iso(source_lang)
         tgt = self._to_iso(target_lang)
+        if self._is_auto(source_lang):
+            translations = self._translate_auto(texts, tgt, len(texts), max_length)
+            return translations[0] if is_single else translations
 
+        src = self._to_iso(source_lang)
         if src == tgt:
             return texts[0] if is_single else texts
 
@@ -92,13 +183,16 @@ class TranslationModule:
         texts: List[str],
         source_lang: str,
         target_lang: str,
-        batch_size: int = 8,
+        batch_size: Optional[int] = None,
         **kwargs,
     ) -> List[str]:
         if not texts:
             return []
-        src = self._to_iso(source_lang)
+        batch_size = batch_size or config.translation_batch_size
         tgt = self._to_iso(target_lang)
+        if self._is_auto(source_lang):
+            return self._translate_auto(texts, tgt, batch_size)
+        src = self._to_iso(source_lang)
         if src == tgt:
             return list(texts)
 
@@ -108,6 +202,167 @@ class TranslationModule:
             results.extend(self._translate_batch(batch, src, tgt))
         return results
 
+    def translate_multi(
+        self,
+        texts: List[str],
+        source_lang: str,
+        target_langs: List[str],
+        batch_size: int = 8,
+    ) -> Dict[str, List[str]]:
+        """
+        Fan out the same texts to several target languages.
+
+        Pivot pairs run the src->en leg once for all texts; every en->tgt leg
+        then reuses the cached English intermediate.
+
+        Returns:
+            {target_lang: translations} keyed by the target names as given
+        """
+        if not texts:
+            return {t: [] for t in target_langs}
+        src = self._to_iso(source_lang)
+        pivots = [
+            t for t in map(self._to_iso, target_langs)
+            if f"{src}->{t}" not in MARIAN_MODELS and self._pivot_pair(src, t)
+        ]
+        if MARIAN_AVAILABLE and pivots:
+            for i in range(0, len(texts), batch_size):
+                self._pivot_leg(texts[i : i + batch_size], src, "en", config.translation_max_length)
+        return {t: self.translate_batch(texts, source_lang, t, batch_size=batch_size) for t in target_langs}
+
+    def translate_incremental(
+        self,
+        session_id: str,
+        partial_text: str,
+        source_lang: str,
+        target_lang: str,
+        is_final: bool = False,
+        translate_tail: bool = True,
+    ) -> dict:
+        """
+        Translate a growing partial transcript without re-translating its prefix.
+
+        Clauses that end in punctuation and were already present in the previous
+        hypothesis are committed: translated once and reused on every later call.
+        Only the newly stabilized clauses (and optionally the unstable tail) are
+        sent to the model, so total work stays linear in the utterance length.
+
+        Args:
+            session_id: Caller-chosen key (one per speaker / WebSocket)
+            partial_text: Current full ASR hypothesis for the utterance
+            source_lang: Language name or ISO code
+            target_lang: Language name or ISO code
+            is_final: Commit everything and reset the session for the next utterance
+            translate_tail: Also translate the unstable tail for display
+
+        Returns:
+            dict with 'text' (full target text), 'stable_text' (committed part),
+            'unstable_text', 'is_stable' and 'new_segments' (model calls made)
+        """
+        text = (partial_text or "").strip()
+        src = detect_language(text) if self._is_auto(source_lang) else self._to_iso(source_lang)
+        tgt = self._to_iso(target_lang)
+
+        with self._sessions_lock:
+            state = self._sessions.get(session_id)
+            if (
+                state is None
+                or (state.source_lang, state.target_lang) != (src, tgt)
+                or not text.startswith(state.committed_prefix)
+            ):
+                # New utterance, new language pair or ASR rewrote the committed prefix
+                state = _IncrementalState(source_lang=src, target_lang=tgt)
+                self._sessions[session_id] = state
+
+        tail = text[len(state.committed_prefix):]
+        if is_final:
+            ready, remainder = ([tail.strip()] if tail.strip() else []), ""
+        else:
+            ready, remainder = self._split_stable_clauses(tail, state.last_tail)
+
+        new_segments = 0
+        if ready:
+            translated = self._translate_segments(ready, src, tgt)
+            state.committed_source.extend(ready)
+            state.committed_target.extend(translated)
+            new_segments = len(ready)
+            state.segments_translated += new_segments
+            state.committed_prefix = text[: len(text) - len(remainder)]
+        state.last_tail = remainder
+
+        stable_text = " ".join(t for t in state.committed_target if t)
+        unstable_text = ""
+        if remainder.strip() and translate_tail:
+            unstable_text = self._translate_segments([remainder.strip()], src, tgt)[0]
+            new_segments += 1
+
+        result = {
+            "text": " ".join(t for t in (stable_text, unstable_text) if t),
+            "stable_text": stable_text,
+            "unstable_text": unstable_text,
+            "is_stable": is_final or not remainder.strip(),
+            "new_segments": new_segments,
+        }
+        if is_final:
+            self.end_session(session_id)
+        return result
+
+    def warmup(
+        self,
+        pairs: List[Tuple[str, str]],
+        workers: Optional[int] = None,
+        run: bool = True,
+    ) -> Dict[str, str]:
+        """
+        Load the MarianMT models behind `pairs` in parallel threads and run a
+        dummy translation through each, so hot pairs answer at full speed from
+        the first request.
+
+        Args:
+            pairs: (source, target) language names or ISO codes
+            workers: Parallel loads (default: one per model)
+            run: Run the dummy translation; False only loads the weights
+                (pre-fork preloading, where no inference may run in the parent)
+
+        Returns:
+            {"en->hi": "ready" | "failed: <reason>" | "remote", ...}; pairs
+            without local models ("remote") use the Google fallback
+        """
+        keys: List[str] = []
+        status: Dict[str, str] = {}
+        for source, target in pairs:
+            src, tgt = self._to_iso(source), self._to_iso(target)
+            pair_keys = self._model_keys(src, tgt)
+            if not pair_keys:
+                status[f"{src}->{tgt}"] = "remote"
+            keys.extend(k for k in pair_keys if k not in keys)
+        if not keys:
+            return status
+
+        def _warm(key: str) -> str:
+            try:
+                tok, mdl = self._ensure_marian(key)
+                if run:
+                    batch = tok(["Hello, how are you?"], return_tensors="pt", padding=True)
+                    mdl.generate(**batch, max_new_tokens=16, num_beams=1)
+                return "ready" if run else "loaded"
+            except Exception as e:
+                logger.warning(f"Warmup failed for {key}: {e}")
+                return f"failed: {e}"
+
+        with ThreadPoolExecutor(max_workers=workers or len(keys), thread_name_prefix="mt-warmup") as pool:
+            status.update(zip(keys, pool.map(_warm, keys)))
+        return status
+
+    def has_session(self, session_id: str) -> bool:
+        """True while an utterance has uncommitted incremental state"""
+        return session_id in self._sessions
+
+    def end_session(self, session_id: str) -> None:
+        """Drop incremental-translation state for a session"""
+        with self._sessions_lock:
+            self._sessions.pop(session_id, None)
+
     def get_supported_languages(self) -> List[str]:
         return list(SUPPORTED_LANGUAGES.keys())
 
@@ -116,8 +371,13 @@ class TranslationModule:
             "initialized": self._initialized,
             "marian_available": MARIAN_AVAILABLE,
             "deep_translator_available": DEEP_TRANSLATOR_AVAILABLE,
+            "google_http_available": GOOGLE_HTTP_AVAILABLE,
             "cached_models": list(self._model_cache.keys()),
+            "incremental_sessions": len(self._sessions),
+            "pivot_cache": self._pivot_cache_info(),
             "supported_languages": len(SUPPORTED_LANGUAGES),
+            "marian_quantized": config.marian_quantize,
+            "thread_budget": dict(zip(("concurrent_calls", "torch_threads"), thread_budget(_budget_processes))),
         }
 
     # ── internals ───────────────────────────────────────────────────────────
@@ -131,11 +391,68 @@ class TranslationModule:
         # Known name?
         if lang_lower in WHISPER_LANG_CODES:
             return WHISPER_LANG_CODES[lang_lower]
-        # 'auto' -> 'en' default
+        # 'auto' -> 'en' default (translate() detects the language before getting here)
         if lang_lower == "auto":
             return "en"
         return lang_lower
 
+    @staticmethod
+    def _is_auto(lang: str) -> bool:
+        return lang.lower().strip() == "auto"
+
+    def _translate_auto(
+        self, texts: List[str], tgt: str, batch_size: int, max_length: int = 128
+    ) -> List[str]:
+        """Detect each text's language from its script and translate per
+        detected language, so Indic input never hits the English model."""
+        groups: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            groups.setdefault(detect_language(text), []).append(i)
+
+        results: List[str] = list(texts)
+        for src, idx in groups.items():
+            if src == tgt:
+                continue
+            logger.debug(f"Auto-detected '{src}' for {len(idx)} text(s)")
+            for i in range(0, len(idx), batch_size):
+                chunk = idx[i : i + batch_size]
+                translated = self._translate_batch([texts[j] for j in chunk], src, tgt, max_length)
+                for j, out in zip(chunk, translated):
+                    results[j] = out
+        return results
+
+    def _split_stable_clauses(self, tail: str, previous_tail: str) -> Tuple[List[str], str]:
+        """Split off leading clauses of `tail` that are punctuated and unchanged
+        since the previous hypothesis.  Long unpunctuated tails commit the word
+        prefix both hypotheses agree on.  Returns (stable clauses, remainder)."""
+        ready: List[str] = []
+        pos = 0
+        for m in _CLAUSE_END_RE.finditer(tail):
+            if m.start() != pos or not previous_tail.startswith(tail[:m.end()].rstrip()):
+                break
+            ready.append(m.group().strip())
+            pos = m.end()
+
+        words = list(re.finditer(r"\S+", tail[pos:]))
+        if len(words) > config.translation_incremental_max_tail_words:
+            prev_words = previous_tail[pos:].split()
+            agreed = 0
+            # Never commit the last word: it is the one Whisper is most likely to revise
+            for w, prev in zip(words[:-1], prev_words):
+                if w.group() != prev:
+                    break
+                agreed += 1
+            if agreed:
+                end = pos + words[agreed - 1].end()
+                ready.append(tail[pos:end].strip())
+                pos = end
+        return [r for r in ready if r], tail[pos:]
+
+    def _translate_segments(self, segments: List[str], src: str, tgt: str) -> List[str]:
+        if src == tgt:
+            return list(segments)
+        return self._translate_batch(segments, src, tgt, config.translation_max_length)
+
     def _translate_batch(
         self, texts: List[str], src: str, tgt: str, max_length: int = 128
     ) -> List[str]:
@@ -149,16 +466,13 @@ class TranslationModule:
             if result and result != texts:
                 return result
 
-        # Strategy 2: Pivot through English (src->en, en->tgt) — still local
-        if MARIAN_AVAILABLE and src != "en" and tgt != "en":
-            key_to_en = f"{src}->en"
-            key_from_en = f"en->{tgt}"
-            if key_to_en in MARIAN_MODELS and key_from_en in MARIAN_MODELS:
-                english_texts = self._marian_translate(texts, key_to_en, max_length)
-                return self._marian_translate(english_texts, key_from_en, max_length)
+        # Strategy 2: Pivot through English (src->en, en->tgt) — still local, both legs cached
+        if MARIAN_AVAILABLE and self._pivot_pair(src, tgt):
+            english_texts = self._pivot_leg(texts, src, "en", max_length)
+            return self._pivot_leg(english_texts, "en", tgt, max_length)
 
         # Strategy 3: Google Translate (network fallback — slower but wider coverage)
-        if DEEP_TRANSLATOR_AVAILABLE:
+        if GOOGLE_HTTP_AVAILABLE or DEEP_TRANSLATOR_AVAILABLE:
             result = self._google_translate(texts, src, tgt)
             if result and result != texts:
                 return result
@@ -168,34 +482,127 @@ class TranslationModule:
         logger.warning(f"No translation available for {key}. Returning original text.")
         return texts
 
+    def _model_keys(self, src: str, tgt: str) -> List[str]:
+        """Local MarianMT models that serve src->tgt (direct, or both pivot legs)."""
+        if not MARIAN_AVAILABLE or src == tgt:
+            return []
+        if f"{src}->{tgt}" in MARIAN_MODELS:
+            return [f"{src}->{tgt}"]
+        if self._pivot_pair(src, tgt):
+            return [f"{src}->en", f"en->{tgt}"]
+        return []
+
+    def _pivot_pair(self, src: str, tgt: str) -> bool:
+        """True if src->tgt can be pivoted through English with local models"""
+        return (
+            src != "en" and tgt != "en"
+            and f"{src}->en" in MARIAN_MODELS
+            and f"en->{tgt}" in MARIAN_MODELS
+        )
+
+    def _pivot_leg(self, texts: List[str], src: str, tgt: str, max_length: int = 128) -> List[str]:
+        """Run one pivot leg as a single batch over the cache misses."""
+        stat = "to_en" if tgt == "en" else "from_en"
+        results: List[Optional[str]] = []
+        misses: List[str] = []
+        with self._pivot_lock:
+            for text in texts:
+                cached = self._pivot_cache.get((src, tgt, text))
+                if cached is not None:
+                    self._pivot_cache.move_to_end((src, tgt, text))
+                    self._pivot_stats[f"{stat}_hits"] += 1
+                elif text not in misses:
+                    misses.append(text)
+                results.append(cached)
+            self._pivot_stats[f"{stat}_misses"] += len(misses)
+
+        if misses:
+            translated = self._marian_translate(misses, f"{src}->{tgt}", max_length)
+            fresh = dict(zip(misses, translated))
+            if translated is not misses:  # _marian_translate returns its input on failure
+                with self._pivot_lock:
+                    for text, out in fresh.items():
+                        self._pivot_cache[(src, tgt, text)] = out
+                    while len(self._pivot_cache) > config.translation_cache_size:
+                        self._pivot_cache.popitem(last=False)
+            results = [r if r is not None else fresh[t] for r, t in zip(results, texts)]
+        return results
+
+    def _pivot_cache_info(self) -> dict:
+        st = self._pivot_stats
+        info = {"entries": len(self._pivot_cache), **st}
+        for leg in ("to_en", "from_en"):
+            total = st[f"{leg}_hits"] + st[f"{leg}_misses"]
+            info[f"{leg}_hit_rate"] = round(st[f"{leg}_hits"] / total, 3) if total else 0.0
+        return info
+
     def _marian_translate(
         self, texts: List[str], key: str, max_length: int = 128
     ) -> List[str]:
-        """Translate using MarianMT"""
+        """Translate using MarianMT (no autograd, within the thread budget)"""
         try:
             tok, mdl = self._ensure_marian(key)
             batch = tok(texts, return_tensors="pt", padding=True, truncation=True, max_length=max_length)
-            output_ids = mdl.generate(**batch, max_new_tokens=max_length, num_beams=1)
+            torch = sys.modules.get("torch")     # loaded with transformers' MarianMT
+            no_grad = torch.inference_mode() if torch is not None else contextlib.nullcontext()
+            with _generate_slots, no_grad:
+                output_ids = mdl.generate(**batch, max_new_tokens=max_length, num_beams=1)
             return tok.batch_decode(output_ids, skip_special_tokens=True)
         except Exception as e:
             logger.error(f"MarianMT error for {key}: {e}")
             return texts
 
     def _ensure_marian(self, key: str):
-        """Lazy-load and cache MarianMT model"""
-        if key not in self._model_cache:
-            model_name = MARIAN_MODELS[key]
-            logger.info(f"Loading MarianMT model: {model_name}")
-            tok = MarianTokenizer.from_pretrained(model_name)
-            mdl = MarianMTModel.from_pretrained(model_name)
-            mdl.eval()
-            self._model_cache[key] = (tok, mdl)
+        """Lazy-load and cache MarianMT model.  Each checkpoint is loaded once,
+        even when several threads (or pairs sharing a multi-target model like
+        en->ta / en->te) ask at once; different checkpoints load in parallel."""
+        if key in self._model_cache:
+            return self._model_cache[key]
+        model_name = MARIAN_MODELS[key]
+        with self._model_locks_guard:
+            lock = self._model_locks.setdefault(model_name, threading.Lock())
+        with lock:
+            if key not in self._model_cache:
+                shared = next((v for k, v in self._model_cache.items() if MARIAN_MODELS[k] == model_name), None)
+                if shared is None:
+                    logger.info(f"Loading MarianMT model: {model_name}")
+                    tokenizer_cls, model_cls = _marian_classes()
+                    tok = tokenizer_cls.from_pretrained(model_name)
+                    mdl = model_cls.from_pretrained(model_name)
+                    mdl.eval()
+                    if config.marian_quantize:
+                        mdl = _quantize(mdl)
+                    shared = (tok, mdl)
+                self._model_cache[key] = shared
         return self._model_cache[key]
 
     def _google_translate(self, texts: List[str], src: str, tgt: str) -> List[str]:
-        """Primary translation using deep-translator (Google Translate)
-        Most accurate for Indian languages compared to MarianMT."""
+        """Google Translate fallback: one pooled async client with bounded
+        concurrent, packed requests; deep-translator if httpx is missing."""
+        if GOOGLE_HTTP_AVAILABLE:
+            try:
+                results = self._ensure_google().translate_batch(texts, src, tgt)
+                logger.debug(f"Google Translate [{src}->{tgt}]: {len(texts)} texts")
+                return results
+            except Exception as e:
+                logger.error(f"Google Translate error ({src}->{tgt}): {e}")
+                if not DEEP_TRANSLATOR_AVAILABLE:
+                    return []  # Return empty so caller tries next strategy
+        return self._deep_translate(texts, src, tgt)
+
+    def _ensure_google(self) -> "SyncGoogleTranslator":
+        """Create the shared Google client on first use"""
+        with self._google_lock:
+            if self._google is None:
+                from .google_translate import SyncGoogleTranslator
+                self._google = SyncGoogleTranslator()
+                logger.info(f"Google Translate client ready ({self._google.base_url})")
+            return self._google
+
+    def _deep_translate(self, texts: List[str], src: str, tgt: str) -> List[str]:
+        """Sequential fallback using deep-translator"""
         try:
+            from deep_translator import GoogleTranslator
             results = []
             translator = GoogleTranslator(source=src if src != "auto" else "auto", target=tgt)
             for text in texts:
@@ -5,6 +5,8 @@ from typing import AsyncIterator, Optional
 
 from loguru import logger
 
+from .tts_pipeline import split_for_tts, stream_segments
+
 try:
     import edge_tts  # type: ignore
 except Exception:  # pragma: no cover
@@ -14,14 +16,23 @@ except Exception:  # pragma: no cover
 class TTS:
     """Streaming TTS using Edge-TTS.
 
-    Outputs raw 16kHz 16-bit mono PCM for easy framing.
+    Outputs raw 16kHz 16-bit mono PCM for easy framing.  Multi-sentence
+    text is synthesized sentence by sentence, up to `max_parallel` at once,
+    and streamed in order.
     """
 
-    def __init__(self, voice: str = "en-US-AriaNeural", rate: str = "+0%", volume: str = "+0dB") -> None:
+    def __init__(
+        self,
+        voice: str = "en-US-AriaNeural",
+        rate: str = "+0%",
+        volume: str = "+0dB",
+        max_parallel: int = 3,
+    ) -> None:
         self.voice = voice
         self.rate = rate
         self.volume = volume
         self.format = "raw-16khz-16bit-mono-pcm"
+        self.max_parallel = max_parallel
 
     async def synthesize(self, text: str) -> AsyncIterator[bytes]:
         if edge_tts is None:
@@ -29,18 +40,22 @@ class TTS:
             return
         if not text:
             return
+        try:
+            async for _index, data in stream_segments(split_for_tts(text), self._stream_one, self.max_parallel):
+                yield data
+        except Exception as e:
+            logger.exception(f"TTS error: {e}")
+
+    async def _stream_one(self, text: str) -> AsyncIterator[bytes]:
         communicate = edge_tts.Communicate(
             text=text,
             voice=self.voice,
             rate=self.rate,
             volume=self.volume,
         )
-        try:
-            async for chunk in communicate.stream(output_format=self.format):
-                if chunk["type"] == "audio":
-                    data: bytes = chunk["data"]
-                    if data:
-                        yield data
-                await asyncio.sleep(0)
-        except Exception as e:
-            logger.exception(f"TTS error: {e}")
+        async for chunk in communicate.stream(output_format=self.format):
+            if chunk["type"] == "audio":
+                data: bytes = chunk["data"]
+                if data:
+                    yield data
+            await asyncio.sleep(0)
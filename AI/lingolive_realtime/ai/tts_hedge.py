@@ -0,0 +1,187 @@
+"""
+Hedged TTS requests across engines.
+The primary engine gets a deadline derived from its own recent latency (p95
+by default).  If it has not answered by then, the next engine is started in
+parallel; the first successful answer wins and the others are cancelled.
+An engine that fails outright hands over to the next one immediately.
+"""
+import asyncio
+import collections
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# async (text, language) -> encoded audio bytes
+EngineFn = Callable[[str, str], Awaitable[bytes]]
+
+
+@dataclass
+class HedgeResult:
+    data: bytes
+    engine: str                 # engine that produced `data`
+    latency_s: float            # wall time from the first request to the answer
+    hedged: bool                # True if more than one engine was started
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies for one engine."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th quantile (0..1) of the window, or None while it is empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))]
+
+
+class HedgedTTS:
+    """
+    Race TTS engines in priority order under a latency budget.
+
+    Args:
+        engines: (name, async fn(text, language) -> bytes) in priority order
+        percentile: Latency quantile used as an engine's hedge deadline
+        min_deadline_s / max_deadline_s: Clamp for the derived deadline
+        default_deadline_s: Deadline until `min_samples` latencies are known
+        timeout_s: Give up (TimeoutError) if no engine answers within this
+    """
+
+    def __init__(
+        self,
+        engines: Sequence[Tuple[str, EngineFn]],
+        percentile: float = 0.95,
+        min_deadline_s: float = 0.3,
+        max_deadline_s: float = 3.0,
+        default_deadline_s: float = 1.5,
+        min_samples: int = 20,
+        window: int = 200,
+        timeout_s: float = 10.0,
+    ):
+        if not engines:
+            raise ValueError("HedgedTTS needs at least one engine")
+        self.engines: List[Tuple[str, EngineFn]] = list(engines)
+        self.percentile = percentile
+        self.min_deadline_s = min_deadline_s
+        self.max_deadline_s = max_deadline_s
+        self.default_deadline_s = default_deadline_s
+        self.min_samples = min_samples
+        self.timeout_s = timeout_s
+        self._latency: Dict[str, LatencyTracker] = {name: LatencyTracker(window) for name, _ in self.engines}
+        self._counts: Dict[str, Dict[str, int]] = {
+            name: {"started": 0, "wins": 0, "failures": 0, "cancelled": 0} for name, _ in self.engines
+        }
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    @property
+    def engine_names(self) -> List[str]:
+        return [name for name, _ in self.engines]
+
+    def deadline(self, engine: str) -> float:
+        """Seconds to wait for `engine` before starting the next one."""
+        tracker = self._latency[engine]
+        if len(tracker) < self.min_samples:
+            return self.default_deadline_s
+        return min(self.max_deadline_s, max(self.min_deadline_s, tracker.percentile(self.percentile)))
+
+    async def synthesize(self, text: str, language: str = "english") -> HedgeResult:
+        """
+        Synthesize with hedging.
+
+        Returns:
+            HedgeResult from the first engine that succeeds
+
+        Raises:
+            TimeoutError: no engine answered within timeout_s
+            RuntimeError: every engine failed
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        pending: Dict[asyncio.Task, Tuple[str, float]] = {}
+        errors: List[str] = []
+        next_engine = 0
+
+        def launch() -> None:
+            nonlocal next_engine
+            name, fn = self.engines[next_engine]
+            next_engine += 1
+            pending[asyncio.ensure_future(fn(text, language))] = (name, loop.time())
+            self._count(name, "started")
+
+        launch()
+        try:
+            while pending:
+                now = loop.time()
+                remaining = self.timeout_s - (now - start)
+                if remaining <= 0:
+                    raise TimeoutError(f"No TTS engine answered within {self.timeout_s:.1f}s")
+                wait = remaining
+                can_hedge = next_engine < len(self.engines)
+                if can_hedge:
+                    name, started = max(pending.values(), key=lambda v: v[1])
+                    wait = min(wait, max(0.0, started + self.deadline(name) - now))
+
+                done, _ = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if can_hedge:
+                        with self._lock:
+                            self._hedges += 1
+                        logger.info(f"TTS hedge: starting {self.engines[next_engine][0]} after {wait:.2f}s")
+                        launch()
+                    continue
+
+                for task in done:
+                    name, started = pending.pop(task)
+                    err = task.exception()
+                    if err is None:
+                        finished = loop.time()
+                        self._latency[name].observe(finished - started)
+                        self._count(name, "wins")
+                        return HedgeResult(task.result(), name, finished - start, next_engine > 1)
+                    self._count(name, "failures")
+                    errors.append(f"{name}: {err}")
+                    logger.warning(f"TTS engine {name} failed: {err}")
+
+                if not pending and next_engine < len(self.engines):
+                    launch()   # outright failure: fail over without waiting for the deadline
+            raise RuntimeError(f"All TTS engines failed ({'; '.join(errors)})")
+        finally:
+            for task, (name, _) in pending.items():
+                task.cancel()
+                self._count(name, "cancelled")
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        engines = {}
+        for name, _ in self.engines:
+            tracker = self._latency[name]
+            p50, p95 = tracker.percentile(0.5), tracker.percentile(0.95)
+            engines[name] = {
+                **self._counts[name],
+                "samples": len(tracker),
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "deadline_ms": round(self.deadline(name) * 1000, 1),
+            }
+        return {"hedges": self._hedges, "engines": engines}
+
+    def _count(self, engine: str, key: str) -> None:
+        with self._lock:
+            self._counts[engine][key] += 1
@@ -1,34 +1,36 @@
 """
 TTS Module - Text-to-Speech using Edge-TTS (Microsoft Neural Voices)
 Free, high-quality, supports 14+ Indian languages
-Falls back to gTTS if edge-tts fails
+Hedges slow or failing edge-tts calls with gTTS / ElevenLabs
 """
 import asyncio
 import io
 import logging
-import tempfile
+import os
+import threading
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Iterator, List, Optional, Union
 
 import numpy as np
-import soundfile as sf
 
 from .config import config, get_edge_voice, get_gtts_code
+from .tts_hedge import HedgedTTS
+from .tts_pipeline import crossfade_join, map_ordered, split_for_tts, stream_segments
+from media.audio_utils import PolyphaseResampler
+
+if TYPE_CHECKING:
+    from .elevenlabs_tts import AsyncElevenLabsTTS
 
 logger = logging.getLogger(__name__)
 
-try:
-    import edge_tts
-    EDGE_TTS_AVAILABLE = True
-except ImportError:
-    EDGE_TTS_AVAILABLE = False
+# Engines (and soundfile) are imported on first use: edge_tts pulls in
+# aiohttp and the ElevenLabs client pulls in httpx.
+EDGE_TTS_AVAILABLE = find_spec("edge_tts") is not None
+if not EDGE_TTS_AVAILABLE:
     logger.warning("edge-tts not installed. Run: pip install edge-tts")
 
-try:
-    from gtts import gTTS
-    GTTS_AVAILABLE = True
-except ImportError:
-    GTTS_AVAILABLE = False
+GTTS_AVAILABLE = find_spec("gtts") is not None
 
 
 class TTSModule:
@@ -37,7 +39,7 @@ class TTSModule:
     - Free, no API key needed
     - Supports Hindi, Tamil, Telugu, Bengali, Marathi, Gujarati, Kannada,
       Malayalam, Punjabi, Urdu, English, and more
-    - Falls back to gTTS (Google) if edge-tts is unavailable
+    - Falls back to gTTS (Google) if edge-tts is unavailable, slow or failing
     """
 
     _instance = None
@@ -56,7 +58,10 @@ class TTSModule:
                     "No TTS engine found. Install: pip install edge-tts  (or)  pip install gtts"
                 )
             self.engine = "edge-tts" if EDGE_TTS_AVAILABLE else "gtts"
-            logger.info(f"TTSModule ready (engine={self.engine})")
+            self._elevenlabs: Optional["AsyncElevenLabsTTS"] = None
+            # Engines race under a p95-based latency budget (see tts_hedge)
+            self.hedger = self._build_hedger()
+            logger.info(f"TTSModule ready (engine={self.engine}, hedge order={self.hedger.engine_names})")
             TTSModule._initialized = True
 
     # ── public API ──────────────────────────────────────────────────────────
@@ -70,6 +75,9 @@ class TTSModule:
         """
         Convert text to audio waveform.
 
+        Long texts are split into sentences that are synthesized concurrently
+        (see iter_segments) and joined with a short crossfade.
+
         Args:
             text: Text to speak
             language: Language name (e.g. 'hindi')
@@ -80,10 +88,39 @@ class TTSModule:
         if not text or not text.strip():
             return np.array([], dtype=np.float32)
 
-        if self.engine == "edge-tts":
-            return self._synthesize_edge(text.strip(), language)
-        else:
-            return self._synthesize_gtts(text.strip(), language)
+        segments = self.split_text(text)
+        if len(segments) == 1:
+            return self._synthesize_segment(segments[0], language)
+        return crossfade_join(
+            self.iter_segments(text, language, segments=segments), self.sample_rate, config.tts_crossfade_ms
+        )
+
+    def iter_segments(
+        self,
+        text: str,
+        language: str = "english",
+        max_parallel: Optional[int] = None,
+        segments: Optional[List[str]] = None,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield audio sentence by sentence, in order, as soon as each is ready.
+
+        Up to `max_parallel` (default config.tts_max_parallel) sentences are
+        synthesized at once, so the first one can play while later ones are
+        still in flight.
+
+        Args:
+            text: Text to speak
+            language: Language name (e.g. 'hindi')
+            max_parallel: Concurrent synthesis requests
+
+        Yields:
+            numpy float32 arrays (mono, 24 kHz), one per segment
+        """
+        if segments is None:
+            segments = self.split_text(text)
+        workers = max_parallel or config.tts_max_parallel
+        yield from map_ordered(lambda seg: self._synthesize_segment(seg, language), segments, workers)
 
     def synthesize_to_file(
         self,
@@ -95,20 +132,40 @@ class TTSModule:
         """Synthesize and save to WAV file"""
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        import soundfile as sf
+
         wav = self.synthesize(text, language=language, **kwargs)
         sf.write(str(output_path), wav, self.sample_rate)
         logger.info(f"Audio saved to {output_path}")
         return output_path
 
     async def synthesize_stream(self, text: str, language: str = "english"):
-        """Async generator yielding raw PCM bytes (for real-time streaming)"""
+        """Async generator yielding encoded audio bytes (for real-time streaming).
+
+        Sentences are synthesized concurrently and streamed in order."""
         voice = get_edge_voice(language)
         if not EDGE_TTS_AVAILABLE:
             return
-        communicate = edge_tts.Communicate(text=text, voice=voice)
-        async for chunk in communicate.stream():
-            if chunk["type"] == "audio" and chunk.get("data"):
-                yield chunk["data"]
+        import edge_tts
+
+        async def _stream_one(segment: str):
+            communicate = edge_tts.Communicate(text=segment, voice=voice)
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio" and chunk.get("data"):
+                    yield chunk["data"]
+
+        async for _index, data in stream_segments(self.split_text(text), _stream_one, config.tts_max_parallel):
+            yield data
+
+    @staticmethod
+    def split_text(text: str) -> List[str]:
+        """Sentence/clause segments used for pipelined synthesis."""
+        return split_for_tts(
+            text,
+            max_chars=config.tts_segment_max_chars,
+            min_chars=config.tts_segment_min_chars,
+            first_max_chars=config.tts_first_segment_max_chars,
+        )
 
     def get_model_info(self) -> dict:
         return {
@@ -119,6 +176,8 @@ class TTSModule:
             "initialized": self._initialized,
             "edge_tts_available": EDGE_TTS_AVAILABLE,
             "gtts_available": GTTS_AVAILABLE,
+            "max_parallel_segments": config.tts_max_parallel,
+            "hedging": self.hedger.stats(),
         }
 
     @staticmethod
@@ -127,88 +186,92 @@ class TTSModule:
 
     # ── internals ───────────────────────────────────────────────────────────
 
-    def _synthesize_edge(self, text: str, language: str) -> np.ndarray:
-        """Synthesize via Edge-TTS — fast in-memory processing, no temp files."""
-        voice = get_edge_voice(language)
-
-        async def _run_edge():
-            communicate = edge_tts.Communicate(text=text, voice=voice)
-            audio_chunks = []
-            async for chunk in communicate.stream():
-                if chunk["type"] == "audio" and chunk.get("data"):
-                    audio_chunks.append(chunk["data"])
-            return b"".join(audio_chunks)
-
-        try:
-            # Get raw audio bytes without writing to disk
-            try:
-                loop = asyncio.get_running_loop()
-                # Inside async context — run in thread to avoid blocking
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-                    import threading
-                    result_holder: list = [None]
-                    exc_holder: list = [None]
-                    ready = threading.Event()
-
-                    def _run():
-                        try:
-                            result_holder[0] = asyncio.run(_run_edge())
-                        except Exception as e:
-                            exc_holder[0] = e
-                        finally:
-                            ready.set()
-
-                    t = threading.Thread(target=_run, daemon=True)
-                    t.start()
-                    t.join(timeout=10)
-                    if exc_holder[0]:
-                        raise exc_holder[0]
-                    mp3_bytes = result_holder[0]
-            except RuntimeError:
-                # No running loop — safe to use asyncio.run directly
-                mp3_bytes = asyncio.run(_run_edge())
-
-            if not mp3_bytes:
-                raise RuntimeError("Edge-TTS returned no audio data")
-
-            # Decode MP3 from memory (no disk I/O)
-            audio, sr = sf.read(io.BytesIO(mp3_bytes))
-            if audio.ndim > 1:
-                audio = audio.mean(axis=-1)
-            audio = audio.astype(np.float32)
-            if np.abs(audio).max() > 0:
-                audio = audio / np.abs(audio).max()
-            return audio
-
-        except Exception as e:
-            logger.warning(f"Edge-TTS failed ({e}), falling back to gTTS")
-            if GTTS_AVAILABLE:
-                return self._synthesize_gtts(text, language)
-            raise
-
-    def _synthesize_gtts(self, text: str, language: str) -> np.ndarray:
-        """Fallback: synthesize via gTTS"""
-        lang_code = get_gtts_code(language)
-        tmp = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-        tmp_path = tmp.name
-        tmp.close()
-
-        try:
-            tts = gTTS(text=text, lang=lang_code, slow=False)
-            tts.save(tmp_path)
-            audio, sr = sf.read(tmp_path)
-            if audio.ndim > 1:
-                audio = audio.mean(axis=-1)
-            audio = audio.astype(np.float32)
-            if np.abs(audio).max() > 0:
-                audio = audio / np.abs(audio).max()
-            return audio
-        finally:
-            try:
-                Path(tmp_path).unlink(missing_ok=True)
-            except Exception:
-                pass
+    def _build_hedger(self) -> HedgedTTS:
+        available = {
+            "edge-tts": (EDGE_TTS_AVAILABLE, self._edge_mp3),
+            "gtts": (GTTS_AVAILABLE, self._gtts_mp3),
+            # Paid engine: only raced when the deployment provides its own key
+            "elevenlabs": (bool(os.getenv("ELEVENLABS_API_KEY")), self._elevenlabs_mp3),
+        }
+        engines = []
+        for name in (n.strip() for n in config.tts_hedge_engines.split(",")):
+            if name not in available:
+                logger.warning(f"Unknown TTS engine in tts_hedge_engines: {name!r}")
+            elif available[name][0]:
+                engines.append((name, available[name][1]))
+        if not engines:
+            engines.append((self.engine, self._edge_mp3 if self.engine == "edge-tts" else self._gtts_mp3))
+        return HedgedTTS(
+            engines,
+            percentile=config.tts_hedge_percentile,
+            min_deadline_s=config.tts_hedge_min_deadline_s,
+            max_deadline_s=config.tts_hedge_max_deadline_s,
+            default_deadline_s=config.tts_hedge_default_deadline_s,
+            timeout_s=config.tts_timeout_s,
+        )
+
+    def _synthesize_segment(self, text: str, language: str) -> np.ndarray:
+        result = _run_sync(self.hedger.synthesize(text, language))
+        return self._decode(result.data)
+
+    async def _edge_mp3(self, text: str, language: str) -> bytes:
+        """Edge-TTS, fully async (cancellable when a hedge wins)."""
+        import edge_tts
+
+        communicate = edge_tts.Communicate(text=text, voice=get_edge_voice(language))
+        chunks = []
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio" and chunk.get("data"):
+                chunks.append(chunk["data"])
+        if not chunks:
+            raise RuntimeError("Edge-TTS returned no audio data")
+        return b"".join(chunks)
+
+    async def _gtts_mp3(self, text: str, language: str) -> bytes:
+        # gTTS is blocking; a cancelled call finishes in its thread and is discarded
+        return await asyncio.to_thread(self._gtts_bytes, text, language)
+
+    def _gtts_bytes(self, text: str, language: str) -> bytes:
+        from gtts import gTTS
+
+        buf = io.BytesIO()
+        gTTS(text=text, lang=get_gtts_code(language), slow=False).write_to_fp(buf)
+        return buf.getvalue()
+
+    async def _elevenlabs_mp3(self, text: str, language: str) -> bytes:
+        if self._elevenlabs is None:
+            from .elevenlabs_tts import AsyncElevenLabsTTS
+            self._elevenlabs = AsyncElevenLabsTTS()
+        return await self._elevenlabs.synthesize_bytes(text)
+
+    def _decode(self, data: bytes) -> np.ndarray:
+        """Encoded audio -> normalized mono float32 at self.sample_rate (in memory)."""
+        import soundfile as sf
+
+        audio, sr = sf.read(io.BytesIO(data), dtype="float32")
+        if audio.ndim > 1:
+            audio = audio.mean(axis=-1)
+        if sr != self.sample_rate:
+            audio = PolyphaseResampler(sr, self.sample_rate).process(audio)
+        peak = np.abs(audio).max() if len(audio) else 0.0
+        if peak > 0:
+            audio = audio / peak
+        return audio.astype(np.float32, copy=False)
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _run_sync(coro):
+    """Run a coroutine from blocking code (any thread) on a private, long-lived
+    event loop, so async engines keep their connection pools between calls."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="tts-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
 
 
 def text_to_speech(text: str, output_path: str, language: str = "english") -> str:
@@ -0,0 +1,211 @@
+"""
+Sentence-level pipelined TTS.
+Long texts are split at sentence/clause boundaries (Latin and Indic
+punctuation) and the pieces are synthesized concurrently with bounded
+parallelism, then delivered strictly in order: playback of segment 1 can
+start while segments 2..n are still being synthesized.
+"""
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+# ── Text segmentation ───────────────────────────────────────────────────────
+# . ! ? …, Devanagari danda/double danda, Urdu full stop, Arabic question mark
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?…।॥۔؟])[\"'”’)\]]*\s+|\n+")
+# , ; : and dashes, plus the Arabic/Urdu comma
+_CLAUSE_END_RE = re.compile(r"(?<=[,;:،–—])\s+")
+
+
+def split_for_tts(
+    text: str,
+    max_chars: int = 220,
+    min_chars: int = 24,
+    first_max_chars: Optional[int] = 80,
+) -> List[str]:
+    """
+    Split text into segments for pipelined synthesis.
+
+    Args:
+        text: Text to speak
+        max_chars: Longest segment; longer sentences are cut at clauses, then words
+        min_chars: Shorter fragments ("Dr.", "Yes.") are merged with a neighbour
+        first_max_chars: Cut the first segment at a clause if it is longer,
+            so the first audio arrives sooner (None to disable)
+
+    Returns:
+        Non-empty segments in reading order ([] for blank text)
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    pieces: List[str] = []
+    for sentence in _SENTENCE_END_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        limit = first_max_chars if (first_max_chars and not pieces) else max_chars
+        if len(sentence) <= limit:
+            pieces.append(sentence)
+            continue
+        for clause in _CLAUSE_END_RE.split(sentence):
+            pieces.extend(_split_words(clause, max_chars))
+
+    segments: List[str] = []
+    for piece in pieces:
+        if segments and len(segments[-1]) < min_chars and len(segments[-1]) + 1 + len(piece) <= max_chars:
+            segments[-1] = f"{segments[-1]} {piece}"
+        else:
+            segments.append(piece)
+    if len(segments) > 1 and len(segments[-1]) < min_chars and len(segments[-2]) + 1 + len(segments[-1]) <= max_chars:
+        segments[-2] = f"{segments[-2]} {segments.pop()}"
+    return segments
+
+
+def _split_words(text: str, max_chars: int) -> List[str]:
+    out: List[str] = []
+    current = ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            out.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        out.append(current)
+    return out
+
+
+# ── Ordered, bounded-parallel synthesis ─────────────────────────────────────
+_END = object()
+
+
+async def stream_segments(
+    segments: List[str],
+    stream_one: Callable[[str], AsyncIterator[bytes]],
+    max_parallel: int = 3,
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Stream several segments through an async TTS engine concurrently.
+
+    At most `max_parallel` segments are synthesized at once.  Chunks are
+    yielded as (segment_index, data) strictly in segment order, and the
+    current segment streams through as it is produced.  Pending synthesis
+    is cancelled if the consumer stops early; a failing segment raises.
+    """
+    queues: List[asyncio.Queue] = [asyncio.Queue() for _ in segments]
+    gate = asyncio.Semaphore(max(1, max_parallel))
+
+    async def run(index: int, segment: str) -> None:
+        queue = queues[index]
+        try:
+            async with gate:
+                async for data in stream_one(segment):
+                    if data:
+                        queue.put_nowait(data)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(_END)
+
+    tasks = [asyncio.create_task(run(i, s)) for i, s in enumerate(segments)]
+    try:
+        for index, queue in enumerate(queues):
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield index, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def complete_segments(
+    segments: List[str],
+    stream_one: Callable[[str], AsyncIterator[bytes]],
+    max_parallel: int = 3,
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """stream_segments(), regrouped into one (index, bytes) per finished segment.
+    Every index is yielded, b"" for a segment that produced no data, so
+    indices and len(segments) stay consistent for the consumer."""
+    parts: List[bytes] = []
+    current = 0
+    async for index, data in stream_segments(segments, stream_one, max_parallel):
+        while index != current:
+            yield current, b"".join(parts)
+            parts, current = [], current + 1
+        parts.append(data)
+    while current < len(segments):
+        yield current, b"".join(parts)
+        parts, current = [], current + 1
+
+
+def map_ordered(fn: Callable[[str], T], segments: List[str], max_parallel: int = 3) -> Iterator[T]:
+    """Blocking counterpart: run `fn` over segments in a thread pool of
+    `max_parallel` workers and yield results in order as each becomes ready."""
+    if len(segments) <= 1 or max_parallel <= 1:
+        for segment in segments:
+            yield fn(segment)
+        return
+    with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="tts-seg") as pool:
+        futures = [pool.submit(fn, s) for s in segments]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+# ── Joining ─────────────────────────────────────────────────────────────────
+class Crossfader:
+    """
+    Joins consecutive float32 segments with a short linear crossfade.
+
+    push() returns the audio that is final so far and holds back the last
+    `crossfade_ms` for mixing with the next segment; flush() returns the rest.
+    With crossfade_ms=0 segments are passed through unchanged.
+    """
+
+    def __init__(self, sample_rate: int, crossfade_ms: float = 15.0):
+        self.n = int(sample_rate * crossfade_ms / 1000)
+        self._tail: Optional[np.ndarray] = None
+        if self.n:
+            self._fade_in = np.linspace(0.0, 1.0, self.n, dtype=np.float32)
+            self._fade_out = self._fade_in[::-1].copy()
+
+    def push(self, segment: np.ndarray) -> np.ndarray:
+        segment = np.asarray(segment, dtype=np.float32)
+        if not self.n:
+            return segment
+        if self._tail is not None:
+            k = min(len(self._tail), len(segment))
+            head = segment[:k] * self._fade_in[self.n - k:] if k else segment[:0]
+            mixed = self._tail[:k] * self._fade_out[:k] + head
+            segment = np.concatenate((mixed, self._tail[k:], segment[k:]))
+        if len(segment) <= self.n:
+            self._tail = segment
+            return segment[:0]
+        self._tail = segment[-self.n:]
+        return segment[:-self.n]
+
+    def flush(self) -> np.ndarray:
+        tail, self._tail = self._tail, None
+        return tail if tail is not None else np.zeros(0, dtype=np.float32)
+
+
+def crossfade_join(segments: Iterable[np.ndarray], sample_rate: int, crossfade_ms: float = 15.0) -> np.ndarray:
+    """Concatenate float32 segments with a crossfade at each join."""
+    fader = Crossfader(sample_rate, crossfade_ms)
+    parts = [fader.push(s) for s in segments]
+    parts.append(fader.flush())
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
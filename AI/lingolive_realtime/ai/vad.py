@@ -1,9 +1,21 @@
 from __future__ import annotations
 
 import collections
-from typing import Deque, Iterable, Tuple
+import functools
+from typing import Deque, Iterable, List, Optional, Tuple
 
-import webrtcvad
+import numpy as np
+
+
+@functools.lru_cache(maxsize=None)
+def _webrtcvad():
+    """webrtcvad, imported on first use (it drags in pkg_resources); None if
+    not installed, in which case trimming is energy-only."""
+    try:
+        import webrtcvad  # type: ignore
+    except Exception:  # pragma: no cover
+        return None
+    return webrtcvad
 
 
 class VAD:
@@ -16,6 +28,9 @@ class VAD:
     def __init__(self, aggressiveness: int = 2, frame_ms: int = 20) -> None:
         if frame_ms not in (10, 20, 30):
             raise ValueError("webrtcvad supports 10/20/30 ms frames")
+        webrtcvad = _webrtcvad()
+        if webrtcvad is None:
+            raise ImportError("webrtcvad not installed. Run: pip install webrtcvad")
         self.vad = webrtcvad.Vad(aggressiveness)
         self.frame_ms = frame_ms
         self.sample_rate = 16000
@@ -70,3 +85,151 @@ class VAD:
 
         if window:
             yield b"".join(window), True
+
+
+def speech_segments(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    frame_ms: int = 20,
+    energy_floor: float = 0.004,
+    pad_ms: int = 100,
+    min_pause_ms: int = 400,
+    min_speech_ms: int = 120,
+    aggressiveness: Optional[int] = 2,
+) -> List[Tuple[int, int]]:
+    """Find speech regions in float32 mono audio as (start, end) sample offsets.
+
+    Per-frame RMS is computed in one vectorized pass; frames above an adaptive
+    energy threshold are then confirmed with webrtcvad (if installed and
+    `aggressiveness` is not None).  Regions are padded by `pad_ms`, regions
+    separated by less than `min_pause_ms` are merged, and blips shorter than
+    `min_speech_ms` are dropped.
+    """
+    frame_len = sample_rate * frame_ms // 1000
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return []
+
+    frames = audio[: n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame_len)
+    threshold = max(energy_floor, 0.1 * float(np.percentile(rms, 95)))
+    voiced = rms > threshold
+
+    webrtcvad = _webrtcvad() if aggressiveness is not None else None
+    if webrtcvad is not None and sample_rate in (8000, 16000, 32000, 48000):
+        vad = webrtcvad.Vad(aggressiveness)
+        pcm = (np.clip(frames[voiced], -1.0, 1.0) * 32767).astype(np.int16)
+        confirmed = np.fromiter(
+            (vad.is_speech(row.tobytes(), sample_rate) for row in pcm), dtype=bool, count=len(pcm)
+        )
+        voiced[np.flatnonzero(voiced)] = confirmed
+
+    if not voiced.any():
+        return []
+
+    # Pad onsets/offsets so word edges survive, then read off the runs
+    pad = pad_ms // frame_ms
+    if pad:
+        voiced = np.convolve(voiced, np.ones(2 * pad + 1, dtype=bool), mode="same") > 0
+    edges = np.diff(np.concatenate(([0], voiced.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    min_pause = min_pause_ms // frame_ms
+    min_speech = max(1, min_speech_ms // frame_ms)
+    regions: List[Tuple[int, int]] = []
+    for s, e in zip(starts.tolist(), ends.tolist()):
+        if regions and s - regions[-1][1] < min_pause:
+            regions[-1] = (regions[-1][0], e)
+        else:
+            regions.append((s, e))
+    return [
+        (s * frame_len, min(e * frame_len, len(audio)))
+        for s, e in regions
+        if e - s >= min_speech
+    ]
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    gap_ms: int = 200,
+    **kwargs,
+) -> Tuple[np.ndarray, float, List[Tuple[int, int]]]:
+    """Cut leading/trailing silence and shorten internal pauses to `gap_ms`.
+
+    Returns (compacted audio, fraction of input removed, speech regions).  The
+    result is a view of the input when there is a single region.
+    """
+    if len(audio) == 0:
+        return audio, 0.0, []
+    regions = speech_segments(audio, sample_rate=sample_rate, **kwargs)
+    if not regions:
+        return audio[:0], 1.0, []
+    if len(regions) == 1:
+        s, e = regions[0]
+        out = audio[s:e]
+    else:
+        gap = np.zeros(sample_rate * gap_ms // 1000, dtype=audio.dtype)
+        parts: List[np.ndarray] = []
+        for i, (s, e) in enumerate(regions):
+            if i:
+                parts.append(gap)
+            parts.append(audio[s:e])
+        out = np.concatenate(parts)
+    return out, 1.0 - len(out) / len(audio), regions
+
+
+def bounded_segments(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    max_segment_s: float = 30.0,
+    frame_ms: int = 20,
+    **kwargs,
+) -> List[Tuple[int, int]]:
+    """Split long audio into speech segments no longer than `max_segment_s`.
+
+    Neighbouring speech regions are packed together while they fit (Whisper
+    pads every window to 30 s anyway); regions that are too long on their own
+    are cut at the quietest frame in the last 30% of the window.
+    """
+    pieces = split_speech(audio, sample_rate, max_segment_s, frame_ms, **kwargs)
+    return pack_segments(pieces, int(max_segment_s * sample_rate))
+
+
+def split_speech(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    max_segment_s: float = 30.0,
+    frame_ms: int = 20,
+    **kwargs,
+) -> List[Tuple[int, int]]:
+    """Speech regions of `audio`, each cut to at most `max_segment_s` (not yet
+    packed; the pauses between them are not part of any region)."""
+    max_len = int(max_segment_s * sample_rate)
+    frame_len = sample_rate * frame_ms // 1000
+    pieces: List[Tuple[int, int]] = []
+    for s, e in speech_segments(audio, sample_rate=sample_rate, frame_ms=frame_ms, **kwargs):
+        while e - s > max_len:
+            lo = s + int(max_len * 0.7) // frame_len * frame_len
+            window = audio[lo : s + max_len]
+            n = len(window) // frame_len
+            frames = window[: n * frame_len].reshape(n, frame_len)
+            cut = lo + int(np.argmin(np.einsum("ij,ij->i", frames, frames))) * frame_len if n else s + max_len
+            cut = max(cut, s + frame_len)
+            pieces.append((s, cut))
+            s = cut
+        pieces.append((s, e))
+    return pieces
+
+
+def pack_segments(pieces: List[Tuple[int, int]], max_len: int) -> List[Tuple[int, int]]:
+    """Merge consecutive (start, end) regions while the merged span fits in
+    `max_len` samples."""
+    packed: List[Tuple[int, int]] = []
+    for s, e in pieces:
+        if packed and e - packed[-1][0] <= max_len:
+            packed[-1] = (packed[-1][0], e)
+        else:
+            packed.append((s, e))
+    return packed
@@ -12,6 +12,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
 from loguru import logger
 
+from ai.admission import get_admission
 from media.pipeline import TranslationPipeline
 
 
@@ -54,31 +55,46 @@ async def _wait_ice_gathering_complete(pc: RTCPeerConnection) -> None:
 async def websocket_signaling(ws: WebSocket) -> None:
     await ws.accept()
 
-    # Default languages can be overridden by client init message
-    source_lang = os.getenv("LL_SOURCE_LANG", "en")
-    target_lang = os.getenv("LL_TARGET_LANG", "es")
-    tts_voice = os.getenv("LL_TTS_VOICE", "en-US-AriaNeural")
-
-    pc = RTCPeerConnection()
-    pipeline = TranslationPipeline(source_lang=source_lang, target_lang=target_lang, tts_voice=tts_voice)
-
-    @pc.on("track")
-    async def on_track(track):  # type: ignore
-        logger.info(f"Track received: kind={track.kind}")
-        if track.kind == "audio":
-            await pipeline.start()
-            # Consume incoming audio frames
-            try:
-                while True:
-                    frame: av.AudioFrame = await track.recv()
-                    await pipeline.on_audio_frame(frame)
-            except Exception as e:
-                logger.info(f"Incoming track ended: {e}")
-
-    # Pre-create outgoing translated audio track and add to pc
-    pc.addTrack(pipeline.out_track)
+    # Refuse the session up front while inference is already backed up
+    admission = get_admission()
+    session_id = f"rtc-{id(ws)}"
+    decision = admission.admit(session_id)
+    if not decision.admitted:
+        await ws.send_text(json.dumps(decision.to_message()))
+        await ws.close(code=1013)
+        return
 
+    # Everything after admit() runs under the finally below: a failure anywhere
+    # (even constructing the peer connection) must release the session.
+    pc: Optional[RTCPeerConnection] = None
+    pipeline: Optional[TranslationPipeline] = None
     try:
+        # Default languages can be overridden by client init message
+        source_lang = os.getenv("LL_SOURCE_LANG", "en")
+        target_lang = os.getenv("LL_TARGET_LANG", "es")
+        tts_voice = os.getenv("LL_TTS_VOICE", "en-US-AriaNeural")
+
+        pc = RTCPeerConnection()
+        pipeline = TranslationPipeline(
+            source_lang=source_lang, target_lang=target_lang, tts_voice=tts_voice, admission=admission
+        )
+
+        @pc.on("track")
+        async def on_track(track):  # type: ignore
+            logger.info(f"Track received: kind={track.kind}")
+            if track.kind == "audio":
+                await pipeline.start()
+                # Consume incoming audio frames
+                try:
+                    while True:
+                        frame: av.AudioFrame = await track.recv()
+                        await pipeline.on_audio_frame(frame)
+                except Exception as e:
+                    logger.info(f"Incoming track ended: {e}")
+
+        # Pre-create outgoing translated audio track and add to pc
+        pc.addTrack(pipeline.out_track)
+
         while True:
             raw = await ws.receive_text()
             msg = json.loads(raw)
@@ -113,6 +129,9 @@ async def websocket_signaling(ws: WebSocket) -> None:
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected")
     finally:
+        admission.release(session_id)
         logger.info("Closing PC and pipeline")
-        await pipeline.stop()
-        await pc.close()
+        if pipeline is not None:
+            await pipeline.stop()
+        if pc is not None:
+            await pc.close()
@@ -0,0 +1,106 @@
+"""
+Benchmark: live-session latency under overload, with and without admission control
+Simulated ASR (one decode at a time, `--decode-ms` each) serves live sessions
+that each send a chunk every `--chunk-ms`.  A new session arrives every
+`--arrival-ms` until `--sessions` have tried to join, so demand ends well
+above capacity.  In both modes each session queues chunks in a
+SheddingQueue; with admission control the controller refuses sessions past
+`--target-ms` of queue delay and running sessions shed stale chunks.
+Reports sessions admitted, chunks served / shed and chunk latency
+(queue + decode) for the chunks that were served.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_admission.py [--sessions 12] [--decode-ms 60]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.admission import AdmissionController, SheddingQueue  # noqa: E402
+from ai.scheduler import InferenceScheduler, Priority  # noqa: E402
+
+
+def slow_decode(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def session(i, args, sched, admission, results) -> None:
+    if admission is not None and not admission.admit(f"s{i}").admitted:
+        results["rejected"] += 1
+        return
+    results["admitted"] += 1
+    inbox: SheddingQueue[float] = SheddingQueue(64, admission)
+    deadline = time.monotonic() + args.duration_s - i * args.arrival_ms / 1000
+
+    async def produce():
+        while time.monotonic() < deadline:
+            inbox.put_nowait(time.monotonic())
+            await asyncio.sleep(args.chunk_ms / 1000)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while not producer.done() or inbox.qsize():
+            try:
+                sent = await asyncio.wait_for(inbox.get(), timeout=args.chunk_ms / 1000)
+            except asyncio.TimeoutError:
+                continue
+            await sched.run(Priority.HIGH, slow_decode, args.decode_ms / 1000)
+            results["latency"].append(time.monotonic() - sent)
+    finally:
+        results["shed"] += inbox.shed
+        if admission is not None:
+            admission.release(f"s{i}")
+
+
+async def run(with_admission: bool, args) -> dict:
+    sched = InferenceScheduler(workers=1)
+    admission = None
+    if with_admission:
+        admission = AdmissionController(
+            target_delay_s=args.target_ms / 1000, window_s=2.0, stale_chunk_s=2 * args.target_ms / 1000,
+            delay_sources=[sched.oldest_wait],
+        )
+        sched.on_wait = lambda priority, seconds: admission.observe(seconds)
+    results = {"admitted": 0, "rejected": 0, "shed": 0, "latency": []}
+    tasks = []
+    for i in range(args.sessions):
+        tasks.append(asyncio.create_task(session(i, args, sched, admission, results)))
+        await asyncio.sleep(args.arrival_ms / 1000)
+    await asyncio.gather(*tasks)
+    sched.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--arrival-ms", type=float, default=400.0)
+    parser.add_argument("--chunk-ms", type=float, default=250.0)
+    parser.add_argument("--decode-ms", type=float, default=60.0)
+    parser.add_argument("--target-ms", type=float, default=300.0)
+    parser.add_argument("--duration-s", type=float, default=8.0, help="talk time of the first session")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)    # no per-refusal warnings
+
+    capacity = args.chunk_ms / args.decode_ms
+    print(f"{args.sessions} sessions, 1 chunk / {args.chunk_ms:.0f} ms each, decode {args.decode_ms:.0f} ms "
+          f"(capacity ~{capacity:.1f} sessions)")
+    print(f"{'mode':<12}{'admitted':>10}{'served':>8}{'shed':>7}{'p50':>9}{'p95':>9}{'max':>9}")
+    for label, enabled in (("no limit", False), ("admission", True)):
+        r = asyncio.run(run(enabled, args))
+        lat = sorted(r["latency"])
+        p95 = lat[min(len(lat) - 1, int(0.95 * len(lat)))]
+        print(f"{label:<12}{r['admitted']:>7}/{args.sessions:<2}{len(lat):>8}{r['shed']:>7}"
+              f"{statistics.median(lat) * 1000:>6.0f} ms{p95 * 1000:>6.0f} ms{lat[-1] * 1000:>6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
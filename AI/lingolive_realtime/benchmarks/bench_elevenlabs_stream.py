@@ -0,0 +1,101 @@
+"""
+Benchmark: ElevenLabs time-to-first-audio, buffered vs streaming client
+A local stub server stands in for the API: it sends `--chunks` audio chunks
+`--chunk-delay-ms` apart, the way the real endpoint emits audio while it is
+still generating.  Reports, per request:
+  - ElevenLabsTTS.synthesize_bytes (sync, waits for the full MP3)
+  - AsyncElevenLabsTTS.stream (first chunk / full audio), sequential and
+    `--concurrency` at once over the shared pool
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_elevenlabs_stream.py [--requests 20] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.elevenlabs_tts import AsyncElevenLabsTTS, ElevenLabsTTS  # noqa: E402
+
+
+def start_stub(chunks: int, chunk_bytes: int, delay_s: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Content-Length", str(chunks * chunk_bytes))
+            self.end_headers()
+            for _ in range(chunks):
+                time.sleep(delay_s)
+                self.wfile.write(b"\xff" * chunk_bytes)
+                self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def timed_stream(client: AsyncElevenLabsTTS) -> tuple:
+    start = time.perf_counter()
+    first = None
+    async for _chunk in client.stream("benchmark sentence"):
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def ms(values) -> str:
+    return f"{statistics.median(values) * 1000:7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--chunks", type=int, default=8)
+    parser.add_argument("--chunk-bytes", type=int, default=4096)
+    parser.add_argument("--chunk-delay-ms", type=float, default=40.0)
+    args = parser.parse_args()
+
+    server = start_stub(args.chunks, args.chunk_bytes, args.chunk_delay_ms / 1000)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    sync_client = ElevenLabsTTS(api_key="bench", base_url=base_url)
+    buffered = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        sync_client.synthesize_bytes("benchmark sentence")
+        buffered.append(time.perf_counter() - start)
+    sync_client.close()
+
+    async def run_async():
+        client = AsyncElevenLabsTTS(api_key="bench", base_url=base_url, max_connections=args.concurrency)
+        sequential = [await timed_stream(client) for _ in range(args.requests)]
+        concurrent = await asyncio.gather(*(timed_stream(client) for _ in range(args.requests)))
+        await client.aclose()
+        return sequential, concurrent
+
+    sequential, concurrent = asyncio.run(run_async())
+    server.shutdown()
+
+    print(f"{'client':<34}{'first audio':>12}{'full audio':>12}")
+    print(f"{'sync, buffered':<34}{ms(buffered):>12}{ms(buffered):>12}")
+    print(f"{'async stream, sequential':<34}{ms([f for f, _ in sequential]):>12}{ms([t for _, t in sequential]):>12}")
+    label = f"async stream, {args.concurrency} pooled conns"
+    print(f"{label:<34}{ms([f for f, _ in concurrent]):>12}{ms([t for _, t in concurrent]):>12}")
+
+
+if __name__ == "__main__":
+    main()
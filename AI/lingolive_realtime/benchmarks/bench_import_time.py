@@ -0,0 +1,73 @@
+"""
+Benchmark: import time of the ai package entry points (python -X importtime)
+Each statement runs in a fresh interpreter; the reported time is the sum of
+the top-level cumulative import times (best of `--repeat`).  Model backends
+(transformers, faster_whisper, edge_tts, gtts, soundfile, httpx) are imported
+on first use, so config-only and Google-translation-only processes should
+not pay for them.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_import_time.py [--repeat 3] [--top 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = [
+    "import ai.config",
+    "from ai import TranslationModule",
+    "from ai import ASRModule",
+    "from ai import TTSModule",
+    "import ai",
+    "import translation_server",
+]
+
+
+def import_times(stmt: str) -> List[Tuple[int, int, str]]:
+    """(self_us, cumulative_us, module) per import, in -X importtime order."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", stmt],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{stmt!r} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            rows.append((int(self_us), int(cumulative_us), name))
+    return rows
+
+
+def total_ms(rows: List[Tuple[int, int, str]]) -> float:
+    # Top-level imports have a single space before the module name.
+    return sum(cum for _, cum, name in rows if not name.startswith("  ")) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest modules (self time)")
+    args = parser.parse_args()
+
+    print(f"{'statement':<36}{'import time':>12}")
+    for stmt in STATEMENTS:
+        try:
+            runs = [import_times(stmt) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{stmt:<36}{'failed':>12}  ({e})")
+            continue
+        best = min(runs, key=total_ms)
+        print(f"{stmt:<36}{total_ms(best):>9.0f} ms")
+        for self_us, _, name in sorted(best, reverse=True)[:args.top]:
+            print(f"    {name.strip():<32}{self_us / 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: script-based language detection for source_lang="auto"
+Classifies 100k mixed chat messages and reports per-message latency and
+accuracy against the language each message was generated from.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_langid.py [--messages 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.langid import detect_language, detect_languages  # noqa: E402
+
+SAMPLES = {
+    "en": ["Hello, how are you?", "See you tomorrow at the station", "ok thanks!"],
+    "hi": ["नमस्ते, आप कैसे हैं?", "मैं कल आपसे मिलूँगा", "यह बहुत अच्छा है"],
+    "mr": ["मी ठीक आहे आणि तुम्ही?", "तुम्ही काय करत आहात", "मला खूप आवडले"],
+    "bn": ["আমি ভালো আছি", "তুমি কোথায় যাচ্ছ?", "ধন্যবাদ বন্ধু"],
+    "as": ["মই ভাল আছোঁ, আৰু তুমি?", "তোমাৰ নাম কি?"],
+    "ta": ["வணக்கம், எப்படி இருக்கிறீர்கள்?", "நாளை சந்திப்போம்"],
+    "te": ["నమస్కారం, మీరు ఎలా ఉన్నారు?", "రేపు కలుద్దాం"],
+    "kn": ["ನಮಸ್ಕಾರ, ಹೇಗಿದ್ದೀರಾ?", "ನಾಳೆ ಭೇಟಿಯಾಗೋಣ"],
+    "ml": ["നമസ്കാരം, സുഖമാണോ?", "നാളെ കാണാം"],
+    "gu": ["નમસ્તે, તમે કેમ છો?", "કાલે મળીએ"],
+    "pa": ["ਸਤ ਸ੍ਰੀ ਅਕਾਲ, ਤੁਸੀਂ ਕਿਵੇਂ ਹੋ?", "ਕੱਲ੍ਹ ਮਿਲਾਂਗੇ"],
+    "or": ["ନମସ୍କାର, ଆପଣ କେମିତି ଅଛନ୍ତି?", "କାଲି ଦେଖା ହେବ"],
+    "ur": ["آپ کیسے ہیں؟", "کل ملتے ہیں"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pool = [(lang, text) for lang, texts in SAMPLES.items() for text in texts]
+    corpus = [rng.choice(pool) for _ in range(args.messages)]
+    texts = [t for _, t in corpus]
+
+    # Warm up
+    detect_languages(texts[:1000])
+
+    t0 = time.perf_counter()
+    predicted = detect_languages(texts)
+    elapsed = time.perf_counter() - t0
+
+    errors = Counter((lang, pred) for (lang, _), pred in zip(corpus, predicted) if lang != pred)
+    accuracy = 1 - sum(errors.values()) / len(corpus)
+
+    lat = []
+    for text in texts[:5000]:
+        t = time.perf_counter_ns()
+        detect_language(text)
+        lat.append(time.perf_counter_ns() - t)
+    lat.sort()
+
+    print(f"  Messages      : {len(texts):,}")
+    print(f"  Total time    : {elapsed*1000:.1f} ms")
+    print(f"  Throughput    : {len(texts)/elapsed:,.0f} msg/s")
+    print(f"  Mean latency  : {elapsed/len(texts)*1e6:.2f} us/msg")
+    print(f"  p50 / p99     : {lat[len(lat)//2]/1000:.2f} / {lat[int(len(lat)*0.99)]/1000:.2f} us")
+    print(f"  Accuracy      : {accuracy*100:.2f}%")
+    for (lang, pred), n in errors.most_common(5):
+        print(f"    {lang} -> {pred}: {n}")
+
+
+if __name__ == "__main__":
+    main()
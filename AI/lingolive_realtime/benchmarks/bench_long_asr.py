@@ -0,0 +1,89 @@
+"""
+Benchmark: long-form ASR latency vs. parallel decode workers
+ASRModule.transcribe_long() on `--minutes` of synthetic speech (bursts of
+noise separated by pauses), split at pauses into spans of at most
+`--segment-s` and decoded across 1, 2, 4 ... `--max-workers` workers.  By
+default decoding is simulated at `--rtf` x real time, releasing the GIL like
+CTranslate2 does; `--whisper-size tiny` uses a real (cached) Whisper model
+with one CPU thread per worker.  Reports latency and speed-up per worker count.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_long_asr.py [--minutes 5] [--max-workers 4] [--whisper-size tiny]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.asr_module import ASRModule  # noqa: E402
+from ai.config import config  # noqa: E402
+
+Seg = namedtuple("Seg", "start end text avg_logprob")
+Info = namedtuple("Info", "language language_probability duration")
+SR = 16000
+
+
+class SimulatedWhisper:
+    """Decode cost proportional to the span length; sleeps (GIL released)."""
+
+    def __init__(self, rtf: float):
+        self.rtf = rtf
+
+    def transcribe(self, audio, language=None, **kwargs):
+        time.sleep(len(audio) / SR * self.rtf)
+        return iter([Seg(0.0, len(audio) / SR, "speech", -0.2)]), Info(language or "en", 0.99, len(audio) / SR)
+
+
+def synthetic_speech(minutes: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    parts, total = [], 0
+    while total < minutes * 60 * SR:
+        burst = (rng.uniform(-0.3, 0.3, int(rng.uniform(2, 8) * SR))).astype(np.float32)
+        pause = np.zeros(int(rng.uniform(0.5, 1.5) * SR), dtype=np.float32)
+        parts += [burst, pause]
+        total += len(burst) + len(pause)
+    return np.concatenate(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, default=5.0)
+    parser.add_argument("--segment-s", type=float, default=30.0)
+    parser.add_argument("--max-workers", type=int, default=max(1, os.cpu_count() or 1))
+    parser.add_argument("--rtf", type=float, default=0.05, help="simulated decode time / audio time")
+    parser.add_argument("--whisper-size", default="", help="real Whisper size instead of the simulation")
+    args = parser.parse_args()
+
+    config.whisper_fallback_model_size = ""
+    if args.whisper_size:
+        config.whisper_model_size = args.whisper_size
+        config.whisper_num_workers = args.max_workers
+        config.whisper_cpu_threads = 1
+    else:
+        ASRModule._whisper = lambda self, size: SimulatedWhisper(args.rtf)
+    asr = ASRModule()
+    audio = synthetic_speech(args.minutes)
+
+    workers, counts = 1, []
+    while workers <= args.max_workers:
+        counts.append(workers)
+        workers *= 2
+    print(f"{len(audio) / SR / 60:.1f} min audio, spans <= {args.segment_s:.0f} s, "
+          f"{'Whisper ' + args.whisper_size if args.whisper_size else f'simulated RTF {args.rtf}'}")
+    print(f"{'workers':>8}{'latency':>11}{'speed-up':>10}{'spans':>7}")
+    base = None
+    for n in counts:
+        t0 = time.perf_counter()
+        result = asr.transcribe_long(audio, language="en", max_segment_s=args.segment_s, workers=n)
+        elapsed = time.perf_counter() - t0
+        base = base or elapsed
+        print(f"{n:>8}{elapsed:>9.2f} s{base / elapsed:>9.2f}x{len(result['segments']):>7}")
+
+
+if __name__ == "__main__":
+    main()
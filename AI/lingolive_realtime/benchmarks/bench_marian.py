@@ -0,0 +1,113 @@
+"""
+Benchmark: MarianMT throughput and latency, stock vs. tuned CPU inference
+`--concurrency` callers each translate `--requests` sentences one at a time
+(like concurrent /translate requests) with the real MarianMT model for
+`--pair`, in three modes:
+  - stock: fp32 model, torch default threads, autograd on, no call limit
+  - tuned: inference_mode and the thread budget of translation_module
+    (concurrent calls x torch threads <= cores)
+  - tuned+int8: tuned, with dynamic int8 Linear layers (MARIAN_QUANTIZE=1)
+Reports output tokens/s over the run, per-request latency (p50 / p95) and
+the share of sentences translated exactly as in stock mode.
+Needs torch + transformers and the model (downloaded on first run).
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_marian.py [--pair en->hi] [--concurrency 4]
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import translation_module as tm  # noqa: E402
+from ai.config import MARIAN_MODELS, config  # noqa: E402
+
+SENTENCES = [
+    "Hello, how are you doing today?",
+    "The meeting has been moved to three o'clock tomorrow afternoon.",
+    "Can you send me the report before the end of the week?",
+    "I think we should take the train instead of driving.",
+    "Thank you very much for your help with the project.",
+    "Where is the nearest pharmacy?",
+    "The weather is supposed to be much better on Sunday.",
+    "Please call me back when you get this message.",
+]
+
+
+def load(pair: str, quantize: bool):
+    tokenizer_cls, model_cls = tm._marian_classes()
+    tok = tokenizer_cls.from_pretrained(MARIAN_MODELS[pair])
+    mdl = model_cls.from_pretrained(MARIAN_MODELS[pair]).eval()
+    return tok, tm._quantize(mdl) if quantize else mdl
+
+
+def run(tok, mdl, tuned: bool, args) -> dict:
+    import torch
+
+    if tuned:
+        config.marian_concurrency = args.concurrency
+        slots, threads = tm.apply_thread_budget()
+    else:
+        torch.set_num_threads(os.cpu_count() or 1)
+        slots, threads = args.concurrency, torch.get_num_threads()
+    pad = mdl.config.pad_token_id
+    latencies, tokens, lock = [], [0], threading.Lock()
+    outputs = {}
+
+    def translate(text: str) -> None:
+        start = time.perf_counter()
+        batch = tok([text], return_tensors="pt", padding=True, truncation=True, max_length=128)
+        slot = tm._generate_slots if tuned else contextlib.nullcontext()
+        with slot, torch.inference_mode(tuned):
+            out = mdl.generate(**batch, max_new_tokens=128, num_beams=1)
+        with lock:
+            latencies.append(time.perf_counter() - start)
+            tokens[0] += int((out != pad).sum())
+            outputs[text] = tok.decode(out[0], skip_special_tokens=True)
+
+    def caller(i: int) -> None:
+        for n in range(args.requests):
+            translate(SENTENCES[(i + n) % len(SENTENCES)])
+
+    translate(SENTENCES[0])                    # warm-up, not counted
+    latencies.clear()
+    tokens[0] = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        list(pool.map(caller, range(args.concurrency)))
+    wall = time.perf_counter() - start
+    lat = sorted(latencies)
+    return {
+        "slots": slots, "threads": threads, "tok_s": tokens[0] / wall,
+        "p50": statistics.median(lat), "p95": lat[min(len(lat) - 1, int(0.95 * len(lat)))],
+        "outputs": outputs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pair", default="en->hi", choices=sorted(MARIAN_MODELS))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=16, help="sentences per caller")
+    args = parser.parse_args()
+
+    print(f"{args.pair}: {args.concurrency} callers x {args.requests} sentences, {os.cpu_count()} cores")
+    print(f"{'mode':<12}{'calls x threads':>17}{'tokens/s':>10}{'p50':>10}{'p95':>10}{'= stock':>9}")
+    reference = None
+    for label, tuned, quantize in (("stock", False, False), ("tuned", True, False), ("tuned+int8", True, True)):
+        tok, mdl = load(args.pair, quantize=quantize)
+        r = run(tok, mdl, tuned, args)
+        reference = reference or r["outputs"]
+        same = sum(r["outputs"][s] == reference[s] for s in reference) / len(reference)
+        print(f"{label:<12}{r['slots']:>8} x {r['threads']:<6}{r['tok_s']:>10.1f}"
+              f"{r['p50'] * 1000:>7.0f} ms{r['p95'] * 1000:>7.0f} ms{same:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
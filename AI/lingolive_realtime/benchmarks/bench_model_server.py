@@ -0,0 +1,104 @@
+"""
+Benchmark: model server IPC overhead and cross-client translation batching
+Runs a ModelServer with no-op models on a temporary Unix socket and reports:
+  - round trip per call for ping, 1 s / 5 s of float32 audio (binary payload)
+    and a short translate call
+  - `--clients` threads translating concurrently against a model whose cost
+    is `--batch-cost-ms` per call, with and without server-side batching
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_model_server.py [--calls 500] [--clients 16]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.config import config  # noqa: E402
+from ai.model_client import ModelClient, RemoteASR, RemoteTranslator  # noqa: E402
+from ai.model_server import ModelServer  # noqa: E402
+
+
+class NoopASR:
+    def transcribe_fast(self, audio, language=None, session_id=None, trim_silence=False):
+        return {"text": "", "language": language}
+
+
+class FixedCostTranslator:
+    """Each model call costs the same, whatever the batch size (like one generate())."""
+
+    def __init__(self, cost_s: float):
+        self.cost_s = cost_s
+
+    def translate(self, text, src, tgt):
+        time.sleep(self.cost_s)
+        return list(text) if isinstance(text, list) else text
+
+
+def start(path: str, cost_s: float) -> ModelServer:
+    server = ModelServer(path, asr=NoopASR(), translator=FixedCostTranslator(cost_s))
+    threading.Thread(target=asyncio.run, args=(server.run(),), daemon=True).start()
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    return server
+
+
+def timed(fn, calls: int) -> str:
+    samples = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return f"{statistics.median(samples) * 1e6:8.0f} us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=160, help="translations in the concurrent run")
+    parser.add_argument("--batch-cost-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    server = start(os.path.join(tmp, "bench.sock"), args.batch_cost_ms / 1000)
+    client = ModelClient(server.socket_path, pool_size=args.clients)
+    asr, translator = RemoteASR(client), RemoteTranslator(client)
+    one_s = np.zeros(16000, dtype=np.float32)
+    five_s = np.zeros(5 * 16000, dtype=np.float32)
+
+    print(f"{'call':<34}{'round trip (p50)':>18}")
+    print(f"{'ping':<34}{timed(lambda: client.call('ping'), args.calls):>18}")
+    print(f"{'asr.transcribe_fast, 1 s audio':<34}{timed(lambda: asr.transcribe_fast(one_s), args.calls):>18}")
+    print(f"{'asr.transcribe_fast, 5 s audio':<34}{timed(lambda: asr.transcribe_fast(five_s), args.calls):>18}")
+    print()
+
+    def run_concurrent() -> float:
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as pool:
+            list(pool.map(lambda i: translator.translate(f"message {i}", "en", "hi"), range(args.requests)))
+        return time.perf_counter() - t0
+
+    print(f"{args.requests} translations from {args.clients} clients, model call = {args.batch_cost_ms:.0f} ms")
+    print(f"{'batching':<34}{'wall':>10}{'model calls':>13}")
+    for label, max_batch in (("off (max_batch=1)", 1), (f"on (max_batch={config.model_server_max_batch})", config.model_server_max_batch)):
+        server.batcher.max_batch = max_batch
+        server.batcher.batches = server.batcher.items = 0
+        wall = run_concurrent()
+        print(f"{label:<34}{wall * 1000:>7.0f} ms{server.batcher.batches:>13}")
+
+    client.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
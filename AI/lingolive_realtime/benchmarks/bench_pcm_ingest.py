@@ -0,0 +1,71 @@
+"""
+Benchmark: PCM ingestion allocations on the /ws/voice path
+Compares the old per-message conversion (astype + divide + audio**2 RMS)
+with media.audio_utils.PCMRingBuffer, measuring with tracemalloc how many
+bytes of temporary arrays each second of audio costs.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_pcm_ingest.py [--seconds 60] [--chunk-ms 1000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from media.audio_utils import PCMRingBuffer  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def legacy_ingest(pcm: bytes):
+    audio_np = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+    rms = np.sqrt(np.mean(audio_np ** 2))
+    return audio_np, float(rms)
+
+
+def measure(name, ingest, chunks, seconds):
+    tracemalloc.start()
+    transient = 0
+    t0 = time.perf_counter()
+    for chunk in chunks:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = ingest(chunk)
+        transient += tracemalloc.get_traced_memory()[1] - base
+        del result
+    elapsed = time.perf_counter() - t0
+    tracemalloc.stop()
+    print(f"  {name:12s}: {transient / seconds / 1024:9.1f} KiB allocated per second of audio"
+          f"   ({elapsed / seconds * 1e6:7.1f} us CPU per second of audio, traced)")
+    return transient
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--chunk-ms", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(SAMPLE_RATE * args.seconds) * 3000).astype(np.int16)
+    step = SAMPLE_RATE * args.chunk_ms // 1000
+    chunks = [samples[i : i + step].tobytes() for i in range(0, len(samples), step)]
+
+    ring = PCMRingBuffer(capacity_s=30.0, sample_rate=SAMPLE_RATE)
+
+    print(f"  {args.seconds}s of audio in {len(chunks)} chunks of {args.chunk_ms} ms\n")
+    before = measure("before", legacy_ingest, chunks, args.seconds)
+    after = measure("ring buffer", ring.ingest, chunks, args.seconds)
+    if after:
+        print(f"\n  Reduction   : {before / after:.0f}x fewer bytes allocated")
+    else:
+        print("\n  Reduction   : no array allocations on the ring-buffer path")
+
+
+if __name__ == "__main__":
+    main()
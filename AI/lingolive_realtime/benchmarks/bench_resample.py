@@ -0,0 +1,69 @@
+"""
+Benchmark: per-stream resampling throughput (single thread = one core)
+Reports 20 ms frames/sec for
+  - StreamResampler fast path (already 16 kHz mono s16)
+  - StreamResampler via av.AudioResampler (48 kHz stereo WebRTC -> 16 kHz mono)
+  - PolyphaseResampler 24 kHz -> 16 kHz, frame by frame and batched (1 s chunks)
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_resample.py [--frames 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import av  # noqa: E402
+
+from media.audio_utils import PolyphaseResampler, StreamResampler  # noqa: E402
+
+
+def make_frame(rate: int, layout: str) -> av.AudioFrame:
+    samples = rate // 50
+    channels = 2 if layout == "stereo" else 1
+    data = (np.random.default_rng(0).standard_normal(samples * channels) * 3000).astype(np.int16)
+    frame = av.AudioFrame.from_ndarray(data.reshape(1, -1), format="s16", layout=layout)
+    frame.sample_rate = rate
+    return frame
+
+
+def rate(label: str, n_frames: int, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    print(f"  {label:44s}: {n_frames / elapsed:12,.0f} frames/s  ({n_frames / elapsed / 50:8,.0f}x real time)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=5000)
+    args = parser.parse_args()
+    n = args.frames
+
+    mono16 = make_frame(16000, "mono")
+    stereo48 = make_frame(48000, "stereo")
+
+    fast = StreamResampler(16000)
+    rate("fast path (16 kHz mono s16)", n, lambda: [fast.to_pcm16_mono(mono16) for _ in range(n)])
+
+    slow = StreamResampler(16000)
+    rate("av resampler (48 kHz stereo -> 16 kHz)", n, lambda: [slow.to_pcm16_mono(stereo48) for _ in range(n)])
+
+    tts = (np.random.default_rng(1).standard_normal(24000 * (n // 50 + 1)) * 3000).astype(np.int16).tobytes()
+    frame_bytes = 480 * 2                      # 20 ms at 24 kHz
+    per_frame = PolyphaseResampler(24000, 16000)
+    rate("polyphase 24k -> 16k, per 20 ms frame", n,
+         lambda: [per_frame.process_pcm16(tts[i * frame_bytes:(i + 1) * frame_bytes]) for i in range(n)])
+
+    batched = PolyphaseResampler(24000, 16000)
+    chunk = frame_bytes * 50                   # 1 s chunks, as TTS delivers them
+    rate("polyphase 24k -> 16k, batched 1 s chunks", n,
+         lambda: [batched.process_pcm16(tts[i * chunk:(i + 1) * chunk]) for i in range(n // 50)])
+
+
+if __name__ == "__main__":
+    main()
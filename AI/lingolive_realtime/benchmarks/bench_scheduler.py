@@ -0,0 +1,90 @@
+"""
+Benchmark: live-voice translation latency during a chat-history backfill
+Simulated translation model (CPU-bound cost per text, one call at a time per
+worker).  Live utterances arrive every `--live-interval-ms` while a
+`--backfill`-message batch translation runs, in two modes:
+  - unscheduled: the batch is one call and all work shares the pool FIFO
+  - scheduled: live = HIGH, batch = LOW in chunks of `--chunk` texts
+Reports live latency (p50 / p95 / max) and backfill completion time.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_scheduler.py [--backfill 500] [--workers 1]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.scheduler import InferenceScheduler, Priority, chunked  # noqa: E402
+
+
+def fake_translate(texts, per_text_s: float, base_s: float):
+    """Batch cost = fixed overhead + per-text cost (busy wait: CPU-bound)."""
+    end = time.perf_counter() + base_s + per_text_s * len(texts)
+    while time.perf_counter() < end:
+        pass
+    return list(texts)
+
+
+def run(mode: str, args) -> tuple:
+    sched = InferenceScheduler(workers=args.workers, max_wait_s={Priority.LOW: 5.0})
+    per_text, base = args.per_text_ms / 1000, args.base_ms / 1000
+    texts = [f"message {i}" for i in range(args.backfill)]
+
+    t0 = time.perf_counter()
+    if mode == "scheduled":
+        backfill = sched.submit_batches(Priority.LOW, lambda c: fake_translate(c, per_text, base), chunked(texts, args.chunk))
+        live_priority = Priority.HIGH
+    else:
+        backfill = sched.submit(Priority.MEDIUM, fake_translate, texts, per_text, base)
+        live_priority = Priority.MEDIUM
+
+    latencies = []
+    lock = threading.Lock()
+
+    def utterance():
+        start = time.perf_counter()
+        sched.submit(live_priority, fake_translate, ["live utterance"], per_text, base).result()
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    threads = []
+    for _ in range(args.live):
+        thread = threading.Thread(target=utterance)
+        thread.start()
+        threads.append(thread)
+        time.sleep(args.live_interval_ms / 1000)
+    for thread in threads:
+        thread.join()
+    backfill.result()
+    backfill_s = time.perf_counter() - t0
+    sched.shutdown()
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    return statistics.median(latencies), p95, latencies[-1], backfill_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backfill", type=int, default=500)
+    parser.add_argument("--chunk", type=int, default=16)
+    parser.add_argument("--live", type=int, default=20, help="live utterances during the backfill")
+    parser.add_argument("--live-interval-ms", type=float, default=150.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--per-text-ms", type=float, default=8.0)
+    parser.add_argument("--base-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(f"{args.backfill}-message backfill + {args.live} live utterances, {args.workers} workers")
+    print(f"{'mode':<14}{'live p50':>10}{'live p95':>10}{'live max':>10}{'backfill':>11}")
+    for mode in ("unscheduled", "scheduled"):
+        p50, p95, worst, backfill_s = run(mode, args)
+        print(f"{mode:<14}{p50 * 1000:>7.0f} ms{p95 * 1000:>7.0f} ms{worst * 1000:>7.0f} ms{backfill_s:>9.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: end-of-utterance latency with and without speculation on partials
+Simulated live-caption session: each utterance is `--clauses` clauses,
+revealed by a partial hypothesis every `--partial-ms`; a clause is stable once
+the next one has started.  The partial path translates every hypothesis
+(`--mt-ms`) as /ws/voice does.  With speculation the stable clauses are also
+synthesized ahead (`--tts-ms` per clause, concurrently), and with probability
+`--revise` ASR changes the tail when finalizing, so the final diverges from
+the last partial.  Reports, per utterance after the final audio message,
+time to first audio and to all audio, and the speculation hit rates.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_speculation.py [--utterances 40] [--revise 0.3]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.speculation import SpeculationStats, Speculator  # noqa: E402
+
+
+async def translate(text: str, args) -> str:
+    await asyncio.sleep(args.mt_ms / 1000)
+    return text.upper()
+
+
+async def synthesize(clause: str, args) -> bytes:
+    await asyncio.sleep(args.tts_ms / 1000)
+    return clause.encode()
+
+
+async def utterance(n: int, speculate: bool, args, rng, mt: Speculator, tts: Speculator) -> tuple:
+    clauses = [f"utterance {n} clause {i}." for i in range(args.clauses)]
+    for shown in range(1, args.clauses + 1):
+        hypothesis = " ".join(clauses[:shown])
+        if speculate:
+            mt.retain([hypothesis])
+            translation = await mt.speculate(hypothesis, lambda h=hypothesis: translate(h, args))
+            stable = translation.split(". ")[: shown - 1]     # every clause but the growing one
+            keys = [c.rstrip(".") + "." for c in stable]
+            tts.retain(keys)
+            for key in keys:
+                tts.speculate(key, lambda key=key: synthesize(key, args))
+        else:
+            await translate(hypothesis, args)
+        await asyncio.sleep(args.partial_ms / 1000)
+
+    if rng.random() < args.revise:
+        clauses[-1] = clauses[-1].replace("clause", "revised")
+    final = " ".join(clauses)
+    start = time.perf_counter()
+    translation = await mt.resolve(final, lambda: translate(final, args))
+    segments = [c.rstrip(".") + "." for c in translation.split(". ")]
+    first_audio = None
+    for done in asyncio.as_completed([tts.resolve(seg, lambda seg=seg: synthesize(seg, args)) for seg in segments]):
+        await done
+        first_audio = first_audio or time.perf_counter() - start
+    total = time.perf_counter() - start
+    mt.settle()
+    tts.settle()
+    return first_audio, total
+
+
+async def run(speculate: bool, args) -> dict:
+    rng = random.Random(0)
+    stats = SpeculationStats()
+    mt, tts = Speculator("translation", stats=stats), Speculator("tts", concurrent=True, stats=stats)
+    first, total = [], []
+    for n in range(args.utterances):
+        f, t = await utterance(n, speculate, args, rng, mt, tts)
+        first.append(f)
+        total.append(t)
+    return {"first": first, "total": total, "stats": stats.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--utterances", type=int, default=40)
+    parser.add_argument("--clauses", type=int, default=3)
+    parser.add_argument("--partial-ms", type=float, default=300.0)
+    parser.add_argument("--mt-ms", type=float, default=80.0)
+    parser.add_argument("--tts-ms", type=float, default=250.0)
+    parser.add_argument("--revise", type=float, default=0.3, help="probability ASR revises the tail at the final")
+    args = parser.parse_args()
+
+    print(f"{args.utterances} utterances x {args.clauses} clauses, MT {args.mt_ms:.0f} ms, "
+          f"TTS {args.tts_ms:.0f} ms / clause, tail revised {args.revise:.0%}")
+    print(f"{'mode':<14}{'first audio':>13}{'all audio':>11}{'MT hits':>10}{'TTS hits':>10}")
+    for label, speculate in (("after final", False), ("speculative", True)):
+        r = asyncio.run(run(speculate, args))
+        hit_rate = {kind: s["hit_rate"] for kind, s in r["stats"].items()}
+        print(f"{label:<14}{statistics.mean(r['first']) * 1000:>10.0f} ms{statistics.mean(r['total']) * 1000:>8.0f} ms"
+              f"{hit_rate.get('translation') or 0:>10.0%}{hit_rate.get('tts') or 0:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: TTS output per utterance, MP3 passthrough vs decode to WAV
+Builds an utterance of `--segments` MP3 segments (what the TTS engines
+return, one per sentence) and reports, for each output format served by
+translation_server: CPU time to produce the payload (incl. base64) and bytes
+on the wire.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/bench_tts_output.py [--segments 3] [--seconds 2.5] [--repeat 50]
+"""
+import argparse
+import base64
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.config import config  # noqa: E402
+from translation_server import _encode_tts_output  # noqa: E402
+
+
+def make_segment(seconds: float, seed: int) -> bytes:
+    """Speech-like test signal (modulated harmonics + noise), MP3-encoded."""
+    sr = config.tts_sample_rate
+    t = np.arange(int(seconds * sr)) / sr
+    rng = np.random.default_rng(seed)
+    f0 = 120 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    voice = sum(np.sin(2 * np.pi * k * np.cumsum(f0) / sr) / k for k in range(1, 6))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3.0 * t) ** 2
+    audio = (0.2 * voice * envelope + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+    buf = io.BytesIO()
+    sf.write(buf, audio, sr, format="MP3")
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=3)
+    parser.add_argument("--seconds", type=float, default=2.5, help="audio per segment")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    parts = [make_segment(args.seconds, i) for i in range(args.segments)]
+    print(f"Utterance: {args.segments} x {args.seconds:.1f}s MP3 segments")
+    print(f"{'format':<8}{'CPU / utterance':>18}{'bytes on wire':>16}")
+    for fmt in ("mp3", "wav"):
+        start = time.process_time()
+        for _ in range(args.repeat):
+            payload = base64.b64encode(_encode_tts_output(parts, fmt))
+        cpu_ms = (time.process_time() - start) / args.repeat * 1000
+        print(f"{fmt:<8}{cpu_ms:>15.2f} ms{len(payload):>16,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Report: RSS and PSS per translation_server worker (Linux)
+Finds the pre-fork master (WORKERS=N python translation_server.py) or takes
+its pid, then prints RSS, PSS, shared and private memory for the master and
+each worker.  With copy-on-write sharing working, a worker's PSS is well
+below its RSS and its private memory (the real cost of one more worker) is
+small next to the model size.
+
+Run (from AI/lingolive_realtime):
+  python benchmarks/worker_memory.py [--pid MASTER_PID] [--pattern translation_server]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prefork import child_pids, process_memory  # noqa: E402
+
+
+def cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace").strip()
+    except OSError:
+        return ""
+
+
+def is_python(pid: int) -> bool:
+    try:
+        return os.path.basename(os.readlink(f"/proc/{pid}/exe")).startswith("python")
+    except OSError:
+        return False
+
+
+def parent_pid(pid: int) -> int:
+    with open(f"/proc/{pid}/stat") as f:
+        return int(f.read().rsplit(")", 1)[1].split()[1])
+
+
+def find_master(pattern: str) -> int:
+    """Oldest Python process matching `pattern` whose parent is not one."""
+    me = os.getpid()
+    matches = {
+        int(p) for p in os.listdir("/proc")
+        if p.isdigit() and int(p) != me and pattern in cmdline(int(p)) and is_python(int(p))
+    }
+    masters = [p for p in matches if parent_pid(p) not in matches]
+    if not masters:
+        raise SystemExit(f"No running process matches {pattern!r}")
+    return min(masters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pid", type=int, help="pre-fork master pid (default: search by --pattern)")
+    parser.add_argument("--pattern", default="translation_server")
+    args = parser.parse_args()
+
+    master = args.pid or find_master(args.pattern)
+    rows = [("master", master)] + [(f"worker {i}", pid) for i, pid in enumerate(child_pids(master))]
+
+    print(f"{'process':<10}{'pid':>8}{'RSS MB':>10}{'PSS MB':>10}{'shared MB':>11}{'private MB':>12}")
+    total_rss = total_pss = 0.0
+    worker_private = []
+    for name, pid in rows:
+        mem = process_memory(pid)
+        shared = mem["shared_clean_mb"] + mem["shared_dirty_mb"]
+        total_rss += mem["rss_mb"]
+        total_pss += mem["pss_mb"]
+        if name != "master":
+            worker_private.append(mem["private_mb"])
+        print(f"{name:<10}{pid:>8}{mem['rss_mb']:>10.1f}{mem['pss_mb']:>10.1f}{shared:>11.1f}{mem['private_mb']:>12.1f}")
+    print(f"{'total':<18}{total_rss:>10.1f}{total_pss:>10.1f}")
+    if worker_private:
+        print(f"Cost of one more worker (mean private): {sum(worker_private) / len(worker_private):.1f} MB "
+              f"(sum of RSS overstates the footprint by {total_rss - total_pss:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,289 @@
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncIterator, Iterator, Optional
+import functools
+import math
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
 
-import av
 import numpy as np
 
-# ── Cached resamplers (avoid recreation per frame) ──────────────────────────
-_resamplers: dict = {}
 
+@functools.lru_cache(maxsize=None)
+def _av():
+    """PyAV, imported on first use; the PCM helpers work without it."""
+    import av  # type: ignore
+    return av
 
-def _get_resampler(target_rate: int = 16000) -> av.AudioResampler:
-    """Return a cached resampler for the given target rate."""
-    if target_rate not in _resamplers:
-        _resamplers[target_rate] = av.AudioResampler(format="s16", layout="mono", rate=target_rate)
-    return _resamplers[target_rate]
 
+# ── PCM ingestion (int16 bytes -> float32 views, no full-size temporaries) ──
+INT16_SCALE = np.float32(1.0 / 32768.0)
 
-def resample_audioframe_to_pcm16_mono(frame: av.AudioFrame, target_rate: int = 16000) -> bytes:
-    """Convert an av.AudioFrame to 16kHz mono signed 16-bit PCM bytes."""
-    resampler = _get_resampler(target_rate)
-    frame16 = resampler.resample(frame)
-    return bytes(frame16.planes[0])
+PCMInput = Union[bytes, bytearray, memoryview, np.ndarray]
 
 
-def split_pcm_into_frames(pcm: bytes, sample_rate: int, frame_ms: int = 20) -> Iterator[bytes]:
-    """Yield fixed-size PCM frames (e.g., 20 ms) from a PCM byte buffer."""
-    bytes_per_sample = 2
-    samples_per_frame = int(sample_rate * (frame_ms / 1000.0))
-    stride = samples_per_frame * bytes_per_sample
-    for i in range(0, len(pcm), stride):
-        chunk = pcm[i : i + stride]
-        if len(chunk) == stride:
-            yield chunk
+def _as_int16(pcm: PCMInput) -> np.ndarray:
+    if isinstance(pcm, np.ndarray):
+        return pcm
+    # Drop a dangling odd byte instead of raising
+    n = len(pcm) // 2
+    return np.frombuffer(pcm, dtype=np.int16, count=n)
+
+
+def pcm16_to_float32(pcm: PCMInput, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convert int16 PCM to float32 in [-1, 1) with a single output allocation
+    (or none, when `out` is given)."""
+    src = _as_int16(pcm)
+    if out is None:
+        out = np.empty(len(src), dtype=np.float32)
+    _convert_into(src, out)
+    return out
+
+
+def _convert_into(src: np.ndarray, out: np.ndarray) -> None:
+    # Cast, then scale in place: a mixed-dtype ufunc would allocate cast buffers
+    np.copyto(out, src, casting="safe")
+    np.multiply(out, INT16_SCALE, out=out)
+
+
+def rms_peak(samples: np.ndarray) -> Tuple[float, float]:
+    """RMS and absolute peak of float32 samples without temporary arrays."""
+    n = len(samples)
+    if n == 0:
+        return 0.0, 0.0
+    rms = math.sqrt(float(np.dot(samples, samples)) / n)
+    peak = max(float(samples.max()), -float(samples.min()))
+    return rms, peak
+
+
+class PCMRingBuffer:
+    """Preallocated per-session float32 buffer for incoming PCM.
+
+    `write()` converts int16 PCM in place into the next free region and
+    returns a view of it, so the ASR entry points never see a fresh array.
+    A view stays valid until the next write that wraps: a chunk that does not
+    fit in the space left restarts at the front of the buffer, which can be
+    long before `capacity_s` seconds of later audio.  Callers consume each
+    view before writing the next chunk.
+    """
+
+    def __init__(self, capacity_s: float = 30.0, sample_rate: int = 16000) -> None:
+        self.sample_rate = sample_rate
+        self._buf = np.zeros(int(capacity_s * sample_rate), dtype=np.float32)
+        self._pos = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def write(self, pcm: PCMInput) -> np.ndarray:
+        src = _as_int16(pcm)
+        n = len(src)
+        if n > len(self._buf):
+            # Oversized chunk: grow once, the larger buffer is kept for reuse
+            self._buf = np.empty(n, dtype=np.float32)
+            self._pos = 0
+        elif self._pos + n > len(self._buf):
+            self._pos = 0
+        view = self._buf[self._pos : self._pos + n]
+        _convert_into(src, view)
+        self._pos += n
+        return view
+
+    def ingest(self, pcm: PCMInput) -> Tuple[np.ndarray, float, float]:
+        """write() plus level metering: returns (samples view, rms, peak)."""
+        view = self.write(pcm)
+        rms, peak = rms_peak(view)
+        return view, rms, peak
+
+
+# ── Resampling ──────────────────────────────────────────────────────────────
+class StreamResampler:
+    """AudioFrame -> mono s16 PCM converter owned by a single stream.
+
+    av.AudioResampler keeps filter state between calls, so every stream needs
+    its own instance (sharing one across sessions or threads corrupts audio).
+    Frames that are already mono s16 at the target rate skip resampling.
+    """
+
+    def __init__(self, target_rate: int = 16000) -> None:
+        self.target_rate = target_rate
+        self._resampler: Optional["av.AudioResampler"] = None
+
+    def to_pcm16_mono(self, frame: "av.AudioFrame") -> bytes:
+        if (
+            frame.sample_rate == self.target_rate
+            and frame.format.name == "s16"
+            and frame.layout.name == "mono"
+        ):
+            # Planes can be padded for alignment; keep only the real samples
+            return memoryview(frame.planes[0])[: frame.samples * 2].tobytes()
+        if self._resampler is None:
+            self._resampler = _av().AudioResampler(format="s16", layout="mono", rate=self.target_rate)
+        out = self._resampler.resample(frame)
+        frames = out if isinstance(out, list) else [out]  # PyAV >= 9 returns a list
+        return b"".join(memoryview(f.planes[0])[: f.samples * 2].tobytes() for f in frames)
+
+
+def resample_audioframe_to_pcm16_mono(
+    frame: "av.AudioFrame",
+    target_rate: int = 16000,
+    resampler: Optional[StreamResampler] = None,
+) -> bytes:
+    """Convert an av.AudioFrame to mono signed 16-bit PCM bytes.
+
+    Pass the stream's own StreamResampler; without one a throwaway resampler
+    is used, which is correct but loses filter continuity between frames.
+    """
+    if resampler is None:
+        resampler = StreamResampler(target_rate)
+    return resampler.to_pcm16_mono(frame)
+
+
+class PolyphaseResampler:
+    """Streaming rational-ratio resampler in NumPy (e.g. 24 kHz TTS -> 16 kHz).
+
+    Windowed-sinc polyphase FIR: only the output samples are computed, a whole
+    chunk at a time, and filter history is carried across calls so chunk
+    boundaries are seamless.  One instance per stream.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, taps_per_phase: int = 24) -> None:
+        g = math.gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        k = taps_per_phase
+        n = k * self.up
+        cutoff = 1.0 / max(self.up, self.down)
+        t = np.arange(n) - (n - 1) / 2.0
+        h = cutoff * np.sinc(cutoff * t) * np.kaiser(n, 8.0)
+        h *= self.up / h.sum()
+        # phases[p] holds taps h[p], h[p+up], ... reversed to line up with input windows
+        self._phases = np.stack([h[p::self.up][:k][::-1] for p in range(self.up)]).astype(np.float32)
+        self._k = k
+        self._hist = np.zeros(k - 1, dtype=np.float32)
+        self._base = -(k - 1)     # input index of _hist[0]
+        self._next_out = 0        # index of the next output sample
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample float32 samples; returns every output sample now computable."""
+        if self.up == self.down:
+            return samples.astype(np.float32, copy=False)
+        if len(samples) == 0:
+            return np.empty(0, dtype=np.float32)      # filter state untouched
+        buf = np.concatenate((self._hist, samples.astype(np.float32, copy=False)))
+        end = self._base + len(buf)                   # one past the newest input index
+        last = ((end - 1) * self.up + self.up - 1) // self.down
+        out_idx = np.arange(self._next_out, last + 1)
+        t = out_idx * self.down
+        newest = t // self.up - self._base            # local index of newest tap
+        windows = np.lib.stride_tricks.sliding_window_view(buf, self._k)
+        y = np.einsum("ij,ij->i", windows[newest - self._k + 1], self._phases[t % self.up])
+
+        self._next_out = last + 1
+        self._hist = buf[len(buf) - (self._k - 1):].copy()
+        self._base = end - (self._k - 1)
+        return y
+
+    def process_pcm16(self, pcm: PCMInput) -> bytes:
+        """int16 PCM in, int16 PCM out."""
+        y = self.process(pcm16_to_float32(pcm))
+        np.clip(y, -1.0, 32767.0 / 32768.0, out=y)
+        return (y * 32768.0).astype(np.int16).tobytes()
+
+
+# ── Framing ─────────────────────────────────────────────────────────────────
+PCMFrame = Union[bytes, memoryview]
+
+
+def _frame_stride(sample_rate: int, frame_ms: int) -> int:
+    return int(sample_rate * (frame_ms / 1000.0)) * 2
+
+
+def split_pcm_into_frames(pcm: PCMInput, sample_rate: int, frame_ms: int = 20) -> Iterator[memoryview]:
+    """Yield fixed-size PCM frames (e.g., 20 ms) as zero-copy views of `pcm`.
+
+    A trailing partial frame is dropped; use PCMFramer to carry it over.
+    """
+    stride = _frame_stride(sample_rate, frame_ms)
+    view = memoryview(pcm).cast("B")
+    for i in range(0, len(view) - stride + 1, stride):
+        yield view[i : i + stride]
+
+
+class PCMFramer:
+    """Cuts a stream of arbitrarily sized PCM chunks into fixed-size frames.
+
+    The partial frame at the end of one chunk is carried into the next
+    instead of being dropped.  Whole frames are memoryview slices of the
+    caller's chunk (no copy), so chunks must not be mutated afterwards;
+    only the frame straddling two chunks is assembled into new bytes.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20) -> None:
+        self.stride = _frame_stride(sample_rate, frame_ms)
+        self._rest = bytearray()
+
+    @property
+    def pending(self) -> int:
+        """Bytes carried over, waiting for the rest of their frame."""
+        return len(self._rest)
+
+    def feed(self, pcm: PCMInput) -> List[PCMFrame]:
+        view = memoryview(pcm).cast("B")
+        frames: List[PCMFrame] = []
+        pos = 0
+        if self._rest:
+            pos = min(self.stride - len(self._rest), len(view))
+            self._rest += view[:pos]
+            if len(self._rest) < self.stride:
+                return frames
+            frames.append(bytes(self._rest))
+            self._rest.clear()
+        end = pos + (len(view) - pos) // self.stride * self.stride
+        frames.extend(view[i : i + self.stride] for i in range(pos, end, self.stride))
+        self._rest += view[end:]
+        return frames
+
+    def flush(self) -> Optional[bytes]:
+        """End of stream: the carried partial frame, zero-padded, or None."""
+        if not self._rest:
+            return None
+        frame = bytes(self._rest) + bytes(self.stride - len(self._rest))
+        self._rest.clear()
+        return frame
+
+    def reset(self) -> None:
+        self._rest.clear()
+
+
+def _new_s16_frame(samples: int, sample_rate: int) -> "av.AudioFrame":
+    frame = _av().AudioFrame(format="s16", layout="mono", samples=samples)
+    frame.sample_rate = sample_rate
+    return frame
+
+
+class AudioFramePool:
+    """Small ring of reusable mono s16 av.AudioFrame objects.
+
+    A frame handed out by acquire() is overwritten `size` calls later, which
+    is safe for a paced track whose consumer (the RTP encoder) finishes with
+    each frame before asking for the next.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, size: int = 4) -> None:
+        self.sample_rate = sample_rate
+        self.samples_per_frame = int(sample_rate * (frame_ms / 1000.0))
+        self._frames = [_new_s16_frame(self.samples_per_frame, sample_rate) for _ in range(max(2, size))]
+        self._next = 0
+
+    def acquire(self, pcm: PCMFrame) -> "av.AudioFrame":
+        """Next pooled frame, filled with `pcm` (exactly one frame of bytes)."""
+        frame = self._frames[self._next]
+        self._next = (self._next + 1) % len(self._frames)
+        frame.planes[0].update(pcm)
+        return frame
 
 
 async def chunker(iterable: AsyncIterator[bytes], chunk_size: int = 3200) -> AsyncIterator[bytes]:
@@ -48,20 +299,29 @@ async def chunker(iterable: AsyncIterator[bytes], chunk_size: int = 3200) -> Asy
         yield bytes(buf)
 
 
-def pcm16_bytes_to_audioframes(pcm: bytes, sample_rate: int = 16000, frame_ms: int = 20) -> Iterator[av.AudioFrame]:
-    """Pack raw PCM bytes into av.AudioFrame objects of frame_ms duration."""
-    bytes_per_sample = 2
+def pcm16_bytes_to_audioframes(
+    pcm: PCMInput,
+    sample_rate: int = 16000,
+    frame_ms: int = 20,
+    framer: Optional[PCMFramer] = None,
+    pool: Optional[AudioFramePool] = None,
+) -> Iterator["av.AudioFrame"]:
+    """Pack raw PCM bytes into av.AudioFrame objects of frame_ms duration.
+
+    Pass a per-stream `framer` to carry a trailing partial frame into the next
+    call (without one it is dropped), and a `pool` to reuse frame objects;
+    pooled frames are only valid until the pool wraps around.
+    """
+    if framer is None:
+        chunks: Iterator[PCMFrame] = split_pcm_into_frames(pcm, sample_rate, frame_ms)
+    else:
+        chunks = iter(framer.feed(pcm))
+    if pool is not None:
+        for chunk in chunks:
+            yield pool.acquire(chunk)
+        return
     samples_per_frame = int(sample_rate * (frame_ms / 1000.0))
-    stride = samples_per_frame * bytes_per_sample
-
-    for i in range(0, len(pcm), stride):
-        chunk = pcm[i : i + stride]
-        if len(chunk) < stride:
-            break
-        # Create numpy view and then av.AudioFrame
-        arr = np.frombuffer(chunk, dtype=np.int16)
-        # Create frame with mono layout
-        frame = av.AudioFrame(format="s16", layout="mono", samples=samples_per_frame)
+    for chunk in chunks:
+        frame = _new_s16_frame(samples_per_frame, sample_rate)
         frame.planes[0].update(chunk)
-        frame.sample_rate = sample_rate
         yield frame
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import fractions
+import time
 from typing import AsyncIterator, Optional
 
 import av
@@ -8,39 +10,97 @@ from aiortc import MediaStreamTrack
 from loguru import logger
 
 from .audio_utils import (
-    pcm16_bytes_to_audioframes,
-    resample_audioframe_to_pcm16_mono,
+    AudioFramePool,
+    PCMFramer,
+    PolyphaseResampler,
+    StreamResampler,
     split_pcm_into_frames,
 )
+from .playout import PlayoutBuffer
+from ..ai.admission import AdmissionController, SheddingQueue
 from ..ai.vad import VAD
 from ..ai.stt import STTEngine
 from ..ai.translate import Translator
 from ..ai.tts import TTS
 
+_MAX_LAG_S = 0.5   # recv() further behind than this resyncs its clock
+
 
 class TranslatedAudioTrack(MediaStreamTrack):
+    """Outgoing translated audio, paced in real time.
+
+    recv() hands out one 20 ms frame per tick of a monotonic clock, with
+    monotonically increasing pts (time_base = 1/sample_rate).  TTS bursts are
+    absorbed by a PlayoutBuffer; when it runs dry, comfort silence is sent
+    instead of blocking the RTP sender.
+    """
+
     kind = "audio"
 
-    def __init__(self) -> None:
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, max_depth_ms: int = 3000) -> None:
         super().__init__()
-        self.queue: asyncio.Queue[av.AudioFrame] = asyncio.Queue(maxsize=100)
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.samples_per_frame = sample_rate * frame_ms // 1000
+        self.buffer = PlayoutBuffer(frame_ms=frame_ms, max_depth_ms=max_depth_ms)
+        self._framer = PCMFramer(sample_rate, frame_ms)
+        self._pool = AudioFramePool(sample_rate, frame_ms)
+        self._silence = bytes(self.samples_per_frame * 2)
+        self._time_base = fractions.Fraction(1, sample_rate)
+        self._start: Optional[float] = None
+        self._pts = 0
         self._started = asyncio.Event()
+        # One stateful resampler per input rate (e.g. 24 kHz TTS), owned by this track
+        self._resamplers: dict[int, PolyphaseResampler] = {}
 
     async def recv(self) -> av.AudioFrame:
         self._started.set()
-        frame = await self.queue.get()
+        if self._start is None:
+            self._start = time.monotonic()
+        else:
+            self._pts += self.samples_per_frame
+            wait = self._start + self._pts / self.sample_rate - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elif wait < -_MAX_LAG_S:
+                # Consumer stalled (e.g. event-loop hiccup): resync instead of bursting
+                self._start = time.monotonic() - self._pts / self.sample_rate
+
+        pcm = self.buffer.pop()
+        frame = self._pool.acquire(self._silence if pcm is None else pcm)
+        frame.pts = self._pts
+        frame.time_base = self._time_base
         return frame
 
     async def wait_started(self) -> None:
         await self._started.wait()
 
-    async def push_pcm(self, pcm: bytes, sample_rate: int = 16000) -> None:
-        for frame in pcm16_bytes_to_audioframes(pcm, sample_rate=sample_rate, frame_ms=20):
-            try:
-                self.queue.put_nowait(frame)
-            except asyncio.QueueFull:
-                # Drop frames to keep latency bounded
-                logger.warning("Output queue full; dropping TTS frame.")
+    async def push_pcm(self, pcm: bytes, sample_rate: int = 16000, new_utterance: bool = False) -> None:
+        if sample_rate != self.sample_rate:
+            resampler = self._resamplers.get(sample_rate)
+            if resampler is None:
+                resampler = self._resamplers[sample_rate] = PolyphaseResampler(sample_rate, self.sample_rate)
+            pcm = resampler.process_pcm16(pcm)
+        if new_utterance:
+            self._flush_utterance()
+        overruns = self.buffer.overruns
+        self.buffer.extend(self._framer.feed(pcm), new_utterance=new_utterance)
+        if self.buffer.overruns > overruns:
+            logger.warning(f"Playout buffer full; dropped {self.buffer.overruns - overruns} queued utterance(s).")
+
+    async def end_utterance(self) -> None:
+        """Mark the end of a TTS utterance: its trailing partial frame is
+        padded with silence and queued instead of leaking into the next one."""
+        self._flush_utterance()
+
+    def _flush_utterance(self) -> None:
+        tail = self._framer.flush()
+        if tail is not None:
+            self.buffer.push(tail)
+
+    def stats(self) -> dict:
+        """Buffer depth and underrun/overrun counters."""
+        return self.buffer.stats()
 
 
 class TranslationPipeline:
@@ -51,6 +111,7 @@ class TranslationPipeline:
         source_lang: str = "en",
         target_lang: str = "es",
         tts_voice: str = "en-US-AriaNeural",
+        admission: Optional[AdmissionController] = None,
     ) -> None:
         self.source_lang = source_lang
         self.target_lang = target_lang
@@ -60,11 +121,14 @@ class TranslationPipeline:
         self.tts = TTS(voice=tts_voice)
 
         self.out_track = TranslatedAudioTrack()
+        self._in_resampler = StreamResampler(target_rate=16000)  # per-stream filter state
 
-        # Queues between stages — smaller queues = bounded latency
+        # Queues between stages — smaller queues = bounded latency.  The queues
+        # in front of STT and translation drop stale items oldest first while
+        # admission control reports overload.
         self._pcm_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=100)
-        self._voiced_chunk_q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=20)
-        self._text_q: asyncio.Queue[str] = asyncio.Queue(maxsize=10)
+        self._voiced_chunk_q: SheddingQueue[bytes] = SheddingQueue(20, admission)
+        self._text_q: SheddingQueue[str] = SheddingQueue(10, admission)
         self._translated_q: asyncio.Queue[str] = asyncio.Queue(maxsize=10)
 
         # Task handles for graceful shutdown
@@ -88,7 +152,7 @@ class TranslationPipeline:
     async def on_audio_frame(self, frame: av.AudioFrame) -> None:
         if self._closing.is_set():
             return
-        pcm = resample_audioframe_to_pcm16_mono(frame, target_rate=16000)
+        pcm = self._in_resampler.to_pcm16_mono(frame)
         try:
             self._pcm_q.put_nowait(pcm)
         except asyncio.QueueFull:
@@ -102,10 +166,8 @@ class TranslationPipeline:
                     # VAD gating and chunking
                     for chunk, end_of_utt in self.vad.collect_voiced_chunks([f]):
                         # Emit small voiced chunk as soon as it accumulates
-                        try:
-                            self._voiced_chunk_q.put_nowait(chunk)
-                        except asyncio.QueueFull:
-                            logger.warning("Chunk queue full; dropping voiced chunk.")
+                        if not self._voiced_chunk_q.put_nowait(chunk):
+                            logger.warning("Chunk queue full; dropped oldest voiced chunk.")
                 await asyncio.sleep(0)
         except asyncio.CancelledError:
             pass
@@ -119,10 +181,8 @@ class TranslationPipeline:
         try:
             async for text in self.stt.transcribe_chunks(chunk_iter(), source_lang=self.source_lang):
                 if text:
-                    try:
-                        self._text_q.put_nowait(text)
-                    except asyncio.QueueFull:
-                        logger.warning("Text queue full; dropping STT text.")
+                    if not self._text_q.put_nowait(text):
+                        logger.warning("Text queue full; dropped oldest STT text.")
                 await asyncio.sleep(0)
         except asyncio.CancelledError:
             pass
@@ -145,8 +205,11 @@ class TranslationPipeline:
         try:
             while not self._closing.is_set():
                 text = await self._translated_q.get()
+                first = True
                 async for pcm in self.tts.synthesize(text):
-                    await self.out_track.push_pcm(pcm, sample_rate=16000)
+                    await self.out_track.push_pcm(pcm, sample_rate=16000, new_utterance=first)
+                    first = False
+                await self.out_track.end_utterance()
                 await asyncio.sleep(0)
         except asyncio.CancelledError:
             pass
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import collections
+from typing import Deque, Dict, Iterable, Optional
+
+
+class PlayoutBuffer:
+    """Real-time playout queue of fixed-size PCM frames, grouped by utterance.
+
+    - Producers push frames as fast as TTS delivers them; the consumer pops one
+      frame per tick (see TranslatedAudioTrack.recv, which owns the clock).
+    - Overflow never drops random frames: queued utterances that have not
+      started playing are dropped whole (oldest first).  If the utterance being
+      played is itself too long, it is time-compressed by skipping one frame
+      in every `compress_every`.
+    - Underrun means the buffer ran dry while audio was playing; the caller
+      fills the gap with comfort silence.
+    """
+
+    def __init__(self, frame_ms: int = 20, max_depth_ms: int = 3000, compress_every: int = 4) -> None:
+        self.frame_ms = frame_ms
+        self.max_frames = max(1, max_depth_ms // frame_ms)
+        self.compress_every = compress_every
+        self._utterances: Deque[Deque[bytes]] = collections.deque()
+        self._depth = 0
+        self._playing = False          # consumer is inside an utterance
+        self._since_skip = 0
+        self.underruns = 0
+        self.overruns = 0              # utterances dropped whole
+        self.compressed_frames = 0     # frames skipped by time compression
+        self.silence_frames = 0
+        self.frames_played = 0
+
+    @property
+    def depth_frames(self) -> int:
+        return self._depth
+
+    @property
+    def depth_ms(self) -> int:
+        return self._depth * self.frame_ms
+
+    def push(self, frame: bytes, new_utterance: bool = False) -> None:
+        if new_utterance or not self._utterances:
+            self._utterances.append(collections.deque())
+        self._utterances[-1].append(frame)
+        self._depth += 1
+        if self._depth > self.max_frames:
+            self._shed()
+
+    def extend(self, frames: Iterable[bytes], new_utterance: bool = False) -> None:
+        """push() for a batch of frames, with a single overflow check."""
+        if new_utterance or not self._utterances:
+            self._utterances.append(collections.deque())
+        current = self._utterances[-1]
+        before = len(current)
+        current.extend(frames)
+        self._depth += len(current) - before
+        if self._depth > self.max_frames:
+            self._shed()
+
+    def pop(self) -> Optional[bytes]:
+        """Next frame to play, or None when empty (caller plays silence)."""
+        while self._utterances and not self._utterances[0]:
+            self._utterances.popleft()
+        if not self._utterances:
+            if self._playing:
+                self.underruns += 1
+                self._playing = False
+            self.silence_frames += 1
+            return None
+
+        current = self._utterances[0]
+        if self._depth > self.max_frames and len(current) > 1:
+            self._since_skip += 1
+            if self._since_skip >= self.compress_every:
+                current.popleft()
+                self._depth -= 1
+                self.compressed_frames += 1
+                self._since_skip = 0
+        frame = current.popleft()
+        self._depth -= 1
+        self._playing = True
+        self.frames_played += 1
+        return frame
+
+    def clear(self) -> None:
+        self._utterances.clear()
+        self._depth = 0
+        self._playing = False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "depth_ms": self.depth_ms,
+            "underruns": self.underruns,
+            "overruns": self.overruns,
+            "compressed_frames": self.compressed_frames,
+            "silence_frames": self.silence_frames,
+            "frames_played": self.frames_played,
+        }
+
+    def _shed(self) -> None:
+        # Drop whole utterances that have not started playing, oldest first.
+        # Index 0 is the one being played (if any) and is kept.
+        start = 1 if self._playing else 0
+        while self._depth > self.max_frames and len(self._utterances) > start + 1:
+            dropped = self._utterances[start]
+            del self._utterances[start]
+            self._depth -= len(dropped)
+            self.overruns += 1
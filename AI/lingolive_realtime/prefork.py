@@ -0,0 +1,186 @@
+"""
+Pre-fork multi-worker serving with copy-on-write model sharing (Linux/macOS).
+
+`uvicorn --workers N` spawns fresh interpreters, so every worker loads its own
+copy of every model.  serve_prefork() instead loads the models once in the
+master, binds the listening socket, and then forks N uvicorn workers that
+accept on the shared socket.  The model weights are never written after
+loading, so their pages stay shared between the master and all workers;
+an extra worker costs its interpreter and request state, not another set of
+models.
+
+Notes:
+  - gc.freeze() moves everything loaded before the fork out of the collector's
+    reach, so garbage collection in the workers does not touch (and copy) the
+    pages holding those objects.
+  - No inference runs in the master: thread pools (OpenMP, CTranslate2) do not
+    survive fork.  This is also why faster-whisper (CTranslate2) models are
+    loaded by each worker after the fork; only MarianMT weights are shared.
+  - Workers that exit unexpectedly are re-forked from the master, which still
+    holds the preloaded models.
+
+Use process_memory() / benchmarks/worker_memory.py to check RSS vs PSS.
+"""
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies sooner than this after being forked is restarted with a
+# delay, so a worker that crashes at startup cannot fork-bomb the host.
+_MIN_WORKER_LIFETIME_S = 1.0
+
+
+def serve_prefork(
+    app,
+    host: str = "0.0.0.0",
+    port: int = 5001,
+    workers: int = 2,
+    preload: Optional[Callable[[], None]] = None,
+    log_level: str = "info",
+    backlog: int = 2048,
+) -> None:
+    """
+    Load models via `preload`, then serve `app` from `workers` forked processes.
+
+    Args:
+        app: ASGI application (the same object in every worker)
+        host / port: Address to bind once in the master
+        workers: Number of worker processes
+        preload: Called in the master before forking; load models here
+            without running inference
+        log_level: uvicorn log level for the workers
+        backlog: listen() backlog of the shared socket
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Pre-fork serving needs os.fork (Linux/macOS); use uvicorn --workers instead")
+    import uvicorn
+
+    if preload is not None:
+        t0 = time.time()
+        preload()
+        logger.info(f"Preloaded shared models in {time.time() - t0:.1f}s")
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+
+    children: Dict[int, tuple] = {}   # pid -> (worker index, fork time)
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                _init_worker(workers)
+                server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+                server.run(sockets=[sock])
+            except BaseException:
+                logger.exception(f"Worker {index} crashed")
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        children[pid] = (index, time.monotonic())
+        logger.info(f"Worker {index} started (pid {pid})")
+
+    def stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info(f"Master {os.getpid()} serving on {host}:{port} with {workers} pre-forked workers")
+    for index in range(workers):
+        spawn(index)
+
+    try:
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            index, started = children.pop(pid, (None, 0.0))
+            if index is None or stopping:
+                continue
+            logger.warning(f"Worker {index} (pid {pid}) exited with status {status}; restarting")
+            if time.monotonic() - started < _MIN_WORKER_LIFETIME_S:
+                time.sleep(_MIN_WORKER_LIFETIME_S)
+            if not stopping:
+                spawn(index)
+    finally:
+        sock.close()
+        logger.info("All workers stopped")
+
+
+def _init_worker(workers: int) -> None:
+    """Per-worker setup after fork: split the cores between the workers so N
+    torch thread pools do not oversubscribe the CPU (see thread_budget())."""
+    from ai.translation_module import apply_thread_budget
+    slots, threads = apply_thread_budget(processes=workers)
+    logger.debug(f"Worker {os.getpid()}: {slots} concurrent MarianMT call(s) x {threads} torch thread(s)")
+
+
+# ── Memory accounting ───────────────────────────────────────────────────────
+
+_SMAPS_FIELDS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "shared_clean_mb",
+    "Shared_Dirty": "shared_dirty_mb",
+    "Private_Clean": "private_clean_mb",
+    "Private_Dirty": "private_dirty_mb",
+}
+
+
+def process_memory(pid: int) -> Dict[str, float]:
+    """
+    RSS / PSS breakdown of a process from /proc/<pid>/smaps_rollup (Linux).
+
+    PSS charges each shared page 1/N to each of the N processes mapping it, so
+    the PSS of all workers sums to their real footprint; RSS counts shared
+    pages in full for every process.
+
+    Returns:
+        {"rss_mb", "pss_mb", "shared_clean_mb", "shared_dirty_mb",
+         "private_clean_mb", "private_dirty_mb", "private_mb"}
+    """
+    usage = {name: 0.0 for name in _SMAPS_FIELDS.values()}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in _SMAPS_FIELDS:
+                usage[_SMAPS_FIELDS[key]] = int(rest.split()[0]) / 1024
+    usage["private_mb"] = usage["private_clean_mb"] + usage["private_dirty_mb"]
+    return usage
+
+
+def child_pids(pid: int) -> list:
+    """Direct children of `pid` (Linux)."""
+    children = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        try:
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(p) for p in f.read().split())
+        except FileNotFoundError:
+            continue
+    return sorted(children)
@@ -244,6 +244,1382 @@ def test_batch_translation():
         return False
 
 
+# ── Test 9: Incremental Translation ───────────────────────────────────────
+def test_incremental_translation():
+    section("Test 9: Incremental Translation (partial transcripts)")
+    try:
+        from ai import TranslationModule
+        t = TranslationModule()
+
+        calls = []
+
+        def fake_batch(texts, src, tgt, max_length=128):
+            calls.extend(texts)
+            return [f"<{x}>" for x in texts]
+
+        t._translate_batch = fake_batch
+        try:
+            for hyp in ["good morning", "good morning, how", "good morning, how are you"]:
+                r = t.translate_incremental("test", hyp, "english", "hindi", translate_tail=False)
+                print(f"  {hyp!r:32s} -> stable={r['stable_text']!r}")
+            final = t.translate_incremental("test", "good morning, how are you today", "english", "hindi", is_final=True)
+            print(f"  Final: {final['text']!r}")
+        finally:
+            del t._translate_batch
+
+        assert calls == ["good morning,", "how are you today"], f"Prefix re-translated: {calls}"
+        assert final["is_stable"] and not t.has_session("test")
+        ok("Incremental translation reuses committed prefix")
+        return True
+    except Exception as e:
+        fail(f"Incremental translation error: {e}")
+        logger.exception(e)
+        return False
+
+
+# ── Test 10: Google Translate fallback (local stub server) ────────────────
+def test_google_fallback():
+    section("Test 10: Google Translate Fallback (local stub)")
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+
+    requests_seen = []
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+            q = parse_qs(body)["q"][0]
+            requests_seen.append(parse_qs(urlparse(self.path).query)["tl"][0])
+            payload = json.dumps([[[q.upper(), q, None, None]], None, "hi"]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        from ai.google_translate import SyncGoogleTranslator
+        client = SyncGoogleTranslator(base_url=f"http://127.0.0.1:{server.server_port}", max_batch_chars=40)
+        texts = [f"message {i}" for i in range(50)]
+        start = time.time()
+        results = client.translate_batch(texts, "hi", "ta")
+        elapsed = time.time() - start
+        client.close()
+        print(f"  {len(texts)} texts in {len(requests_seen)} requests ({elapsed*1000:.0f}ms)")
+        assert results == [t.upper() for t in texts], "Results out of order"
+        assert len(requests_seen) < len(texts), "Texts should be packed into fewer requests"
+        ok("Google fallback batches and pools requests")
+        return True
+    except Exception as e:
+        fail(f"Google fallback error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        server.shutdown()
+
+
+# ── Test 11: Pivot cache fan-out ──────────────────────────────────────────
+def test_pivot_fanout():
+    section("Test 11: Pivot Translation Cache (hi -> ta/te/kn)")
+    try:
+        from ai import TranslationModule
+        t = TranslationModule()
+
+        legs = []
+
+        def fake_marian(texts, key, max_length=128):
+            legs.append(key)
+            return [f"[{key}] {x}" for x in texts]
+
+        t._marian_translate = fake_marian
+        try:
+            out = t.translate_multi(["namaste", "dhanyavaad"], "hindi", ["tamil", "telugu", "kannada"])
+        finally:
+            del t._marian_translate
+        stats = t.get_model_info()["pivot_cache"]
+        print(f"  Model calls : {legs}")
+        print(f"  Pivot stats : {stats}")
+
+        assert legs.count("hi->en") == 1, "src->en leg should run once for all targets"
+        assert set(out) == {"tamil", "telugu", "kannada"}
+        assert stats["to_en_hit_rate"] > 0
+        ok("Pivot fan-out shares the English intermediate")
+        return True
+    except Exception as e:
+        fail(f"Pivot fan-out error: {e}")
+        logger.exception(e)
+        return False
+
+
+# ── Test 12: Language detection for source_lang="auto" ────────────────────
+def test_langid():
+    section("Test 12: Script-based Language Detection")
+    try:
+        from ai.langid import detect_language
+        cases = {
+            "Hello, how are you?": "en",
+            "नमस्ते, आप कैसे हैं?": "hi",
+            "मी ठीक आहे आणि तुम्ही?": "mr",
+            "আমি ভালো আছি": "bn",
+            "வணக்கம்": "ta",
+            "నమస్కారం": "te",
+            "ਸਤ ਸ੍ਰੀ ਅਕਾਲ": "pa",
+            "آپ کیسے ہیں؟": "ur",
+        }
+        for text, expected in cases.items():
+            got = detect_language(text)
+            print(f"  {expected} <- {got}  {text}")
+            assert got == expected, f"{text!r}: expected {expected}, got {got}"
+        ok("Language detection routes by script")
+        return True
+    except Exception as e:
+        fail(f"Language detection error: {e}")
+        logger.exception(e)
+        return False
+
+
+# ── Test 13: Silence trimming before ASR ──────────────────────────────────
+def test_silence_trimming():
+    section("Test 13: Silence Trimming (energy + webrtcvad)")
+    try:
+        from ai.vad import trim_silence
+        sr = 16000
+        rng = np.random.default_rng(0)
+        t = np.arange(int(0.8 * sr)) / sr
+        speech = (rng.standard_normal(len(t)) * 0.2 * np.abs(np.sin(2 * np.pi * 4 * t))).astype(np.float32)
+        silence = lambda sec: (rng.standard_normal(int(sec * sr)) * 0.001).astype(np.float32)
+        audio = np.concatenate([silence(1.0), speech, silence(1.5), speech, silence(1.0)])
+
+        trimmed, fraction, regions = trim_silence(audio, sample_rate=sr)
+        print(f"  Input    : {len(audio)/sr:.2f}s")
+        print(f"  Output   : {len(trimmed)/sr:.2f}s  ({fraction:.0%} trimmed, {len(regions)} regions)")
+
+        assert len(regions) == 2, "Internal pause should split speech"
+        assert 0.4 < fraction < 0.8, "Edge silence and long pause should be cut"
+        empty, fraction, _ = trim_silence(silence(1.0), sample_rate=sr)
+        assert len(empty) == 0 and fraction == 1.0, "Pure silence should be dropped"
+        ok("Silence trimming works")
+        return True
+    except Exception as e:
+        fail(f"Silence trimming error: {e}")
+        logger.exception(e)
+        return False
+
+
+# ── Test 14: Streaming resampler (24 kHz TTS -> 16 kHz track) ──────────────
+def test_resampler():
+    section("Test 14: Polyphase Resampler 24k -> 16k")
+    try:
+        from media.audio_utils import PolyphaseResampler
+        t = np.arange(24000) / 24000
+        tone = np.sin(2 * np.pi * 440 * t).astype(np.float32)
+
+        whole = PolyphaseResampler(24000, 16000).process(tone)
+        streamed = PolyphaseResampler(24000, 16000)
+        chunks = np.concatenate([streamed.process(tone[i : i + 480]) for i in range(0, len(tone), 480)])
+        print(f"  Output samples : {len(whole)} (one shot) / {len(chunks)} (20 ms chunks)")
+
+        assert len(whole) == 16000 and len(chunks) == 16000
+        assert np.allclose(whole, chunks, atol=1e-5), "Chunk boundaries must be seamless"
+
+        # Empty chunks (sent by streaming callers) are a no-op
+        gappy = PolyphaseResampler(24000, 16000)
+        parts = []
+        for i in range(0, len(tone), 480):
+            assert len(gappy.process(np.zeros(0, dtype=np.float32))) == 0
+            parts.append(gappy.process(tone[i : i + 480]))
+        assert np.array_equal(np.concatenate(parts), chunks), "Empty chunks must not disturb the stream"
+        ok("Resampler is continuous across chunks")
+        return True
+    except Exception as e:
+        fail(f"Resampler error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_playout_buffer():
+    section("Test 15: Playout Buffer (underrun / overflow)")
+    try:
+        from media.playout import PlayoutBuffer
+        buf = PlayoutBuffer(frame_ms=20, max_depth_ms=200)   # 10 frames
+        frame = bytes(640)
+
+        for _ in range(3):
+            buf.push(frame, new_utterance=False)
+        played = [buf.pop() for _ in range(4)]
+        assert played[-1] is None and buf.underruns == 1, "Running dry mid-playout is one underrun"
+
+        # Three 4-frame utterances into a 10-frame buffer: the oldest is dropped whole
+        for _ in range(3):
+            for i in range(4):
+                buf.push(frame, new_utterance=(i == 0))
+        stats = buf.stats()
+        print(f"  Stats: {stats}")
+        assert stats["overruns"] == 1 and stats["depth_ms"] == 160
+        ok("Overflow sheds whole utterances, underruns counted")
+        return True
+    except Exception as e:
+        fail(f"Playout buffer error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_pcm_framing():
+    section("Test 16: PCM Framing (remainder carry + frame pool)")
+    try:
+        from media.audio_utils import AudioFramePool, PCMFramer, pcm16_bytes_to_audioframes
+        pcm = np.arange(16000, dtype=np.int16).tobytes()       # 1 s = 50 frames of 640 bytes
+        framer = PCMFramer(16000, 20)
+        frames = []
+        for i in range(0, len(pcm), 1000):                     # TTS-sized chunks, not frame aligned
+            frames.extend(framer.feed(pcm[i : i + 1000]))
+        print(f"  Frames: {len(frames)}, carried bytes: {framer.pending}")
+        assert len(frames) == 50 and framer.pending == 0
+        assert b"".join(bytes(f) for f in frames) == pcm, "Frames must reassemble the input exactly"
+
+        framer.feed(pcm[:1000])
+        tail = framer.flush()
+        assert tail is not None and len(tail) == 640 and tail[360:] == bytes(280), "Tail is zero-padded"
+
+        pool = AudioFramePool(16000, 20, size=2)
+        out = [f for f in pcm16_bytes_to_audioframes(pcm[:3200], pool=pool)]
+        assert len(out) == 5 and len({id(f) for f in out}) == 2, "Pool must recycle frame objects"
+        ok("No partial frames lost; frame objects reused")
+        return True
+    except Exception as e:
+        fail(f"PCM framing error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_tts_segmentation():
+    section("Test 17: Pipelined TTS (sentence split + ordered parallel synthesis)")
+    try:
+        import asyncio
+        from ai.tts_pipeline import complete_segments, crossfade_join, split_for_tts, stream_segments
+
+        text = "नमस्ते, आप कैसे हैं? मैं ठीक हूँ। आज मौसम बहुत अच्छा है और हम बाहर जा रहे हैं।"
+        segments = split_for_tts(text, min_chars=10)
+        print(f"  Segments: {segments}")
+        assert len(segments) == 3 and segments[1] == "मैं ठीक हूँ।", "Danda and ? must end sentences"
+        assert split_for_tts("Dr. Rao is here. Yes. Okay then, see you.", min_chars=8)[0] == "Dr. Rao is here."
+
+        # Fake engine: later segments finish first; output must still be in order
+        active, peak = 0, 0
+
+        async def fake_engine(seg):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02 * (5 - len(seg) % 5))
+            active -= 1
+            yield seg.encode()
+
+        async def run():
+            return [i async for i, _ in stream_segments([f"s{i}" for i in range(6)], fake_engine, max_parallel=2)]
+
+        order = asyncio.run(run())
+        assert order == list(range(6)) and peak <= 2, f"order={order} peak={peak}"
+
+        # Segments that produce no audio still get their (index, b"") entry
+        async def sparse_engine(seg):
+            if seg in ("s1", "s3", "s4"):
+                yield seg.encode()
+
+        async def run_complete():
+            return [(i, d) async for i, d in complete_segments([f"s{i}" for i in range(6)], sparse_engine)]
+
+        assert asyncio.run(run_complete()) == [(0, b""), (1, b"s1"), (2, b""), (3, b"s3"), (4, b"s4"), (5, b"")]
+
+        joined = crossfade_join([np.ones(2400, np.float32)] * 3, 24000, crossfade_ms=10)
+        assert len(joined) == 3 * 2400 - 2 * 240 and np.allclose(joined, 1.0, atol=1e-6)
+        ok("Segments split at Indic punctuation, synthesized <=2 at a time, delivered in order")
+        return True
+    except Exception as e:
+        fail(f"Pipelined TTS error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_tts_hedging():
+    section("Test 18: Hedged TTS (fake engines)")
+    try:
+        import asyncio
+        from ai.tts_hedge import HedgedTTS
+
+        def engine(delay, fail=False):
+            async def run(text, language):
+                await asyncio.sleep(delay)
+                if fail:
+                    raise RuntimeError("boom")
+                return f"{delay}".encode()
+            return run
+
+        slow_primary = HedgedTTS([("slow", engine(1.0)), ("fast", engine(0.02))],
+                                 default_deadline_s=0.1, min_deadline_s=0.01, min_samples=5)
+        broken_primary = HedgedTTS([("broken", engine(0.0, fail=True)), ("fast", engine(0.02))],
+                                   default_deadline_s=0.5)
+        healthy = HedgedTTS([("fast", engine(0.02)), ("slow", engine(1.0))],
+                            default_deadline_s=0.5, min_deadline_s=0.01, min_samples=5)
+
+        async def run():
+            r1 = await slow_primary.synthesize("hi")
+            r2 = await broken_primary.synthesize("hi")
+            for _ in range(5):
+                r3 = await healthy.synthesize("hi")
+            return r1, r2, r3
+
+        r1, r2, r3 = asyncio.run(run())
+        print(f"  slow primary  : {r1.engine} in {r1.latency_s*1000:.0f} ms (hedged={r1.hedged})")
+        print(f"  broken primary: {r2.engine} in {r2.latency_s*1000:.0f} ms")
+        print(f"  healthy       : {r3.engine}, learned deadline {healthy.deadline('fast')*1000:.0f} ms")
+        assert r1.engine == "fast" and r1.hedged and r1.latency_s < 0.5
+        assert slow_primary.stats()["engines"]["slow"]["cancelled"] == 1, "Loser must be cancelled"
+        assert r2.engine == "fast" and r2.latency_s < 0.3, "Failure should fail over without waiting"
+        assert r3.engine == "fast" and not r3.hedged and healthy.deadline("fast") < 0.1
+
+        # ElevenLabs (paid) joins the default chain only with an explicit key
+        from unittest import mock
+        from ai.tts_module import TTSModule
+        module = object.__new__(TTSModule)
+        module.engine = "edge-tts"
+        with mock.patch.dict(os.environ, {"ELEVENLABS_API_KEY": ""}):
+            assert "elevenlabs" not in [name for name, _ in module._build_hedger().engines]
+        with mock.patch.dict(os.environ, {"ELEVENLABS_API_KEY": "test-key"}):
+            assert "elevenlabs" in [name for name, _ in module._build_hedger().engines]
+        ok("Backup fires past the deadline, first answer wins, deadlines track latency")
+        return True
+    except Exception as e:
+        fail(f"Hedged TTS error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_elevenlabs_stream():
+    section("Test 19: Async ElevenLabs Streaming (local stub)")
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    peers = []
+    audio = bytes(range(256)) * 64          # 16 KiB of fake MP3
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"       # keep-alive
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            peers.append((self.path.split("?")[0], self.client_address[1]))
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.send_header("Content-Length", str(len(audio)))
+            self.end_headers()
+            for i in range(0, len(audio), 4096):
+                self.wfile.write(audio[i : i + 4096])
+                self.wfile.flush()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        import asyncio
+        from ai.elevenlabs_tts import AsyncElevenLabsTTS
+        client = AsyncElevenLabsTTS(api_key="test", voice_id="v1", base_url=f"http://127.0.0.1:{server.server_port}")
+
+        async def run():
+            chunks = [c async for c in client.stream("hello")]
+            whole = await client.synthesize_bytes("again")
+            await client.aclose()
+            return chunks, whole
+
+        chunks, whole = asyncio.run(run())
+        print(f"  {len(chunks)} chunks, requests: {peers}")
+        assert b"".join(chunks) == audio and whole == audio
+        assert peers[0][0] == "/v1/text-to-speech/v1/stream", "Must use the streaming endpoint"
+        assert peers[0][1] == peers[1][1], "Second request should reuse the pooled connection"
+        ok("Audio streamed incrementally over a pooled keep-alive connection")
+        return True
+    except Exception as e:
+        fail(f"ElevenLabs streaming error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        server.shutdown()
+
+
+def test_tts_output_format():
+    section("Test 20: TTS Output Format Negotiation (MP3 passthrough)")
+    try:
+        import io as _io
+        import soundfile as sf
+        from translation_server import _encode_tts_output, negotiate_audio_format
+
+        assert negotiate_audio_format(["opus", "mp3", "wav"]) == "mp3", "opus is not produced natively"
+        assert negotiate_audio_format(None) == "wav", "Legacy clients keep WAV"
+
+        parts = []
+        for i in range(2):
+            buf = _io.BytesIO()
+            sf.write(buf, np.sin(np.arange(24000) * 0.05 * (i + 1)).astype(np.float32) * 0.3, 24000, format="MP3")
+            parts.append(buf.getvalue())
+        mp3 = _encode_tts_output(parts, "mp3")
+        wav = _encode_tts_output(parts, "wav")
+        print(f"  MP3 passthrough: {len(mp3):,} B   decoded WAV: {len(wav):,} B")
+        assert mp3 == b"".join(parts), "MP3 must be passed through untouched"
+        assert wav[:4] == b"RIFF" and len(wav) > 4 * len(mp3)
+        ok("MP3 clients get engine bytes untouched; WAV only when requested")
+        return True
+    except Exception as e:
+        fail(f"Output format error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_parallel_warmup():
+    section("Test 21: Parallel Model Warmup")
+    import ai.translation_module as tm
+    saved = (tm.MARIAN_AVAILABLE, getattr(tm, "MarianTokenizer", None), getattr(tm, "MarianMTModel", None))
+    try:
+        loads = []
+
+        class FakeTokenizer:
+            @classmethod
+            def from_pretrained(cls, name):
+                time.sleep(0.2)
+                loads.append(name)
+                return cls()
+
+            def __call__(self, texts, **kwargs):
+                return {"input_ids": texts}
+
+        class FakeModel(FakeTokenizer):
+            def eval(self):
+                return self
+
+            def generate(self, **kwargs):
+                return kwargs["input_ids"]
+
+        tm.MARIAN_AVAILABLE, tm.MarianTokenizer, tm.MarianMTModel = True, FakeTokenizer, FakeModel
+        t = tm.TranslationModule()
+        t._model_cache.clear()
+        start = time.time()
+        status = t.warmup([("en", "hi"), ("hi", "en"), ("hi", "ta"), ("en", "te")])
+        elapsed = time.time() - start
+        print(f"  {status}  ({elapsed*1000:.0f} ms, {len(loads)} loads)")
+        # hi->ta pivots through hi->en + en->ta; en->te shares en->ta's checkpoint
+        assert set(status) == {"en->hi", "hi->en", "en->ta", "en->te"}
+        assert all(v == "ready" for v in status.values())
+        assert len(loads) == 2 * 3, "Each checkpoint (tokenizer + model) loads once"
+        assert elapsed < 0.8, "Checkpoints should load in parallel (serial: 1.2 s)"
+
+        # Server warmup: a failed hot pair keeps /ready failing
+        from unittest import mock
+        import translation_server as server
+
+        class HalfWarm:
+            def warmup(self, pairs):
+                return {"en->hi": "ready", "hi->en": "failed: no checkpoint"}
+
+        with mock.patch.object(server, "get_translator", HalfWarm), \
+                mock.patch.dict(server._warmup, {"state": "done", "components": {}, "pairs": {}}):
+            server._warmup["components"] = {"asr": "ready", "translator": server._warm_translator()}
+            print(f"  Server warmup with a failed pair: {server._warmup['components']['translator']}")
+            assert server._warmup["components"]["translator"] == "failed: hi->en" and not server._is_ready()
+        ok("Hot pairs loaded in parallel and warmed")
+        return True
+    except Exception as e:
+        fail(f"Warmup error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        tm.MARIAN_AVAILABLE, tm.MarianTokenizer, tm.MarianMTModel = saved
+        tm.TranslationModule()._model_cache.clear()
+
+
+def test_lazy_imports():
+    section("Test 22: Lazy Backend Imports")
+    import subprocess
+    try:
+        probe = (
+            "import sys, ai; from ai import config, TranslationModule; "
+            "print(','.join(m for m in ('transformers', 'faster_whisper', 'edge_tts', 'gtts', "
+            "'soundfile', 'httpx', 'ai.tts_module', 'ai.asr_module') if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        print(f"  Loaded after config + TranslationModule import: {out or 'none'}")
+        assert out == "", f"Backends imported eagerly: {out}"
+        import ai
+        assert ai.TTSModule is ai.tts_module.TTSModule and "TTSModule" in dir(ai)
+        ok("Model backends load on first use")
+        return True
+    except Exception as e:
+        fail(f"Lazy import error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_prefork_sharing():
+    section("Test 23: Pre-fork Serving with Copy-on-Write Sharing")
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("  /proc/<pid>/smaps_rollup not available - Linux only")
+        return True
+    import json
+    import signal
+    import socket
+    import urllib.request
+    from prefork import child_pids, process_memory, serve_prefork
+
+    shared = {}
+
+    def preload():
+        shared["weights"] = np.ones(64 * 1024 * 1024 // 8)     # 64 MB "model", loaded in the master
+
+    async def app(scope, receive, send):
+        """Tiny ASGI app: GET / reads the weights (inference), /crash kills the worker."""
+        if scope["type"] != "http":
+            return
+        if scope["path"] == "/crash":
+            os._exit(3)
+        from ai import translation_module as tm
+        body = json.dumps({"pid": os.getpid(), "total": float(shared["weights"].sum()),
+                           "budget_processes": tm._budget_processes}).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+    def get(path, timeout=2.0):
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=timeout) as r:
+            return json.loads(r.read())
+
+    def wait_for(predicate, timeout=15.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                value = predicate()
+                if value:
+                    return value
+            except OSError:
+                pass
+            time.sleep(0.1)
+        raise TimeoutError("condition not reached")
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    master = os.fork()
+    if master == 0:
+        code = 0
+        try:
+            logging.getLogger().setLevel(logging.WARNING)
+            serve_prefork(app, host="127.0.0.1", port=port, workers=2, preload=preload, log_level="error")
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    try:
+        first = wait_for(lambda: get("/"))
+        workers = wait_for(lambda: (lambda pids: pids if len(pids) == 2 else None)(child_pids(master)))
+        assert first["total"] == 64 * 1024 * 1024 // 8 and first["pid"] in workers
+        assert first["budget_processes"] == 2, "_init_worker applies the per-worker thread budget"
+        for _ in range(8):
+            get("/")                                           # inference in the workers
+        memory = {pid: process_memory(pid) for pid in workers}
+        for pid, m in memory.items():
+            print(f"  worker {pid}: RSS {m['rss_mb']:.0f} MB, PSS {m['pss_mb']:.0f} MB, private {m['private_mb']:.0f} MB")
+            assert m["rss_mb"] > 64, "Worker should map the master's preloaded weights"
+            assert m["private_mb"] < 32, "Weights must stay shared, not copied into the worker"
+
+        try:
+            get("/crash", timeout=1.0)
+        except Exception:
+            pass                                               # the worker died mid-request
+        restarted = wait_for(lambda: (lambda pids: pids if len(pids) == 2 and pids != workers else None)(child_pids(master)))
+        print(f"  crashed worker replaced: {workers} -> {restarted}")
+        assert wait_for(lambda: get("/"))["total"] == first["total"], "Re-forked worker still shares the weights"
+        ok("serve_prefork: preloaded weights shared by workers, thread budget applied, crashed worker re-forked")
+        return True
+    except Exception as e:
+        fail(f"Pre-fork serving error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        os.kill(master, signal.SIGTERM)
+        os.waitpid(master, 0)
+
+
+def test_model_server():
+    section("Test 24: Model Server IPC")
+    import asyncio
+    import tempfile
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from ai.model_client import ModelClient, RemoteASR, RemoteTranslator, RemoteTTS
+    from ai.model_ipc import ModelServerError
+    from ai.model_server import ModelServer, TranslationBatcher
+    from ai.tts_hedge import HedgedTTS
+
+    class FakeASR:
+        def transcribe_fast(self, audio, language=None, session_id=None, trim_silence=False):
+            return {"text": f"{len(audio)} samples", "language": language, "peak": np.float32(audio.max())}
+
+    class FakeTranslator:
+        calls = []
+
+        def translate(self, text, src, tgt):
+            self.calls.append(text)
+            time.sleep(0.5 if "slow" in str(text) else 0.02)
+            return [f"{tgt}:{t}" for t in text] if isinstance(text, list) else f"{tgt}:{text}"
+
+        def translate_incremental(self, session_id, partial_text, source_lang, target_lang, **kwargs):
+            raise ValueError(f"no session {session_id}")
+
+    async def fake_engine(text, language):
+        return b"ID3" + text.encode()
+
+    class FakeTTS:
+        hedger = HedgedTTS([("fake", fake_engine)])
+
+    class ErrorLog(logging.Handler):
+        def __init__(self):
+            super().__init__(logging.ERROR)
+            self.records = []
+
+        def emit(self, record):
+            self.records.append(record)
+
+    loop_errors = ErrorLog()
+    logging.getLogger("asyncio").addHandler(loop_errors)
+    path = os.path.join(tempfile.mkdtemp(), "models.sock")
+    server = ModelServer(path, asr=FakeASR(), translator=FakeTranslator(), tts=FakeTTS())
+    thread = threading.Thread(target=asyncio.run, args=(server.run(),), daemon=True)
+    thread.start()
+    try:
+        for _ in range(100):
+            if os.path.exists(path):
+                break
+            time.sleep(0.02)
+        client = ModelClient(path, pool_size=8, timeout=5)
+        audio = np.linspace(-0.5, 0.5, 16000, dtype=np.float32)
+        result = RemoteASR(client).transcribe_fast(audio, "en", "ws-1")
+        assert result["text"] == "16000 samples" and result["peak"] == 0.5, result
+
+        translator = RemoteTranslator(client)
+        with ThreadPoolExecutor(8) as pool:
+            out = list(pool.map(lambda i: translator.translate(f"hello {i}", "en", "hi"), range(16)))
+        assert out == [f"hi:hello {i}" for i in range(16)]
+        batches = [c for c in FakeTranslator.calls if isinstance(c, list)]
+        print(f"  16 concurrent translate calls -> {len(batches)} model calls {[len(b) for b in batches]}")
+        assert len(batches) < 16, "Concurrent single texts should be batched"
+
+        tts = asyncio.run(RemoteTTS(client).hedger.synthesize("namaste", "hindi"))
+        assert tts.data == b"ID3namaste" and tts.engine == "fake"
+
+        try:
+            translator.translate_incremental("ws-1", "partial", "en", "hi")
+            raise AssertionError("Remote error should propagate")
+        except ModelServerError as e:
+            assert e.remote_type == "ValueError" and ":ws-1" in str(e)
+        client.close()
+
+        # A cancelled model call must not leave the batched callers waiting
+        class CancellingScheduler:
+            async def run(self, priority, fn, *args):
+                raise asyncio.CancelledError()
+
+        async def cancelled_batch():
+            batcher = TranslationBatcher(lambda texts, s, t: texts, window_ms=1, scheduler=CancellingScheduler())
+            calls = (batcher.translate(f"t{i}", "en", "hi") for i in range(3))
+            return await asyncio.wait_for(asyncio.gather(*calls, return_exceptions=True), timeout=2)
+
+        assert all(isinstance(r, asyncio.CancelledError) for r in asyncio.run(cancelled_batch()))
+
+        # Warmup reports a failed hot pair instead of "ready"
+        class HalfWarm:
+            def warmup(self, pairs):
+                return {"en->hi": "ready", "hi->en": "failed: no checkpoint"}
+
+        status = asyncio.run(ModelServer(path + ".2", asr=FakeASR(), translator=HalfWarm(), tts=FakeTTS())
+                             .warmup([("en", "hi"), ("hi", "en")]))
+        assert status["translator"] == "failed: hi->en", status
+
+        # A client whose call times out closes its socket: the late response
+        # is dropped quietly and the next call runs on a fresh connection
+        impatient = RemoteTranslator(ModelClient(path, pool_size=2, timeout=0.1))
+        try:
+            impatient.translate("slow down", "en", "hi")
+            raise AssertionError("Call should have timed out")
+        except TimeoutError:
+            pass
+        time.sleep(0.6)                       # the server writes to the closed socket
+        assert impatient.translate("hello", "en", "hi") == "hi:hello"
+
+        # Stopping with an idle pooled connection ends cleanly
+        server.stop()
+        thread.join(timeout=10)
+        assert not thread.is_alive(), "Model server did not stop"
+        errors = [r.getMessage() for r in loop_errors.records]
+        assert not errors, errors
+        ok("ASR, translation and TTS served over the Unix socket")
+        return True
+    except Exception as e:
+        fail(f"Model server error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        if thread.is_alive():
+            server.stop()
+            thread.join(timeout=5)
+        logging.getLogger("asyncio").removeHandler(loop_errors)
+
+
+def test_priority_scheduler():
+    section("Test 25: Priority Inference Scheduler")
+    import threading
+    from ai.scheduler import InferenceScheduler, Priority, chunked, current_priority
+    sched = InferenceScheduler(workers=1, max_wait_s={Priority.LOW: 0.3})
+    try:
+        order = []
+        gate = threading.Event()
+        blocker = sched.submit(Priority.HIGH, gate.wait)
+
+        def work(tag, seconds=0.01):
+            time.sleep(seconds)
+            order.append((tag, current_priority()))
+            return tag
+
+        backfill = sched.submit_batches(Priority.LOW, lambda chunk: work(f"batch{chunk[0]}"), chunked(list(range(4)), 1))
+        chat = sched.submit(Priority.MEDIUM, work, "chat")
+        live = sched.submit(Priority.HIGH, work, "live")
+        gate.set()
+        assert blocker.result(2) is True
+        live.result(2)
+        # While the backfill runs, a new live utterance waits for one chunk at most
+        while not any(tag.startswith("batch") for tag, _ in order):
+            time.sleep(0.001)
+        late = sched.submit(Priority.HIGH, work, "live2")
+        assert backfill.result(5) == [f"batch{i}" for i in range(4)] and late.result(2) == "live2"
+        tags = [tag for tag, _ in order]
+        print(f"  Order: {tags}")
+        assert tags[:3] == ["live", "chat", "batch0"], tags
+        assert tags.index("live2") <= tags.index("batch0") + 2, "Live work must run at the next batch boundary"
+        assert dict(order)["chat"] == Priority.MEDIUM
+
+        # Starvation: a steady stream of live work must not block the backfill forever
+        stop = threading.Event()
+
+        def flood():
+            while not stop.is_set():
+                sched.submit(Priority.HIGH, time.sleep, 0.02).result()
+        floods = [threading.Thread(target=flood) for _ in range(2)]
+        for t in floods:
+            t.start()
+        time.sleep(0.05)
+        starved = sched.submit(Priority.LOW, work, "starved")
+        assert starved.result(3) == "starved"
+        stop.set()
+        for t in floods:
+            t.join()
+        stats = sched.stats()["classes"]
+        print(f"  low: {stats['low']}")
+        assert stats["low"]["promoted"] >= 1 and stats["low"]["preempted"] >= 1
+        assert stats["high"]["completed"] > 10 and stats["low"]["queued"] == 0
+        ok("Live > chat > batch, preemption at batch boundaries, no starvation")
+        return True
+    except Exception as e:
+        fail(f"Scheduler error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        sched.shutdown(wait=False)
+
+
+def test_admission_control():
+    section("Test 26: Admission Control / Load Shedding")
+    import asyncio
+    import base64
+    import ai.admission as admission_mod
+    import translation_server as ts
+    from fastapi.testclient import TestClient
+    from ai.admission import AdmissionController, SheddingQueue
+    from ai.scheduler import InferenceScheduler, Priority
+
+    class SlowASR:
+        """Fake model: every decode takes 150 ms."""
+        def transcribe_fast(self, audio, language=None, session_id=None, trim_silence=False):
+            time.sleep(0.15)
+            return {"text": "", "language": language}
+
+        def end_session(self, session_id):
+            pass
+
+    saved = (admission_mod._admission, ts._asr)
+    sched = InferenceScheduler(workers=1)
+    try:
+        # Session cap and scheduler backlog both refuse new sessions
+        ctl = AdmissionController(target_delay_s=0.05, max_sessions=1, window_s=0.3,
+                                  delay_sources=[lambda: sched.oldest_wait(Priority.MEDIUM)])
+        assert ctl.admit("a").admitted
+        refused = ctl.admit("b")
+        assert not refused.admitted and refused.reason == "session_limit"
+        ctl.release("a")
+        jobs = [sched.submit(Priority.HIGH, time.sleep, 0.1) for _ in range(3)]
+        time.sleep(0.08)
+        refused = ctl.admit("b")
+        assert not refused.admitted and refused.reason == "overloaded", refused
+        for job in jobs:
+            job.result(2)
+        assert ctl.admit("b").admitted, "Idle server must admit again"
+
+        # Full queue drops the oldest; stale items are shed only under overload
+        async def queue_checks():
+            q = SheddingQueue(2, ctl)
+            assert q.put_nowait(1) and q.put_nowait(2) and not q.put_nowait(3)
+            assert [await q.get(), await q.get()] == [2, 3]
+            ctl.stale_chunk_s = 0.02
+            q = SheddingQueue(4, ctl)
+            for i in range(2):
+                q.put_nowait(i)
+            await asyncio.sleep(0.05)
+            ctl.observe(1.0)            # overloaded
+            q.put_nowait("fresh")
+            return await q.get(), q.shed
+        got, shed = asyncio.run(queue_checks())
+        assert got == "fresh" and shed == 2, (got, shed)
+
+        # /ws/voice while inference is backlogged: stale audio is shed, the
+        # client is told to back off, and new connections are refused
+        backlog = [0.0]
+        admission_mod._admission = AdmissionController(target_delay_s=0.1, window_s=2.0, stale_chunk_s=0.3,
+                                                       retry_after_s=0.5, delay_sources=[lambda: backlog[0]])
+        ts._asr = SlowASR()
+        tone = (np.sin(np.arange(8000) / 5.0) * 8000).astype(np.int16).tobytes()
+        audio = {"type": "audio", "data": base64.b64encode(tone).decode()}
+        client = TestClient(ts.app)
+        replies = []
+        with client.websocket_connect("/ws/voice") as ws:
+            backlog[0] = 1.0
+            for _ in range(10):
+                ws.send_json(audio)
+            ws.send_json({"type": "config", "source_lang": "english", "target_lang": "hindi"})
+            while True:
+                replies.append(ws.receive_json())
+                if replies[-1]["type"] == "config_ack":
+                    break
+        stats = admission_mod._admission.stats()
+        print(f"  Replies: {[r['type'] for r in replies]}  shed={stats['shed']}  delay={stats['queue_delay_ms']} ms")
+        assert stats["shed"] >= 3 and stats["active_sessions"] == 0
+        assert any(r["type"] == "backoff" for r in replies)
+        with client.websocket_connect("/ws/voice") as ws:
+            msg = ws.receive_json()
+        assert msg["type"] == "rejected" and msg["reason"] == "overloaded" and msg["retry_after_ms"] == 500
+        ok("Sessions refused past the delay target, stale chunks shed oldest-first")
+        return True
+    except Exception as e:
+        fail(f"Admission control error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        admission_mod._admission, ts._asr = saved
+        sched.shutdown(wait=False)
+
+
+def test_adaptive_asr():
+    section("Test 27: Adaptive ASR Model Downgrade")
+    import threading
+    from collections import namedtuple
+    from concurrent.futures import ThreadPoolExecutor
+    from ai.asr_module import ASRModule
+    from ai.config import config
+
+    Seg = namedtuple("Seg", "start end text avg_logprob")
+    Info = namedtuple("Info", "language language_probability duration")
+
+    class FakeWhisper:
+        """'small' decodes in 200 ms, 'tiny' in 20 ms, one at a time."""
+        def __init__(self, size):
+            self.size = size
+            self.lock = threading.Lock()
+
+        def transcribe(self, audio, language=None, **kwargs):
+            def segments():
+                with self.lock:
+                    time.sleep(0.2 if self.size == "small" else 0.02)
+                yield Seg(0.0, 1.0, f"hello from {self.size}", -0.2)
+            return segments(), Info(language or "en", 0.99, 1.0)
+
+    saved_cls = (ASRModule._instance, ASRModule._model, ASRModule._initialized, ASRModule._whisper)
+    saved_cfg = (config.whisper_model_size, config.whisper_fallback_model_size,
+                 config.asr_adaptive_budget_s, config.whisper_num_workers)
+    try:
+        ASRModule._instance, ASRModule._model, ASRModule._initialized = None, None, False
+        ASRModule._whisper = lambda self, size: FakeWhisper(size)
+        config.whisper_model_size, config.whisper_fallback_model_size = "small", "tiny"
+        config.asr_adaptive_budget_s, config.whisper_num_workers = 0.1, 1
+        asr = ASRModule()
+        asr._router.delay_source = None      # only this test's load counts
+        audio = np.zeros(16000, dtype=np.float32)
+
+        first = asr.transcribe_fast(audio, language="en")
+        assert first["model"] == "small" and first["text"] == "hello from small"
+        with ThreadPoolExecutor(6) as pool:
+            burst = list(pool.map(lambda _: asr.transcribe_fast(audio, language="en"), range(6)))
+        served = [r["model"] for r in burst]
+        after = asr.transcribe(audio, language="en")
+        info = asr.get_model_info()["adaptive"]
+        print(f"  Burst served by: {served}")
+        print(f"  Stats: {info}")
+        assert "tiny" in served and "small" in served, "Burst must spill over to the smaller model"
+        assert after["model"] == "small", "Idle again: back on the larger model"
+        assert info["served"] == {"small": served.count("small") + 2, "tiny": served.count("tiny")}
+        ok("Live utterances fall back to the smaller Whisper under load")
+        return True
+    except Exception as e:
+        fail(f"Adaptive ASR error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        ASRModule._instance, ASRModule._model, ASRModule._initialized, ASRModule._whisper = saved_cls
+        (config.whisper_model_size, config.whisper_fallback_model_size,
+         config.asr_adaptive_budget_s, config.whisper_num_workers) = saved_cfg
+
+
+def test_autotune():
+    section("Test 28: Host Auto-tuning Profile")
+    import csv
+    import json
+    import tempfile
+    from unittest import mock
+    from ai import autotune
+    from ai.config import ModelConfig, load_host_profile
+
+    class FakeWhisper:
+        """int8 is faster than float32; more threads = lower latency."""
+        def __init__(self, compute_type, cpu_threads, num_workers):
+            self.cost = (0.004 if compute_type == "int8" else 0.012) / cpu_threads
+
+        def transcribe(self, audio, **kwargs):
+            time.sleep(self.cost)
+            return iter(()), None
+
+    def fake_translate(texts):
+        time.sleep(0.002 + 0.0005 * len(texts))   # fixed cost per call: batching pays
+        return [5] * len(texts)
+
+    try:
+        audio = np.zeros(16000, dtype=np.float32)
+        asr = [autotune.bench_asr(FakeWhisper, s, audio, repeats=2) for s in autotune.asr_grid(2, ["int8", "float32"])]
+        mt = [autotune.bench_mt(fake_translate, lambda n: None, threads, batch, repeats=2)
+              for threads in autotune.mt_thread_counts(2) for batch in (1, 8, 32)]
+        best_asr, best_mt = autotune.pick_best(asr), autotune.pick_mt(mt)
+        print(f"  ASR pick: {best_asr.settings}  MT pick: {best_mt.settings}")
+        assert best_asr.settings["whisper_compute_type"] == "int8"
+        assert best_mt.settings["translation_batch_size"] > 1 and best_mt.tokens_per_s > 0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "host_profile.json")
+            settings = {**best_asr.settings, **best_mt.settings}
+            table = autotune.write_profile(path, settings, asr + mt, {"repeats": 2})
+            with open(path) as f:
+                profile = json.load(f)
+            profile["settings"]["no_such_field"] = 1
+            with open(path, "w") as f:
+                json.dump(profile, f)
+            cfg = ModelConfig()
+            applied = load_host_profile(cfg, path)
+            assert applied == settings and cfg.whisper_compute_type == "int8"
+            assert isinstance(cfg.torch_num_threads, int) and cfg.translation_batch_size == best_mt.settings["translation_batch_size"]
+            with open(table) as f:
+                rows = list(csv.DictReader(f))
+            print(f"  Table: {len(rows)} rows, {sum(int(r['selected']) for r in rows)} selected")
+            assert len(rows) == len(asr) + len(mt) and sum(int(r["selected"]) for r in rows) == 2
+        assert load_host_profile(ModelConfig(), "/nonexistent/profile.json") == {}
+
+        # Bad values are skipped, bools parse explicitly, a set env var wins
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "host_profile.json")
+            with open(path, "w") as f:
+                json.dump({"settings": {"whisper_num_workers": "auto", "marian_quantize": "false",
+                                        "speculative_tts": "true", "whisper_model_size": "base"}}, f)
+            cfg = ModelConfig()
+            workers, size = cfg.whisper_num_workers, cfg.whisper_model_size
+            with mock.patch.dict(os.environ, {"WHISPER_MODEL_SIZE": size}):
+                applied = load_host_profile(cfg, path)
+            assert applied == {"marian_quantize": False, "speculative_tts": True}, applied
+            assert cfg.whisper_num_workers == workers and cfg.whisper_model_size == size
+            with open(path, "w") as f:
+                json.dump([1, 2], f)
+            assert load_host_profile(ModelConfig(), path) == {}
+        ok("Benchmarks pick settings, profile loads into ModelConfig, table saved")
+        return True
+    except Exception as e:
+        fail(f"Auto-tuning error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_thread_budget():
+    section("Test 29: MarianMT Thread Budget")
+    from unittest import mock
+    from ai import translation_module as tm
+    from ai.config import config
+
+    try:
+        saved = (config.marian_concurrency, config.torch_num_threads)
+        with mock.patch("os.cpu_count", return_value=8):
+            try:
+                config.marian_concurrency, config.torch_num_threads = 2, 0
+                assert tm.thread_budget() == (2, 4)
+                assert tm.thread_budget(processes=4) == (2, 1)      # 2 cores per worker
+                assert tm.thread_budget(processes=16) == (1, 1)     # never below one
+                config.marian_concurrency = 16
+                assert tm.thread_budget() == (8, 1)                 # calls capped at cores
+                config.marian_concurrency, config.torch_num_threads = 2, 3
+                assert tm.thread_budget() == (2, 3)                 # profile / env override
+                config.torch_num_threads = 8
+                assert tm.thread_budget() == (2, 4)                 # ... capped at the share
+                model = object()
+                assert tm._quantize(model) is model                 # not a torch module
+                config.marian_concurrency, config.torch_num_threads = 2, 0
+                slots, threads = tm.apply_thread_budget(processes=2)
+                print(f"  8 cores / 2 workers: {slots} concurrent call(s) x {threads} thread(s)")
+                assert tm._generate_slots.acquire(blocking=False) and tm._generate_slots.acquire(blocking=False)
+                assert not tm._generate_slots.acquire(blocking=False)
+                tm._generate_slots.release()
+                tm._generate_slots.release()
+            finally:
+                config.marian_concurrency, config.torch_num_threads = saved
+                tm.apply_thread_budget()
+        ok("Concurrent calls x torch threads fit the cores of each worker")
+        return True
+    except Exception as e:
+        fail(f"Thread budget error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_speculation():
+    section("Test 30: Speculative Translation / TTS")
+    import asyncio
+    import time
+    from ai.speculation import SpeculationStats, Speculator
+
+    async def work(value, seconds):
+        await asyncio.sleep(seconds)
+        return value
+
+    async def scenario():
+        stats = SpeculationStats()
+        mt, tts = Speculator("translation", stats=stats), Speculator("tts", concurrent=True, stats=stats)
+        # Partials: the hypothesis grows; each one supersedes the last
+        for hyp in ("hello", "hello there", "hello there friend"):
+            mt.retain([hyp])
+            assert await mt.speculate(hyp, lambda hyp=hyp: work(hyp.upper(), 0.01)) == hyp.upper()
+        # Stable clauses pre-synthesized; ASR then revises the second one
+        spoken = time.monotonic()
+        tts.speculate("Hello there.", lambda: work(b"a", 0.05))
+        tts.speculate("How are you?", lambda: work(b"b", 0.5))
+        await asyncio.sleep(0.02)
+        assert tts.retain(["Hello there."]) == 1 and "How are you?" not in tts
+
+        # Final: same transcript as the last partial -> reused, not recomputed
+        computed = []
+        assert await mt.resolve("hello there friend", lambda: computed.append(1)) == "HELLO THERE FRIEND"
+        first = await tts.resolve("Hello there.", lambda: work(b"x", 0))
+        second = await tts.resolve("How are you doing?", lambda: work(b"c", 0))
+        asked_ms = (time.monotonic() - spoken) * 1000
+        assert not computed and (first, second) == (b"a", b"c")
+        mt_summary, tts_summary = mt.settle(), tts.settle()
+        print(f"  utterance: translation {mt_summary}, tts {tts_summary}")
+        assert mt_summary["hits"] == 1 and mt_summary["saved_ms"] > 0
+        assert tts_summary == {"hits": 1, "misses": 1, "saved_ms": tts_summary["saved_ms"]}
+        # Saved only what ran before the final asked, never more (no wall-clock bounds)
+        assert 0 < tts_summary["saved_ms"] <= asked_ms + 0.1
+
+        # Next utterance diverges: miss, recomputed, then no speculation at all
+        mt.speculate("good morning", lambda: work("GOOD MORNING", 0))
+        assert await mt.resolve("good evening", lambda: work("GOOD EVENING", 0)) == "GOOD EVENING"
+        mt.settle()
+        assert await mt.resolve("bye", lambda: work("BYE", 0)) == "BYE"
+        assert mt.settle() == {"hits": 0, "misses": 0, "saved_ms": 0.0}
+        return stats.stats()
+
+    try:
+        totals = asyncio.run(scenario())
+        print(f"  totals: {totals}")
+        assert totals["translation"]["utterances"] == 2 and totals["translation"]["hit_rate"] == 0.5
+        assert totals["tts"]["cancelled"] == 1 and totals["tts"]["hit_rate"] == 0.5
+        ok("Matching finals reuse speculative work; diverged work is cancelled and counted")
+        return True
+    except Exception as e:
+        fail(f"Speculation error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_asr_language_lock():
+    section("Test 31: ASR Session Language Lock")
+    from collections import namedtuple
+    from ai.asr_module import ASRModule
+    from ai.config import config
+
+    Seg = namedtuple("Seg", "start end text avg_logprob")
+    Info = namedtuple("Info", "language language_probability duration")
+
+    class ScriptedWhisper:
+        """Each decode pops (detected language, probability, avg_logprob)."""
+        def __init__(self):
+            self.script, self.requested = [], []
+
+        def transcribe(self, audio, language=None, **kwargs):
+            detected, prob, logprob = self.script.pop(0)
+            self.requested.append(language)
+            return iter([Seg(0.0, 1.0, "namaste", logprob)]), Info(language or detected, prob, 1.0)
+
+    saved_cls = (ASRModule._instance, ASRModule._model, ASRModule._initialized, ASRModule._whisper)
+    saved_cfg = (config.whisper_fallback_model_size, config.asr_language_lock_probability,
+                 config.asr_language_lock_utterances, config.asr_language_drift_logprob,
+                 config.asr_language_drift_patience)
+    fake = ScriptedWhisper()
+    try:
+        ASRModule._instance, ASRModule._model, ASRModule._initialized = None, None, False
+        ASRModule._whisper = lambda self, size: fake
+        config.whisper_fallback_model_size = ""
+        (config.asr_language_lock_probability, config.asr_language_lock_utterances,
+         config.asr_language_drift_logprob, config.asr_language_drift_patience) = 0.8, 2, -1.0, 2
+        asr = ASRModule()
+        audio = np.zeros(16000, dtype=np.float32)
+
+        def decode(detected, prob, logprob, language="auto"):
+            fake.script.append((detected, prob, logprob))
+            return asr.transcribe_fast(audio, language=language, session_id="s1")
+
+        decode("hi", 0.5, -0.3)                       # not confident: no vote
+        decode("hi", 0.95, -0.3)                      # vote 1
+        decode("hi", 0.9, -0.3)                       # vote 2: locked
+        locked = decode("en", 0.99, -0.3)             # decoded with the lock, no re-detection
+        assert fake.requested == [None, None, None, "hi"] and locked["language_locked"]
+        assert asr.get_model_info()["locked_sessions"] == 1
+
+        decode("hi", 0.9, -2.0)                       # low confidence 1
+        decode("hi", 0.9, -0.2)                       # confident again: streak reset
+        decode("hi", 0.9, -2.0)
+        decode("hi", 0.9, -2.0)                       # low confidence 2 in a row: unlock (drift)
+        after = decode("ta", 0.95, -0.3)
+        print(f"  Languages requested: {fake.requested}")
+        assert fake.requested[4:] == ["hi", "hi", "hi", "hi", None] and not after["language_locked"]
+
+        decode("ta", 0.95, -0.3, language="hindi")    # explicit language: no lock used or voted
+        assert fake.requested[-1] == "hi" and asr.get_model_info()["locked_sessions"] == 0
+        decode("ta", 0.95, -0.3)                      # second 'ta' vote: locks on 'ta'
+        asr.end_session("s1")
+        decode("hi", 0.95, -0.3)
+        assert fake.requested[-1] is None, "end_session forgets the lock"
+        ok("Votes lock the session language; low-confidence drift unlocks it")
+        return True
+    except Exception as e:
+        fail(f"Language lock error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        ASRModule._instance, ASRModule._model, ASRModule._initialized, ASRModule._whisper = saved_cls
+        (config.whisper_fallback_model_size, config.asr_language_lock_probability,
+         config.asr_language_lock_utterances, config.asr_language_drift_logprob,
+         config.asr_language_drift_patience) = saved_cfg
+
+
+def test_long_form_asr():
+    section("Test 32: Long-form ASR (bounded segments, parallel decode)")
+    import threading
+    from collections import namedtuple
+    from ai.asr_module import ASRModule
+    from ai.config import config
+    from ai.vad import bounded_segments, split_speech
+
+    Seg = namedtuple("Seg", "start end text avg_logprob")
+    Info = namedtuple("Info", "language language_probability duration")
+    sr = 16000
+
+    class LevelWhisper:
+        """Transcribes a span as the loudest burst level in it; earlier (quieter)
+        spans decode slower, so completion order is the reverse of span order."""
+        def __init__(self):
+            self.threads, self.lengths = set(), []
+            self.lock = threading.Lock()
+
+        def transcribe(self, audio, language=None, **kwargs):
+            level = float(np.abs(audio).max())
+            with self.lock:
+                self.threads.add(threading.current_thread().name)
+                self.lengths.append(len(audio))
+            time.sleep(max(0.0, 0.12 - level * 0.15))
+            return iter([Seg(0.0, len(audio) / sr, f"{level:.2f}", -0.2)]), Info(language or "en", 0.99, 1.0)
+
+    saved_cls = (ASRModule._instance, ASRModule._model, ASRModule._initialized, ASRModule._whisper)
+    saved_fallback = config.whisper_fallback_model_size
+    fake = LevelWhisper()
+    try:
+        ASRModule._instance, ASRModule._model, ASRModule._initialized = None, None, False
+        ASRModule._whisper = lambda self, size: fake
+        config.whisper_fallback_model_size = ""
+        asr = ASRModule()
+
+        # 8 bursts of 1.5 s at rising levels, 1 s of silence between them
+        rng = np.random.default_rng(0)
+        parts = []
+        for i in range(8):
+            parts.append(np.zeros(sr, dtype=np.float32))
+            parts.append((rng.uniform(-1, 1, int(1.5 * sr)) * (0.2 + 0.05 * i)).astype(np.float32))
+        parts.append(np.zeros(sr, dtype=np.float32))
+        audio = np.concatenate(parts)
+
+        max_s = 6.0                  # two bursts and the pause between them fit in a span
+        vad_kwargs = dict(energy_floor=config.vad_energy_floor, pad_ms=config.vad_pad_ms,
+                          min_pause_ms=config.vad_min_pause_ms, aggressiveness=config.vad_aggressiveness)
+        spans = bounded_segments(audio, sample_rate=sr, max_segment_s=max_s, **vad_kwargs)
+        speech = split_speech(audio, sample_rate=sr, max_segment_s=max_s, **vad_kwargs)
+        assert len(spans) > 2 and all(0 < e - s <= max_s * sr for s, e in spans)
+        assert all(a[1] <= b[0] for a, b in zip(spans, spans[1:])), "spans ordered, not overlapping"
+
+        result = asr.transcribe_long(audio, language="en", max_segment_s=max_s, workers=3)
+        levels = [float(t) for t in result["text"].split()]
+        print(f"  {len(spans)} spans, text: {result['text']}  threads: {sorted(fake.threads)}")
+        assert levels == sorted(levels) and len(levels) == len(spans), "text joined in span order"
+        assert [seg["start"] for seg in result["segments"]] == [s / sr for s, _ in spans]
+        assert sorted(fake.lengths) == sorted(e - s for s, e in spans)
+        assert len([t for t in fake.threads if t.startswith("asr-long")]) > 1, "decodes fan out to workers"
+
+        expected = 1.0 - sum(e - s for s, e in speech) / len(audio)
+        spans_only = 1.0 - sum(e - s for s, e in spans) / len(audio)
+        print(f"  trimmed_fraction {result['trimmed_fraction']:.3f} (speech {expected:.3f}, spans {spans_only:.3f})")
+        assert abs(result["trimmed_fraction"] - expected) < 1e-9 and expected > spans_only
+        ok("Bounded spans decoded in parallel, joined in order, pauses count as trimmed")
+        return True
+    except Exception as e:
+        fail(f"Long-form ASR error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        ASRModule._instance, ASRModule._model, ASRModule._initialized, ASRModule._whisper = saved_cls
+        config.whisper_fallback_model_size = saved_fallback
+
+
+def test_ring_buffer_wrap():
+    section("Test 33: PCM Ring Buffer Wrap-around")
+    from media.audio_utils import PCMRingBuffer
+
+    def chunk(value, n):
+        return np.full(n, value, dtype=np.int16).tobytes()
+
+    try:
+        ring = PCMRingBuffer(capacity_s=0.02, sample_rate=16000)    # 320 samples
+        a = ring.write(chunk(1000, 100))
+        b = ring.write(chunk(2000, 100))
+        c = ring.write(chunk(3000, 100))
+        assert not np.shares_memory(a, b) and not np.shares_memory(b, c)
+        assert np.all(a == np.float32(1000 / 32768)), "writes that fit leave earlier views intact"
+
+        d = ring.write(chunk(4000, 100))     # 20 samples left: wraps to the front
+        assert np.shares_memory(a, d) and np.all(a == d), "the wrapping write overwrites the oldest view"
+        assert np.all(b == np.float32(2000 / 32768)) and np.all(c == np.float32(3000 / 32768))
+        print("  Wrap after 300 of 320 samples: the first view is overwritten by the fourth write")
+
+        e = ring.write(chunk(5000, 200))     # fits after d (100 + 200 <= 320): no wrap
+        assert not np.shares_memory(d, e) and np.all(d == np.float32(4000 / 32768))
+        f = ring.write(chunk(6000, 30))      # 20 left: wraps again, after only 230 samples
+        assert np.shares_memory(d, f)
+
+        big = ring.write(chunk(7000, 1000))  # oversized: buffer grows, old views keep their data
+        assert ring.capacity == 1000 and not np.shares_memory(big, e)
+        assert np.all(e == np.float32(5000 / 32768))
+        ok("Views survive until the next wrapping write; oversized chunks grow the buffer")
+        return True
+    except Exception as e:
+        fail(f"Ring buffer error: {e}")
+        logger.exception(e)
+        return False
+
+
+def test_admission_session_time():
+    section("Test 34: Admission Ignores a Session's Own Processing Time")
+    import asyncio
+    import base64
+    import itertools
+    import ai.admission as admission_mod
+    import translation_server as ts
+    from fastapi.testclient import TestClient
+    from ai.admission import AdmissionController
+
+    class FastASR:
+        def __init__(self):
+            self.n = itertools.count()
+
+        def transcribe_fast(self, audio, language=None, session_id=None, trim_silence=False):
+            return {"text": f"hello number {next(self.n)}", "language": language}
+
+        def end_session(self, session_id):
+            pass
+
+    class EchoTranslator:
+        def translate(self, text, source_lang, target_lang):
+            return text.upper()
+
+        def has_session(self, session_id):
+            return False
+
+        def end_session(self, session_id):
+            pass
+
+    class SlowTTS:
+        """Network TTS on a bad day: every sentence takes 400 ms."""
+        class hedger:
+            @staticmethod
+            async def synthesize(text, language):
+                await asyncio.sleep(0.4)
+                return type("Result", (), {"data": b"mp3"})()
+
+    saved = (admission_mod._admission, ts._asr, ts._translator, ts._tts)
+    try:
+        controller = admission_mod._admission = AdmissionController(target_delay_s=0.1, window_s=5.0)
+        ts._asr, ts._translator, ts._tts = FastASR(), EchoTranslator(), SlowTTS()
+        tone = (np.sin(np.arange(8000) / 5.0) * 8000).astype(np.int16).tobytes()
+        audio = {"type": "audio", "data": base64.b64encode(tone).decode()}
+        client = TestClient(ts.app)
+        with client.websocket_connect("/ws/voice") as ws:
+            ws.send_json({"type": "config", "source_lang": "english", "target_lang": "hindi",
+                          "audio_formats": ["mp3"]})
+            assert ws.receive_json()["type"] == "config_ack"
+            for _ in range(4):        # queued behind each other's TTS: up to ~1.2 s old
+                ws.send_json(audio)
+            replies = [ws.receive_json() for _ in range(4)]
+            stats = controller.stats()
+            print(f"  Replies: {[r['type'] for r in replies]}  delay={stats['queue_delay_ms']} ms")
+            assert [r["type"] for r in replies] == ["result"] * 4
+            assert not stats["overloaded"] and stats["shed"] == 0
+            assert controller.admit("second").admitted, "One slow session must not refuse others"
+            controller.release("second")
+            with client.websocket_connect("/ws/voice") as other:
+                other.send_json({"type": "config", "source_lang": "english", "target_lang": "hindi"})
+                assert other.receive_json()["type"] == "config_ack"
+        ok("Slow TTS in one session neither sheds its audio nor refuses a second session")
+        return True
+    except Exception as e:
+        fail(f"Admission session time error: {e}")
+        logger.exception(e)
+        return False
+    finally:
+        admission_mod._admission, ts._asr, ts._translator, ts._tts = saved
+
+
 # ── Run all ───────────────────────────────────────────────────────────────
 def main():
     print("\n" + "=" * 70)
@@ -259,6 +1635,32 @@ def main():
         ("Full Pipeline", test_pipeline),
         ("Multi-lang TTS", test_multilang_tts),
         ("Batch Translation", test_batch_translation),
+        ("Incremental Translation", test_incremental_translation),
+        ("Google Fallback", test_google_fallback),
+        ("Pivot Fan-out", test_pivot_fanout),
+        ("Language Detection", test_langid),
+        ("Silence Trimming", test_silence_trimming),
+        ("Resampler", test_resampler),
+        ("Playout Buffer", test_playout_buffer),
+        ("PCM Framing", test_pcm_framing),
+        ("Pipelined TTS", test_tts_segmentation),
+        ("Hedged TTS", test_tts_hedging),
+        ("ElevenLabs Streaming", test_elevenlabs_stream),
+        ("TTS Output Format", test_tts_output_format),
+        ("Parallel Warmup", test_parallel_warmup),
+        ("Lazy Imports", test_lazy_imports),
+        ("Pre-fork Sharing", test_prefork_sharing),
+        ("Model Server", test_model_server),
+        ("Priority Scheduler", test_priority_scheduler),
+        ("Admission Control", test_admission_control),
+        ("Adaptive ASR", test_adaptive_asr),
+        ("Host Auto-tuning", test_autotune),
+        ("MarianMT Thread Budget", test_thread_budget),
+        ("Speculation", test_speculation),
+        ("ASR Language Lock", test_asr_language_lock),
+        ("Long-form ASR", test_long_form_asr),
+        ("PCM Ring Buffer Wrap", test_ring_buffer_wrap),
+        ("Admission vs. Session Time", test_admission_session_time),
     ]
 
     results = []
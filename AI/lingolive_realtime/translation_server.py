@@ -8,12 +8,14 @@ Endpoints:
   POST /api/translate/batch    - Translate batch of texts
   POST /api/voice/translate    - Upload audio -> get translated audio back
   GET  /api/languages          - List supported languages
-  GET  /health                 - Health check
+  GET  /health                 - Health check (liveness)
+  GET  /ready                  - Readiness: 200 once models are loaded and warmed
   WS   /ws/voice               - Real-time voice translation via WebSocket
 
 Run:
   python translation_server.py
   # or:  uvicorn translation_server:app --host 0.0.0.0 --port 5001 --reload
+  WORKERS=4 python translation_server.py   # pre-forked workers sharing one copy of the MT models
 """
 import asyncio
 import base64
@@ -22,6 +24,7 @@ import json
 import logging
 import os
 import tempfile
+import threading
 import time
 from functools import lru_cache
 from pathlib import Path
@@ -39,17 +42,17 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 # ── AI modules ──────────────────────────────────────────────────────────────
-from ai.config import SUPPORTED_LANGUAGES, WHISPER_LANG_CODES, EDGE_TTS_VOICES, config, get_edge_voice
+from ai.config import SUPPORTED_LANGUAGES, WHISPER_LANG_CODES, EDGE_TTS_VOICES, config, parse_language_pairs
 from ai.asr_module import ASRModule
 from ai.translation_module import TranslationModule
 from ai.tts_module import TTSModule
-from ai.elevenlabs_tts import ElevenLabsTTS
-
-try:
-    import edge_tts
-    EDGE_TTS_AVAILABLE = True
-except ImportError:
-    EDGE_TTS_AVAILABLE = False
+from ai.tts_pipeline import Crossfader, complete_segments
+from ai.langid import detect_language
+from ai.scheduler import Priority, chunked, get_scheduler
+from ai.admission import SheddingQueue, get_admission
+from ai.speculation import Speculator, get_speculation_stats
+from ai.model_client import RemoteASR, RemoteTranslator, RemoteTTS, get_model_client, remote_models_enabled
+from media.audio_utils import PCMRingBuffer, PolyphaseResampler
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
@@ -67,47 +70,146 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Transcription", "X-Translation", "X-Processing-Time"],
+    expose_headers=["X-Transcription", "X-Translation", "X-Processing-Time", "X-Trimmed-Fraction", "X-TTS-CPU-ms"],
 )
 
 # ── Translation / TTS cache for repeated phrases ────────────────────────────
 _translation_cache: dict = {}   # (text, src, tgt) -> translated
-_tts_cache: dict = {}           # (text, lang) -> audio bytes (base64)
+_tts_cache: dict = {}           # (text, lang, format) -> audio bytes (base64)
 _CACHE_MAX = 500
 
 # ── Lazy-loaded singletons ──────────────────────────────────────────────────
+# With MODEL_SERVER_SOCKET set these are thin clients of the shared model
+# server (python -m ai.model_server) instead of in-process models.
 _asr: Optional[ASRModule] = None
 _translator: Optional[TranslationModule] = None
 _tts: Optional[TTSModule] = None
-_elevenlabs: Optional[ElevenLabsTTS] = None
+
+
+# One lock per model: requests racing startup warmup must not load twice, and
+# a slow Whisper load must not hold up MarianMT or TTS.
+_asr_lock = threading.Lock()
+_translator_lock = threading.Lock()
+_tts_lock = threading.Lock()
 
 
 def get_asr() -> ASRModule:
     global _asr
     if _asr is None:
-        _asr = ASRModule()
+        with _asr_lock:
+            if _asr is None:
+                _asr = RemoteASR() if remote_models_enabled() else ASRModule()
     return _asr
 
 
 def get_translator() -> TranslationModule:
     global _translator
     if _translator is None:
-        _translator = TranslationModule()
+        with _translator_lock:
+            if _translator is None:
+                _translator = RemoteTranslator() if remote_models_enabled() else TranslationModule()
     return _translator
 
 
 def get_tts() -> TTSModule:
     global _tts
     if _tts is None:
-        _tts = TTSModule()
+        with _tts_lock:
+            if _tts is None:
+                _tts = RemoteTTS() if remote_models_enabled() else TTSModule()
     return _tts
 
 
-def get_elevenlabs() -> ElevenLabsTTS:
-    global _elevenlabs
-    if _elevenlabs is None:
-        _elevenlabs = ElevenLabsTTS()
-    return _elevenlabs
+# Event-loop callers: a model still loading (e.g. during warmup) is waited for
+# in a thread, so the loop (and /health) keeps answering.
+async def aget_asr() -> ASRModule:
+    return _asr if _asr is not None else await asyncio.to_thread(get_asr)
+
+
+async def aget_translator() -> TranslationModule:
+    return _translator if _translator is not None else await asyncio.to_thread(get_translator)
+
+
+async def aget_tts() -> TTSModule:
+    return _tts if _tts is not None else await asyncio.to_thread(get_tts)
+
+
+# ── TTS output: native-format passthrough ───────────────────────────────────
+# Every TTS engine returns MP3.  Clients that can play it get the engine bytes
+# untouched; decoding to PCM (WAV) is only done for clients that need it.
+NATIVE_TTS_FORMAT = "mp3"
+AUDIO_MEDIA_TYPES = {"mp3": "audio/mpeg", "wav": "audio/wav"}
+_tts_output_stats: dict = {}    # format -> utterances / bytes on wire / CPU
+
+
+def negotiate_audio_format(accepted) -> str:
+    """First client-accepted format we can serve.  Formats no engine emits
+    natively (e.g. opus) are skipped; clients that send nothing get WAV."""
+    if isinstance(accepted, str):
+        accepted = [accepted]
+    for fmt in accepted or []:
+        fmt = str(fmt).lower()
+        if fmt in AUDIO_MEDIA_TYPES:
+            return fmt
+    return "wav"
+
+
+async def _tts_segments(text: str, language: str, prefetched: Optional[Speculator] = None):
+    """(seq, count, mp3) per sentence, in order: segments are synthesized
+    concurrently, each one hedged across engines.  Segments `prefetched`
+    already started synthesizing (speculatively) are reused."""
+    segments = TTSModule.split_text(text)
+    hedger = (await aget_tts()).hedger
+
+    async def _hedged_segment(seg: str):
+        if prefetched is None:
+            result = await hedger.synthesize(seg, language)
+        else:
+            result = await prefetched.resolve((seg, language), lambda: hedger.synthesize(seg, language))
+        yield result.data
+
+    async for seq, data in complete_segments(segments, _hedged_segment, config.tts_max_parallel):
+        yield seq, len(segments), data
+
+
+def _encode_tts_output(parts: List[bytes], fmt: str) -> bytes:
+    """Join per-segment MP3 into the client's format."""
+    if fmt == NATIVE_TTS_FORMAT:
+        return b"".join(parts)
+    fader = Crossfader(config.tts_sample_rate, config.tts_crossfade_ms)
+    pcm = [fader.push(_decode_mp3(p)) for p in parts if p]   # b"": segment produced no audio
+    pcm.append(fader.flush())
+    buf = io.BytesIO()
+    sf.write(buf, np.concatenate(pcm), config.tts_sample_rate, format="WAV")
+    return buf.getvalue()
+
+
+def _decode_mp3(data: bytes) -> np.ndarray:
+    audio, sr = sf.read(io.BytesIO(data), dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=-1)
+    if sr != config.tts_sample_rate:
+        # engines differ in output rate (ElevenLabs: 44.1 kHz)
+        audio = PolyphaseResampler(sr, config.tts_sample_rate).process(audio)
+    return audio
+
+
+def _record_tts_output(fmt: str, n_bytes: int, cpu_s: float) -> None:
+    stats = _tts_output_stats.setdefault(fmt, {"utterances": 0, "bytes": 0, "cpu_ms": 0.0})
+    stats["utterances"] += 1
+    stats["bytes"] += n_bytes
+    stats["cpu_ms"] += cpu_s * 1000
+
+
+def _tts_output_info() -> dict:
+    return {
+        fmt: {
+            "utterances": s["utterances"],
+            "avg_bytes": round(s["bytes"] / s["utterances"]),
+            "avg_cpu_ms": round(s["cpu_ms"] / s["utterances"], 2),
+        }
+        for fmt, s in _tts_output_stats.items()
+    }
 
 
 # ── Request / Response models ───────────────────────────────────────────────
@@ -123,28 +225,64 @@ class BatchTranslateRequest(BaseModel):
     target_lang: str = "hi"
 
 
-# ── Preload models at startup (eliminates cold-start delay) ────────────────
+# ── Startup warmup ──────────────────────────────────────────────────────────
+# Models load and warm in parallel in the background; /health answers at once
+# (liveness), /ready only once the models needed to serve are warm.
+_warmup: dict = {"state": "pending", "components": {}, "pairs": {}, "seconds": None}
+
+
+def _warm_asr() -> str:
+    seconds = get_asr().warmup()
+    return f"ready ({seconds:.2f}s dummy decode)"
+
+
+def _warm_translator() -> str:
+    _warmup["pairs"] = get_translator().warmup(parse_language_pairs(config.warmup_language_pairs))
+    failed = [pair for pair, status in _warmup["pairs"].items() if status.startswith("failed")]
+    if failed:
+        # /ready must not pass with cold or missing hot-pair models
+        return f"failed: {', '.join(failed)}"
+    return "ready"
+
+
+def _warm_tts() -> str:
+    get_tts()
+    return "ready"
+
+
+async def _run_warmup():
+    t0 = time.time()
+    _warmup["state"] = "warming"
+    jobs = {"asr": _warm_asr, "translator": _warm_translator, "tts": _warm_tts}
+    _warmup["components"] = {name: "loading" for name in jobs}
+
+    async def _job(name, fn):
+        try:
+            _warmup["components"][name] = await asyncio.to_thread(fn)
+        except Exception as e:
+            _warmup["components"][name] = f"failed: {e}"
+            logger.warning(f"{name} warmup failed: {e}")
+
+    await asyncio.gather(*(_job(name, fn) for name, fn in jobs.items()))
+    _warmup["seconds"] = round(time.time() - t0, 2)
+    _warmup["state"] = "done"
+    logger.info(f"Models loaded and warmed in {_warmup['seconds']:.1f}s: {_warmup['components']}")
+
+
 @app.on_event("startup")
 async def preload_models():
-    """Load ASR, Translation, TTS models at startup so first request is fast."""
-    logger.info("Preloading AI models...")
-    t0 = time.time()
-    try:
-        get_asr()
-        logger.info("ASR model loaded")
-    except Exception as e:
-        logger.warning(f"ASR preload failed: {e}")
-    try:
-        get_translator()
-        logger.info("Translator loaded")
-    except Exception as e:
-        logger.warning(f"Translator preload failed: {e}")
-    try:
-        get_tts()
-        logger.info("TTS loaded")
-    except Exception as e:
-        logger.warning(f"TTS preload failed: {e}")
-    logger.info(f"Models preloaded in {time.time()-t0:.1f}s")
+    """Load and warm ASR, translation (hot pairs) and TTS in parallel, in the
+    background, so the first real request is fast.  See /ready."""
+    logger.info(f"Preloading AI models (hot pairs: {config.warmup_language_pairs})...")
+    app.state.warmup_task = asyncio.create_task(_run_warmup())
+
+
+def _is_ready() -> bool:
+    components = _warmup["components"]
+    # TTS is network-backed and hedged across engines; ASR and MT must be warm
+    return _warmup["state"] == "done" and all(
+        components.get(name, "").startswith("ready") for name in ("asr", "translator")
+    )
 
 
 # ── TEXT TRANSLATION endpoints ──────────────────────────────────────────────
@@ -158,9 +296,9 @@ async def translate_text(req: TranslateRequest):
         raise HTTPException(400, "target_lang is required")
 
     try:
-        translator = get_translator()
-        src = req.source_lang if req.source_lang != "auto" else "english"
-        result = await asyncio.to_thread(translator.translate, req.text.strip(), src, req.target_lang)
+        translator = await aget_translator()
+        src = req.source_lang if req.source_lang != "auto" else detect_language(req.text)
+        result = await get_scheduler().run(Priority.MEDIUM, translator.translate, req.text.strip(), src, req.target_lang)
         translated = result if isinstance(result, str) else result[0]
 
         return {
@@ -182,16 +320,25 @@ async def translate_batch(req: BatchTranslateRequest):
         raise HTTPException(400, "texts array is required")
 
     try:
-        translator = get_translator()
-        src = req.source_lang if req.source_lang != "auto" else "english"
-        results = translator.translate_batch(req.texts, src, req.target_lang)
+        translator = await aget_translator()
+        src = req.source_lang
+        # Low priority, one chunk per turn: live voice and chat run between chunks
+        chunks = await get_scheduler().run_batches(
+            Priority.LOW,
+            lambda chunk: translator.translate_batch(chunk, src, req.target_lang),
+            chunked(req.texts, config.scheduler_batch_chunk),
+        )
+        results = [t for chunk in chunks for t in chunk]
 
         translations = []
         for original, translated in zip(req.texts, results):
-            translations.append({
+            item = {
                 "original": original,
                 "translated": translated,
-            })
+            }
+            if src == "auto":
+                item["source_lang"] = detect_language(original)
+            translations.append(item)
 
         return {
             "success": True,
@@ -211,12 +358,15 @@ async def voice_translate(
     audio: UploadFile = File(...),
     source_lang: str = Form("english"),
     target_lang: str = Form("hindi"),
+    audio_format: str = Form("wav"),
 ):
     """
-    Upload an audio file -> get translated audio back (WAV).
+    Upload an audio file -> get translated audio back (WAV, or MP3 untouched
+    from the TTS engine with audio_format=mp3).
 
-    Flow: Audio -> ASR -> Translation -> TTS -> WAV response
+    Flow: Audio -> ASR -> Translation -> TTS -> audio response
     """
+    out_format = negotiate_audio_format(audio_format)
     t0 = time.time()
 
     # 1. Save uploaded audio to temp
@@ -227,38 +377,40 @@ async def voice_translate(
 
     try:
         # 2. ASR
-        asr = get_asr()
-        asr_result = asr.transcribe(tmp_in.name, language=source_lang)
+        asr = await aget_asr()
+        asr_result = await asyncio.to_thread(asr.transcribe_long, tmp_in.name, source_lang)
         transcribed = asr_result["text"]
-        logger.info(f"ASR: {transcribed!r}")
+        logger.info(f"ASR: {transcribed!r} (trimmed {asr_result['trimmed_fraction']:.0%} silence)")
 
         # 3. Translate
         translated = transcribed
         if source_lang.lower() != target_lang.lower():
-            translator = get_translator()
-            result = translator.translate(transcribed, source_lang, target_lang)
+            translator = await aget_translator()
+            result = await get_scheduler().run(Priority.MEDIUM, translator.translate, transcribed, source_lang, target_lang)
             translated = result if isinstance(result, str) else result[0]
             logger.info(f"Translated: {translated!r}")
 
         # 4. TTS
-        tts = get_tts()
-        audio_out = tts.synthesize(translated, language=target_lang)
+        parts = [data async for _seq, _count, data in _tts_segments(translated, target_lang)]
 
-        # 5. Encode as WAV
-        buf = io.BytesIO()
-        sf.write(buf, audio_out, tts.sample_rate, format="WAV")
-        buf.seek(0)
+        # 5. Encode (passthrough for MP3)
+        cpu0 = time.thread_time()
+        audio_bytes = _encode_tts_output(parts, out_format)
+        tts_cpu = time.thread_time() - cpu0
+        _record_tts_output(out_format, len(audio_bytes), tts_cpu)
 
         elapsed = time.time() - t0
-        logger.info(f"Voice translation done in {elapsed:.2f}s")
+        logger.info(f"Voice translation done in {elapsed:.2f}s ({out_format} {len(audio_bytes)} B)")
 
         return StreamingResponse(
-            buf,
-            media_type="audio/wav",
+            io.BytesIO(audio_bytes),
+            media_type=AUDIO_MEDIA_TYPES[out_format],
             headers={
                 "X-Transcription": transcribed,
                 "X-Translation": translated,
                 "X-Processing-Time": f"{elapsed:.2f}s",
+                "X-Trimmed-Fraction": f"{asr_result['trimmed_fraction']:.3f}",
+                "X-TTS-CPU-ms": f"{tts_cpu * 1000:.2f}",
             },
         )
 
@@ -273,11 +425,14 @@ async def voice_translate_json(
     audio: UploadFile = File(...),
     source_lang: str = Form("english"),
     target_lang: str = Form("hindi"),
+    audio_format: str = Form("wav"),
 ):
     """
     Upload audio -> get JSON with transcription, translation, and base64 audio.
-    Easier for frontend to consume than streaming WAV.
+    Easier for frontend to consume than streaming WAV.  audio_format=mp3
+    returns the TTS engine's MP3 untouched.
     """
+    out_format = negotiate_audio_format(audio_format)
     t0 = time.time()
 
     tmp_in = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
@@ -287,25 +442,25 @@ async def voice_translate_json(
 
     try:
         # ASR
-        asr = get_asr()
-        asr_result = asr.transcribe(tmp_in.name, language=source_lang)
+        asr = await aget_asr()
+        asr_result = await asyncio.to_thread(asr.transcribe_long, tmp_in.name, source_lang)
         transcribed = asr_result["text"]
 
         # Translate
         translated = transcribed
         if source_lang.lower() != target_lang.lower():
-            translator = get_translator()
-            result = translator.translate(transcribed, source_lang, target_lang)
+            translator = await aget_translator()
+            result = await get_scheduler().run(Priority.MEDIUM, translator.translate, transcribed, source_lang, target_lang)
             translated = result if isinstance(result, str) else result[0]
 
         # TTS
-        tts = get_tts()
-        audio_out = tts.synthesize(translated, language=target_lang)
+        parts = [data async for _seq, _count, data in _tts_segments(translated, target_lang)]
 
-        # Encode WAV to base64
-        buf = io.BytesIO()
-        sf.write(buf, audio_out, tts.sample_rate, format="WAV")
-        audio_b64 = base64.b64encode(buf.getvalue()).decode("utf-8")
+        # Encode to base64 (passthrough for MP3)
+        cpu0 = time.thread_time()
+        audio_b64 = base64.b64encode(_encode_tts_output(parts, out_format)).decode("utf-8")
+        tts_cpu = time.thread_time() - cpu0
+        _record_tts_output(out_format, len(audio_b64), tts_cpu)
 
         elapsed = time.time() - t0
 
@@ -314,16 +469,30 @@ async def voice_translate_json(
             "transcription": transcribed,
             "translated_text": translated,
             "audio_base64": audio_b64,
-            "audio_format": "wav",
+            "audio_format": out_format,
+            "audio_bytes": len(audio_b64),
+            "tts_cpu_ms": round(tts_cpu * 1000, 2),
             "source_lang": source_lang,
             "target_lang": target_lang,
             "processing_time": f"{elapsed:.2f}s",
+            "trimmed_fraction": round(asr_result["trimmed_fraction"], 3),
+            "segments": asr_result["segments"],
         })
 
     finally:
         Path(tmp_in.name).unlink(missing_ok=True)
 
 
+# ── READINESS endpoint ─────────────────────────────────────────────────────
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 once startup warmup finished and ASR + translation are
+    warm, 503 before (or if either failed to load)."""
+    body = {"ready": _is_ready(), **_warmup}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+
 # ── LANGUAGES endpoint ─────────────────────────────────────────────────────
 
 @app.get("/api/languages")
@@ -345,6 +514,8 @@ async def get_languages():
 
 @app.get("/health")
 async def health():
+    if remote_models_enabled():
+        return await _remote_health()
     return {
         "status": "healthy",
         "version": "2.0.0",
@@ -352,9 +523,43 @@ async def health():
             "asr": ASRModule.is_available(),
             "tts": TTSModule.is_available(),
         },
+        "silence_trimming": _asr.get_model_info()["silence_trimming"] if _asr is not None else None,
+        "adaptive_asr": _asr.get_model_info()["adaptive"] if _asr is not None else None,
+        "tts_hedging": _tts.hedger.stats() if _tts is not None else None,
+        "tts_output": _tts_output_info(),
+        "scheduler": get_scheduler().stats(),
+        "admission": get_admission().stats(),
+        "speculation": get_speculation_stats().stats(),
     }
 
 
+async def _remote_health() -> dict:
+    body = {
+        "status": "healthy",
+        "version": "2.0.0",
+        "tts_output": _tts_output_info(),
+        "scheduler": get_scheduler().stats(),
+        "admission": get_admission().stats(),
+        "speculation": get_speculation_stats().stats(),
+    }
+    try:
+        info, _ = await get_model_client().acall("info")
+    except OSError as e:
+        body["model_server"] = {"connected": False, "socket": config.model_server_socket, "error": str(e)}
+        return body
+    body["model_server"] = {
+        "connected": True,
+        "socket": config.model_server_socket,
+        "pid": info["pid"],
+        "clients": info["clients"],
+        "batching": info["batching"],
+    }
+    body["silence_trimming"] = (info["asr"] or {}).get("silence_trimming")
+    body["adaptive_asr"] = (info["asr"] or {}).get("adaptive")
+    body["tts_hedging"] = info["tts_hedging"]
+    return body
+
+
 # ── WebSocket: Real-time voice translation ─────────────────────────────────
 
 @app.websocket("/ws/voice")
@@ -364,74 +569,221 @@ async def websocket_voice(ws: WebSocket):
 
     Protocol:
       Client sends JSON: { "type": "config", "source_lang": "en", "target_lang": "hi" }
+                         (source_lang "auto": detect once per session, then lock)
       Client sends JSON: { "type": "audio", "data": "<base64 PCM16 16kHz mono>" }
       Server sends JSON: { "type": "result", "transcription": "...", "translation": "...", "audio": "<base64 wav>" }
+
+    Live captions: audio messages with "partial": true carry the growing audio of
+    the current utterance.  They are answered with
+      { "type": "partial", "transcription": "...", "translation": "...", "stable": bool }
+    (no TTS), translating only newly stabilized clauses.  The next audio message
+    without "partial" finalizes the utterance and reuses the committed prefix.
+
+    "asr_model" in partial and result messages names the Whisper size that
+    decoded the audio (see adaptive ASR in ai/asr_module.py).
+
+    Audio format: "audio_formats": ["mp3", "wav"] in the config message lists
+    what the client can play, in preference order.  MP3 is passed through from
+    the TTS engine untouched; WAV (the default) costs a decode on the server.
+
+    Streaming TTS: with "stream_tts": true in the config message, the spoken
+    translation arrives sentence by sentence, in order, before the result:
+      { "type": "audio_chunk", "seq": 0, "count": 3, "audio": "<base64 mp3>", "audio_format": "mp3" }
+    and the result then carries "audio": "" with "audio_streamed": true.
+
+    Admission control: while the inference queue delay is over target, a new
+    connection gets { "type": "rejected", "reason": "...", "retry_after_ms": N }
+    and is closed with code 1013 (try again later).  Running sessions get
+      { "type": "backoff", "retry_after_ms": N, "queue_delay_ms": D }
+    at most once per N ms, and their queued audio older than
+    config.admission_stale_chunk_s is dropped, oldest first.
+
+    Speculation (config.speculation_enabled): a final whose transcript equals
+    the last partial's reuses that partial's translation.  With
+    "speculative_tts": true in the config message (default
+    config.speculative_tts) the stable clauses of each partial are also
+    synthesized ahead of the final; clauses ASR later revises are cancelled.
+    The result carries this utterance's
+      "speculation": { "translation": {"hits", "misses", "saved_ms"}, "tts": {...} }
+    and /health the totals (see ai/speculation.py).
     """
     await ws.accept()
     source_lang = "english"
     target_lang = "hindi"
+    stream_tts = False
+    speculative_tts = config.speculative_tts
+    out_format = negotiate_audio_format(None)
+    session_id = f"ws-{id(ws)}"
+    spec_mt = Speculator("translation")
+    spec_tts = Speculator("tts", concurrent=True)
+
+    admission = get_admission()
+    decision = admission.admit(session_id)
+    if not decision.admitted:
+        await ws.send_json(decision.to_message())
+        await ws.close(code=1013)
+        return
+
+    pcm_ring = PCMRingBuffer(capacity_s=30.0, sample_rate=config.audio_sample_rate)
     logger.info("WebSocket voice connection opened")
 
+    # Messages are read as they arrive so stale audio can be shed while the
+    # server is overloaded; their age is this session's own backlog and is not
+    # fed to admission control.  None marks the end of the connection.
+    inbox: SheddingQueue[Optional[dict]] = SheddingQueue(
+        config.admission_session_queue, admission,
+        sheddable=lambda m: m is not None and m.get("type") == "audio",
+    )
+
+    async def _receive():
+        try:
+            while True:
+                if not inbox.put_nowait(json.loads(await ws.receive_text())):
+                    logger.warning("WS inbox full; dropped the oldest queued audio")
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            logger.exception(f"WebSocket receive error: {e}")
+        finally:
+            inbox.put_nowait(None)
+
+    reader = asyncio.create_task(_receive())
+    last_backoff = 0.0
+
     try:
         while True:
-            raw = await ws.receive_text()
-            msg = json.loads(raw)
+            msg = await inbox.get()
+            if msg is None:
+                logger.info("WebSocket voice connection closed")
+                break
             msg_type = msg.get("type")
 
             if msg_type == "config":
                 source_lang = msg.get("source_lang", source_lang)
                 target_lang = msg.get("target_lang", target_lang)
+                stream_tts = bool(msg.get("stream_tts", stream_tts))
+                speculative_tts = bool(msg.get("speculative_tts", speculative_tts))
+                if "audio_formats" in msg:
+                    out_format = negotiate_audio_format(msg["audio_formats"])
                 logger.info(f"WS config: {source_lang} -> {target_lang}")
-                await ws.send_json({"type": "config_ack", "source_lang": source_lang, "target_lang": target_lang})
+                if _asr is not None:
+                    # new config: re-detect the speaker's language (off the loop: may be a socket call)
+                    await asyncio.to_thread(_asr.end_session, session_id)
+                await ws.send_json({
+                    "type": "config_ack",
+                    "source_lang": source_lang,
+                    "target_lang": target_lang,
+                    "audio_format": NATIVE_TTS_FORMAT if stream_tts else out_format,
+                })
                 continue
 
             if msg_type == "audio":
                 audio_b64 = msg.get("data", "")
                 if not audio_b64:
                     continue
+                is_partial = bool(msg.get("partial", False))
+
+                if admission.overloaded() and time.monotonic() - last_backoff >= admission.retry_after_s:
+                    last_backoff = time.monotonic()
+                    await ws.send_json(admission.backoff_message())
 
                 t_start = time.time()
 
                 try:
                     pcm_bytes = base64.b64decode(audio_b64)
-                    audio_np = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
 
                     # Skip very short audio (less than 0.3s at 16kHz — lowered from 0.5s)
-                    if len(audio_np) < 4800:
+                    if len(pcm_bytes) < 4800 * 2:
                         continue
 
+                    # Convert into this session's float32 buffer (a view, no temporaries)
+                    audio_np, rms, _peak = pcm_ring.ingest(pcm_bytes)
+
                     # Check if audio is mostly silence (RMS below threshold)
-                    rms = np.sqrt(np.mean(audio_np ** 2))
                     if rms < 0.005:
                         continue
 
                     logger.info(f"Processing audio: {len(audio_np)/16000:.1f}s, RMS={rms:.4f}")
 
                     # ── ASR (run in thread to not block event loop) ────────
-                    asr = get_asr()
+                    asr = await aget_asr()
                     asr_result = await asyncio.to_thread(
-                        asr.transcribe_fast, audio_np, source_lang
+                        asr.transcribe_fast, audio_np, source_lang, session_id, trim_silence=True
                     )
                     transcription = asr_result.get("text", "").strip()
                     t_asr = time.time()
+                    # With source_lang "auto" the session's locked/detected language drives translation
+                    utt_lang = (asr_result.get("language") or source_lang) if source_lang == "auto" else source_lang
 
                     if not transcription or len(transcription) < 2:
                         continue
 
-                    logger.info(f"ASR [{source_lang}] ({t_asr-t_start:.2f}s): '{transcription}'")
+                    logger.info(f"ASR [{utt_lang}] ({t_asr-t_start:.2f}s, {asr_result.get('model')}): '{transcription}'")
+
+                    # ── Partial hypothesis: incremental caption, no TTS ────
+                    if is_partial:
+                        translator = await aget_translator()
+
+                        def _caption():
+                            return get_scheduler().run(
+                                Priority.HIGH, translator.translate_incremental,
+                                session_id, transcription, utt_lang, target_lang,
+                            )
+
+                        if config.speculation_enabled:
+                            # Keyed on the hypothesis: an identical final reuses it
+                            mt_key = (transcription, utt_lang, target_lang)
+                            spec_mt.retain([mt_key])
+                            inc = await spec_mt.speculate(mt_key, _caption)
+                        else:
+                            inc = await _caption()
+                        if speculative_tts:
+                            # Pre-synthesize the committed clauses; drop revised ones
+                            segments = TTSModule.split_text(inc["stable_text"]) if inc["stable_text"] else []
+                            keys = [(seg, target_lang) for seg in segments]
+                            spec_tts.retain(keys)
+                            if not admission.overloaded():   # optional work: never under overload
+                                hedger = (await aget_tts()).hedger
+                                for seg, key in zip(segments, keys):
+                                    spec_tts.speculate(key, lambda seg=seg: hedger.synthesize(seg, target_lang))
+                        await ws.send_json({
+                            "type": "partial",
+                            "transcription": transcription,
+                            "translation": inc["text"],
+                            "stable_translation": inc["stable_text"],
+                            "stable": inc["is_stable"],
+                            "asr_model": asr_result.get("model"),
+                            "source_lang": utt_lang,
+                            "target_lang": target_lang,
+                            "processing_time": f"{time.time()-t_start:.2f}s",
+                        })
+                        continue
 
                     # ── Translate (cached + threaded) ──────────────────────
-                    cache_key = (transcription.lower(), source_lang.lower(), target_lang.lower())
+                    cache_key = (transcription.lower(), utt_lang.lower(), target_lang.lower())
                     translation = transcription
-
-                    if source_lang.lower() != target_lang.lower():
-                        if cache_key in _translation_cache:
+                    translator = await aget_translator()
+                    had_partials = await asyncio.to_thread(translator.has_session, session_id)
+
+                    if utt_lang.lower() != target_lang.lower():
+                        if had_partials:
+                            # Finalize the live caption, reusing the committed prefix
+                            # (or all of it, if the last partial had this transcript)
+                            inc = await spec_mt.resolve(
+                                (transcription, utt_lang, target_lang),
+                                lambda: get_scheduler().run(
+                                    Priority.HIGH, translator.translate_incremental,
+                                    session_id, transcription, utt_lang, target_lang, True,
+                                ),
+                            )
+                            await asyncio.to_thread(translator.end_session, session_id)
+                            translation = inc["text"]
+                        elif cache_key in _translation_cache:
                             translation = _translation_cache[cache_key]
                             logger.info(f"Translation cache hit: '{translation}'")
                         else:
-                            translator = get_translator()
-                            result = await asyncio.to_thread(
-                                translator.translate, transcription, source_lang, target_lang
+                            result = await get_scheduler().run(
+                                Priority.HIGH, translator.translate, transcription, utt_lang, target_lang
                             )
                             translation = result if isinstance(result, str) else result[0]
                             # Cache the translation
@@ -441,80 +793,81 @@ async def websocket_voice(ws: WebSocket):
                     t_translate = time.time()
                     logger.info(f"Translated [{target_lang}] ({t_translate-t_asr:.2f}s): '{translation}'")
 
-                    # ── TTS (streaming Edge-TTS — fast, no API key) ────────
+                    # ── TTS (hedged engines, sentence-pipelined) ──────────
                     audio_b64_out = ""
-                    audio_format = "wav"
+                    audio_format = NATIVE_TTS_FORMAT if stream_tts else out_format
+                    audio_streamed = False
+                    wire_bytes = 0
+                    tts_cpu = 0.0
 
                     # Check TTS cache first
-                    tts_cache_key = (translation.lower(), target_lang.lower())
+                    tts_cache_key = (translation.lower(), target_lang.lower(), audio_format)
                     if tts_cache_key in _tts_cache:
-                        audio_b64_out, audio_format = _tts_cache[tts_cache_key]
+                        audio_b64_out = _tts_cache[tts_cache_key]
                         logger.info("TTS cache hit")
+                        if stream_tts:
+                            await ws.send_json({
+                                "type": "audio_chunk", "seq": 0, "count": 1,
+                                "audio": audio_b64_out, "audio_format": audio_format,
+                            })
+                            audio_streamed = True
+                        wire_bytes = len(audio_b64_out)
                     elif translation.strip():
                         try:
-                            if EDGE_TTS_AVAILABLE:
-                                # Use Edge-TTS streaming directly (no API key, fast)
-                                voice = get_edge_voice(target_lang)
-                                communicate = edge_tts.Communicate(
-                                    text=translation, voice=voice
-                                )
-                                audio_chunks = []
-                                async for chunk in communicate.stream():
-                                    if chunk["type"] == "audio" and chunk.get("data"):
-                                        audio_chunks.append(chunk["data"])
-
-                                if audio_chunks:
-                                    mp3_bytes = b"".join(audio_chunks)
-                                    audio_data, sr = sf.read(io.BytesIO(mp3_bytes))
-                                    if audio_data.ndim > 1:
-                                        audio_data = audio_data.mean(axis=-1)
-                                    buf = io.BytesIO()
-                                    sf.write(buf, audio_data.astype(np.float32), sr, format="WAV")
-                                    audio_b64_out = base64.b64encode(buf.getvalue()).decode()
-                                    audio_format = "wav"
-                            else:
-                                # Fallback to ElevenLabs
-                                el = get_elevenlabs()
-                                mp3_bytes = await asyncio.to_thread(
-                                    el.synthesize_bytes, translation
-                                )
-                                audio_b64_out = base64.b64encode(mp3_bytes).decode()
-                                audio_format = "mp3"
+                            parts = []
+                            async for seq, count, mp3_bytes in _tts_segments(translation, target_lang, spec_tts):
+                                parts.append(mp3_bytes)
+                                if stream_tts:
+                                    # MP3 segments concatenate cleanly; send each as it lands
+                                    cpu0 = time.thread_time()
+                                    chunk_b64 = base64.b64encode(mp3_bytes).decode()
+                                    tts_cpu += time.thread_time() - cpu0
+                                    await ws.send_json({
+                                        "type": "audio_chunk", "seq": seq, "count": count,
+                                        "audio": chunk_b64, "audio_format": audio_format,
+                                    })
+                                    audio_streamed = True
+                                    wire_bytes += len(chunk_b64)
+
+                            cpu0 = time.thread_time()
+                            if parts:
+                                audio_b64_out = base64.b64encode(_encode_tts_output(parts, audio_format)).decode()
+                            tts_cpu += time.thread_time() - cpu0
+                            if not audio_streamed:
+                                wire_bytes = len(audio_b64_out)
                         except Exception as tts_err:
                             logger.warning(f"TTS failed: {tts_err}")
-                            try:
-                                tts = get_tts()
-                                audio_out = await asyncio.to_thread(
-                                    tts.synthesize, translation, target_lang
-                                )
-                                if len(audio_out) > 0:
-                                    buf = io.BytesIO()
-                                    sf.write(buf, audio_out, tts.sample_rate, format="WAV")
-                                    audio_b64_out = base64.b64encode(buf.getvalue()).decode()
-                                    audio_format = "wav"
-                            except Exception as fb_err:
-                                logger.warning(f"Fallback TTS also failed: {fb_err}")
 
                         # Cache TTS result
                         if audio_b64_out and len(_tts_cache) < _CACHE_MAX:
-                            _tts_cache[tts_cache_key] = (audio_b64_out, audio_format)
+                            _tts_cache[tts_cache_key] = audio_b64_out
+                    if wire_bytes:
+                        _record_tts_output(audio_format, wire_bytes, tts_cpu)
 
                     t_tts = time.time()
                     total = t_tts - t_start
+                    speculation = {"translation": spec_mt.settle(), "tts": spec_tts.settle()}
                     logger.info(
                         f"Total: {total:.2f}s "
-                        f"(ASR:{t_asr-t_start:.2f} + Trans:{t_translate-t_asr:.2f} + TTS:{t_tts-t_translate:.2f})"
+                        f"(ASR:{t_asr-t_start:.2f} + Trans:{t_translate-t_asr:.2f} + TTS:{t_tts-t_translate:.2f}) "
+                        f"audio {audio_format} {wire_bytes} B, {tts_cpu*1000:.1f} ms CPU"
                     )
 
                     await ws.send_json({
                         "type": "result",
                         "transcription": transcription,
                         "translation": translation,
-                        "audio": audio_b64_out,
+                        "audio": "" if audio_streamed else audio_b64_out,
                         "audio_format": audio_format,
-                        "source_lang": source_lang,
+                        "audio_streamed": audio_streamed,
+                        "audio_bytes": wire_bytes,
+                        "tts_cpu_ms": round(tts_cpu * 1000, 2),
+                        "asr_model": asr_result.get("model"),
+                        "source_lang": utt_lang,
                         "target_lang": target_lang,
                         "processing_time": f"{total:.2f}s",
+                        "trimmed_fraction": round(asr_result.get("trimmed_fraction", 0.0), 3),
+                        "speculation": speculation,
                     })
 
                 except Exception as chunk_err:
@@ -525,13 +878,39 @@ async def websocket_voice(ws: WebSocket):
         logger.info("WebSocket voice connection closed")
     except Exception as e:
         logger.exception(f"WebSocket error: {e}")
+    finally:
+        reader.cancel()
+        spec_mt.discard()
+        spec_tts.discard()
+        admission.release(session_id)
+        # With a model server these are socket round trips: keep them off the loop
+        if _translator is not None:
+            await asyncio.to_thread(_translator.end_session, session_id)
+        if _asr is not None:
+            await asyncio.to_thread(_asr.end_session, session_id)
 
 
 # ── Entry point ─────────────────────────────────────────────────────────────
 
-if __name__ == "__main__":
-    import uvicorn
+def preload_shared_models() -> None:
+    """Load (without running) the hot-pair MarianMT models in the pre-fork
+    master, so every worker shares one copy.  Workers still warm them and load
+    Whisper themselves at startup (see prefork.py)."""
+    status = get_translator().warmup(parse_language_pairs(config.warmup_language_pairs), run=False)
+    logger.info(f"Shared translation models: {status}")
 
+
+if __name__ == "__main__":
     port = int(os.getenv("PORT", "5001"))
-    logger.info(f"Starting LingoLive AI Translation Server on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
+    workers = int(os.getenv("WORKERS", "1"))
+    logger.info(f"Starting LingoLive AI Translation Server on port {port} ({workers} worker(s))")
+    if workers > 1:
+        from prefork import serve_prefork
+
+        # Behind a model server there is nothing to share; workers are thin clients
+        preload = None if remote_models_enabled() else preload_shared_models
+        serve_prefork(app, host="0.0.0.0", port=port, workers=workers, preload=preload)
+    else:
+        import uvicorn
+
+        uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
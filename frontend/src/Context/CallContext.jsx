@@ -168,6 +168,7 @@ export const CallProvider = ({ children }) => {
           type: "config",
           source_lang: sourceLang,
           target_lang: targetLang,
+          audio_formats: ["mp3", "wav"],
         }));
       };
       ws.onmessage = (event) => {